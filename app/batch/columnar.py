@@ -0,0 +1,89 @@
+import sys
+from array import array
+from typing import Iterable, Iterator, Sequence, overload
+
+from app.http_client.schemas import SMSMessage, ValidationReport
+from app.http_client.segments import segment_counts
+
+
+def encode_phone(phone: str) -> int:
+    # A leading 1/2 marks a bare/"+"-prefixed number and keeps leading zeros; 16 digits fit an unsigned 64-bit slot.
+    return int("2" + phone[1:]) if phone.startswith("+") else int("1" + phone)
+
+
+def decode_phone(value: int) -> str:
+    digits = str(value)
+    return "+" + digits[1:] if digits[0] == "2" else digits[1:]
+
+
+class SMSBatch:
+    __slots__ = ("_senders", "_sender_ids", "_sender_idx", "_recipients", "_messages")
+
+    def __init__(self, rows: Iterable[tuple[str, str, str]] = ()):
+        self._senders: list[str] = []
+        self._sender_ids: dict[str, int] = {}
+        self._sender_idx = array("I")
+        self._recipients = array("Q")
+        self._messages: list[str] = []
+        for sender, recipient, message in rows:
+            self.append(sender, recipient, message)
+
+    @classmethod
+    def from_columns(
+        cls, senders: Sequence[str], recipients: Sequence[str], messages: Sequence[str]
+    ) -> tuple["SMSBatch", ValidationReport]:
+        report = SMSMessage.validate_batch(senders, recipients, messages)
+        invalid = report.invalid_rows
+        batch = cls()
+        for index, row in enumerate(zip(senders, recipients, messages)):
+            if index not in invalid:
+                batch._append(*row)
+        return batch, report
+
+    def append(self, sender: str, recipient: str, message: str) -> None:
+        SMSMessage(sender, recipient, message)
+        self._append(sender, recipient, message)
+
+    def _append(self, sender: str, recipient: str, message: str) -> None:
+        sender_id = self._sender_ids.get(sender)
+        if sender_id is None:
+            sender_id = self._sender_ids[sender] = len(self._senders)
+            self._senders.append(sys.intern(sender))
+        self._sender_idx.append(sender_id)
+        self._recipients.append(encode_phone(recipient))
+        self._messages.append(message)
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    @overload
+    def __getitem__(self, index: int) -> SMSMessage: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "SMSBatch": ...
+
+    def __getitem__(self, index: int | slice) -> "SMSMessage | SMSBatch":
+        if isinstance(index, slice):
+            batch = SMSBatch()
+            for position in range(*index.indices(len(self))):
+                batch._append(*self.row(position))
+            return batch
+        return SMSMessage(*self.row(index))
+
+    def __iter__(self) -> Iterator[SMSMessage]:
+        for index in range(len(self)):
+            yield SMSMessage(*self.row(index))
+
+    def row(self, index: int) -> tuple[str, str, str]:
+        return (
+            self._senders[self._sender_idx[index]],
+            decode_phone(self._recipients[index]),
+            self._messages[index],
+        )
+
+    def segments(self) -> "array[int]":
+        return array("H", segment_counts(self._messages))
+
+    @property
+    def senders(self) -> list[str]:
+        return list(self._senders)
@@ -0,0 +1,163 @@
+import sqlite3
+from types import TracebackType
+from typing import Iterable, Iterator, Optional
+
+from app.batch.reader import BatchItem
+from app.batch.results import BatchResult
+from app.http_client.schemas import SMSMessage, new_idempotency_key
+from app.http_client.segments import count_segments
+
+QUEUED = "queued"
+SENDING = "sending"
+ACKED = "acked"
+FAILED = "failed"
+INVALID = "invalid"
+SKIPPED = "skipped"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    line INTEGER PRIMARY KEY,
+    sender TEXT,
+    recipient TEXT,
+    message TEXT,
+    state TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    status_code INTEGER,
+    body TEXT,
+    error TEXT,
+    idempotency_key TEXT
+);
+CREATE INDEX IF NOT EXISTS messages_state ON messages (state, line);
+"""
+
+
+class OutboundQueue:
+    def __init__(self, path: str, *, sync_every: int = 256):
+        if sync_every < 1:
+            raise ValueError("sync_every must be at least 1")
+        self.path = path
+        self.sync_every = sync_every
+        self._db: Optional[sqlite3.Connection] = None
+        self._unsynced = 0
+
+    def __enter__(self) -> "OutboundQueue":
+        self.open()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def open(self) -> None:
+        db = sqlite3.connect(self.path)
+        # WAL keeps readers off the writer's back; FULL fsyncs every commit, so commits are batched instead.
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=FULL")
+        db.executescript(SCHEMA)
+        if "idempotency_key" not in {row[1] for row in db.execute("PRAGMA table_info(messages)")}:
+            # A queue made before keys were stored: its messages get one the next time they are claimed.
+            db.execute("ALTER TABLE messages ADD COLUMN idempotency_key TEXT")
+        self._db = db
+
+    def close(self) -> None:
+        if self._db is not None:
+            self.flush()
+            self._db.close()
+            self._db = None
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        if self._db is None:
+            raise RuntimeError("OutboundQueue must be opened before use")
+        return self._db
+
+    def flush(self) -> None:
+        self.db.commit()
+        self._unsynced = 0
+
+    def enqueue(self, items: Iterable[BatchItem]) -> int:
+        # Rows are keyed by input line, so enqueueing the same file again after a restart adds nothing.
+        before = self.db.total_changes
+        self.db.executemany(
+            "INSERT OR IGNORE INTO messages (line, sender, recipient, message, state, error, idempotency_key)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                (
+                    (item.line, None, item.recipient, None, SKIPPED if item.skipped else INVALID, item.error, None)
+                    if item.message is None
+                    else (
+                        item.line,
+                        item.message.sender,
+                        item.message.recipient,
+                        item.message.message,
+                        QUEUED,
+                        None,
+                        item.message.idempotency_key(),
+                    )
+                )
+                for item in items
+            ),
+        )
+        self.flush()
+        return self.db.total_changes - before
+
+    def drain(self) -> Iterator[BatchItem]:
+        # Messages left in SENDING by a crash are claimed again with the key they were first sent with, which
+        # is committed before the send, so a gateway that honours it drops the repeat.
+        last_line = -1
+        while True:
+            rows = [
+                (line, sender, recipient, message, key or new_idempotency_key())
+                for line, sender, recipient, message, key in self.db.execute(
+                    "SELECT line, sender, recipient, message, idempotency_key FROM messages"
+                    " WHERE state IN (?, ?) AND line > ? ORDER BY line LIMIT ?",
+                    (QUEUED, SENDING, last_line, self.sync_every),
+                )
+            ]
+            if not rows:
+                return
+            self.db.executemany(
+                "UPDATE messages SET state = ?, attempts = attempts + 1, idempotency_key = ? WHERE line = ?",
+                ((SENDING, key, line) for line, *_, key in rows),
+            )
+            self.flush()
+            for line, sender, recipient, message, key in rows:
+                sms_message = SMSMessage(sender, recipient, message)
+                sms_message.set_idempotency_key(key)
+                yield BatchItem(line, sms_message, recipient=recipient)
+            last_line = rows[-1][0]
+
+    def record(self, result: BatchResult) -> None:
+        state = ACKED if result.ok else SKIPPED if result.skipped else INVALID if result.invalid else FAILED
+        self.db.execute(
+            "UPDATE messages SET state = ?, status_code = ?, body = ?, error = ? WHERE line = ?",
+            (state, result.status_code, result.body, result.error, result.line),
+        )
+        self._unsynced += 1
+        if self._unsynced >= self.sync_every:
+            self.flush()
+
+    def results(self) -> Iterator[BatchResult]:
+        rows = self.db.execute(
+            "SELECT line, recipient, message, status_code, body, error, state FROM messages"
+            " WHERE state IN (?, ?, ?, ?) ORDER BY line",
+            (ACKED, FAILED, INVALID, SKIPPED),
+        )
+        for line, recipient, message, status_code, body, error, state in rows:
+            yield BatchResult(
+                line,
+                recipient,
+                status_code=status_code,
+                body=body,
+                error=error,
+                invalid=state == INVALID,
+                skipped=state == SKIPPED,
+                segments=count_segments(message).segments if message is not None else None,
+            )
+
+    def counts(self) -> dict[str, int]:
+        return dict(self.db.execute("SELECT state, COUNT(*) FROM messages GROUP BY state").fetchall())
@@ -0,0 +1,114 @@
+import csv
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional
+
+from app.exceptions import SMSClientError, ValidationError
+from app.http_client.schemas import SMSMessage
+from app.http_client.templates import MessageTemplate
+from app.utils import json_codec
+
+MESSAGE_FIELDS = ("sender", "recipient", "message")
+
+
+@dataclass
+class BatchItem:
+    line: int
+    message: Optional[SMSMessage] = None
+    error: Optional[str] = None
+    recipient: Optional[str] = None
+    # Valid, but deliberately not sent (suppressed or a duplicate).
+    skipped: bool = False
+
+
+def iter_rows(path: str) -> Iterator[tuple[int, Any]]:
+    if Path(path).suffix.lower() == ".csv":
+        yield from _iter_csv(path)
+    else:
+        yield from _iter_jsonl(path)
+
+
+def _iter_csv(path: str) -> Iterator[tuple[int, Any]]:
+    with open(path, newline="", encoding="utf-8") as file:
+        reader = csv.DictReader(file)
+        for row in reader:
+            yield reader.line_num, row
+
+
+def _iter_jsonl(path: str) -> Iterator[tuple[int, Any]]:
+    with open(path, encoding="utf-8") as file:
+        for line_num, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_num, json_codec.loads(line)
+            except ValueError as err:
+                yield line_num, ValidationError(f"Invalid JSON: {err}")
+
+
+def csv_columns(path: str) -> list[str]:
+    with open(path, newline="", encoding="utf-8") as file:
+        return next(csv.reader(file), [])
+
+
+def iter_messages(rows: Iterable[tuple[int, Any]], template: Optional[MessageTemplate] = None) -> Iterator[BatchItem]:
+    if template is not None:
+        yield from _iter_templated(rows, template)
+        return
+    for line, row in rows:
+        if isinstance(row, Exception):
+            yield BatchItem(line, error=str(row))
+            continue
+        if not isinstance(row, dict):
+            yield BatchItem(line, error="Row must be an object with sender, recipient and message")
+            continue
+
+        recipient = row.get("recipient")
+        missing = [field for field in MESSAGE_FIELDS if row.get(field) is None]
+        if missing:
+            yield BatchItem(line, error=f"Missing field(s): {', '.join(missing)}", recipient=recipient)
+            continue
+
+        try:
+            message = SMSMessage(row["sender"], row["recipient"], row["message"])
+        except SMSClientError as err:
+            yield BatchItem(line, error=str(err), recipient=recipient)
+        else:
+            yield BatchItem(line, message=message, recipient=recipient)
+
+
+def _iter_templated(rows: Iterable[tuple[int, Any]], template: MessageTemplate) -> Iterator[BatchItem]:
+    # Rows carry the recipient, optionally a sender, and the template variables instead of a ready message.
+    required = ("recipient",) if template.sender is not None else ("sender", "recipient")
+    for line, row in rows:
+        if isinstance(row, Exception):
+            yield BatchItem(line, error=str(row))
+            continue
+        if not isinstance(row, dict):
+            yield BatchItem(line, error="Row must be an object with a recipient and template variables")
+            continue
+
+        recipient = row.get("recipient")
+        missing = [field for field in required if row.get(field) is None]
+        if missing:
+            yield BatchItem(line, error=f"Missing field(s): {', '.join(missing)}", recipient=recipient)
+            continue
+
+        try:
+            message = template.render(row["recipient"], row, sender=row.get("sender"))
+        except SMSClientError as err:
+            yield BatchItem(line, error=str(err), recipient=recipient)
+        else:
+            yield BatchItem(line, message=message, recipient=recipient)
+
+
+def check_template(path: str, template: MessageTemplate) -> None:
+    if Path(path).suffix.lower() == ".csv":
+        # The header names every variable a CSV row can have, so a misspelt placeholder fails before any send.
+        template.check(csv_columns(path))
+
+
+def read_batch(path: str, template: Optional[MessageTemplate] = None) -> Iterator[BatchItem]:
+    if template is not None:
+        check_template(path, template)
+    return iter_messages(iter_rows(path), template)
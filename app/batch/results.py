@@ -0,0 +1,77 @@
+from dataclasses import asdict, dataclass, field
+from types import TracebackType
+from typing import Any, Optional, TextIO
+
+from app.utils import json_codec
+
+
+@dataclass
+class BatchResult:
+    line: int
+    recipient: Optional[str] = None
+    status_code: Optional[int] = None
+    body: Optional[str] = None
+    error: Optional[str] = None
+    invalid: bool = False
+    segments: Optional[int] = None
+    skipped: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.status_code is not None and self.status_code < 400
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class BatchSummary:
+    total: int = 0
+    sent: int = 0
+    failed: int = 0
+    invalid: int = 0
+    skipped: int = 0
+    # Billed parts of the messages that were sent.
+    segments: int = 0
+    status_codes: dict[int, int] = field(default_factory=dict)
+
+    def add(self, result: BatchResult) -> None:
+        self.total += 1
+        if result.status_code is not None:
+            self.status_codes[result.status_code] = self.status_codes.get(result.status_code, 0) + 1
+        if result.ok:
+            self.sent += 1
+            self.segments += result.segments or 0
+        elif result.skipped:
+            self.skipped += 1
+        elif result.invalid:
+            self.invalid += 1
+        else:
+            self.failed += 1
+
+
+class ResultWriter:
+    def __init__(self, path: str):
+        self.path = path
+        self.summary = BatchSummary()
+        self._file: Optional[TextIO] = None
+
+    def __enter__(self) -> "ResultWriter":
+        self._file = open(self.path, "w", encoding="utf-8")
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def write(self, result: BatchResult) -> None:
+        if self._file is None:
+            raise RuntimeError("ResultWriter must be used as a context manager")
+        self._file.write(json_codec.dumps(result.to_dict()) + "\n")
+        self.summary.add(result)
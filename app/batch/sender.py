@@ -0,0 +1,162 @@
+from itertools import islice
+from typing import Iterable, Iterator, Optional
+
+from app.batch.queue import OutboundQueue
+from app.batch.reader import BatchItem, read_batch
+from app.batch.results import BatchResult, BatchSummary, ResultWriter
+from app.batch.suppression import RecipientFilter
+from app.exceptions import SMSClientError
+from app.http_client.connection_pool import ConnectionPool
+from app.http_client.dispatcher import Dispatcher
+from app.http_client.pipeline import Pipeline
+from app.http_client.request import Request
+from app.http_client.templates import MessageTemplate
+
+
+def unsent_result(item: BatchItem) -> BatchResult:
+    return BatchResult(item.line, item.recipient, error=item.error, invalid=not item.skipped, skipped=item.skipped)
+
+
+def send_item(
+    item: BatchItem, url: str, auth: Optional[tuple[str, str]], pool: Optional[ConnectionPool] = None
+) -> BatchResult:
+    if item.message is None:
+        return unsent_result(item)
+    segments = item.message.segment_info().segments
+    try:
+        response = Request.post(url, auth=auth, body=item.message, pool=pool)
+    except SMSClientError as err:
+        return BatchResult(item.line, item.recipient, error=str(err), segments=segments)
+    return BatchResult(
+        item.line, item.recipient, status_code=response.status_code, body=response.body, segments=segments
+    )
+
+
+def send_pipelined(
+    items: list[BatchItem], url: str, auth: Optional[tuple[str, str]], pool: Optional[ConnectionPool] = None
+) -> list[BatchResult]:
+    messages = [item.message for item in items if item.message is not None]
+    responses = iter(Pipeline(url, auth=auth, depth=max(len(messages), 1), pool=pool).post(messages))
+    results = []
+    for item in items:
+        if item.message is None:
+            results.append(unsent_result(item))
+            continue
+        response = next(responses)
+        segments = item.message.segment_info().segments
+        if isinstance(response, SMSClientError):
+            results.append(BatchResult(item.line, item.recipient, error=str(response), segments=segments))
+        else:
+            results.append(
+                BatchResult(
+                    item.line, item.recipient, status_code=response.status_code, body=response.body, segments=segments
+                )
+            )
+    return results
+
+
+def chunked(items: Iterable[BatchItem], size: int) -> Iterator[list[BatchItem]]:
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def send_batch(
+    items: Iterable[BatchItem],
+    url: str,
+    *,
+    auth: Optional[tuple[str, str]] = None,
+    concurrency: int = 8,
+    pipeline_depth: int = 1,
+) -> Iterator[BatchResult]:
+    if pipeline_depth < 1:
+        raise ValueError("pipeline_depth must be at least 1")
+    with Dispatcher(url, auth=auth, max_workers=concurrency) as dispatcher:
+        if pipeline_depth == 1:
+            yield from dispatcher.run(lambda item: send_item(item, url, auth, dispatcher.worker_pool()), items)
+            return
+        # Each worker pipelines a group of messages over its own connection.
+        groups = chunked(items, pipeline_depth)
+        for results in dispatcher.run(lambda group: send_pipelined(group, url, auth, dispatcher.worker_pool()), groups):
+            yield from results
+
+
+def read_items(
+    path: str, template: Optional[MessageTemplate] = None, recipient_filter: Optional[RecipientFilter] = None
+) -> Iterator[BatchItem]:
+    items = read_batch(path, template)
+    return recipient_filter.apply(items) if recipient_filter is not None else items
+
+
+def run_batch(
+    path: str,
+    output: str,
+    url: str,
+    *,
+    auth: Optional[tuple[str, str]] = None,
+    concurrency: int = 8,
+    pipeline_depth: int = 1,
+    queue: Optional[str] = None,
+    workers: int = 1,
+    template: Optional[MessageTemplate] = None,
+    recipient_filter: Optional[RecipientFilter] = None,
+) -> BatchSummary:
+    if workers > 1:
+        if queue is not None:
+            raise ValueError("a queued batch cannot be split across workers")
+        from app.batch.workers import run_sharded_batch
+
+        return run_sharded_batch(
+            path,
+            output,
+            url,
+            workers=workers,
+            auth=auth,
+            concurrency=concurrency,
+            pipeline_depth=pipeline_depth,
+            template=template,
+            recipient_filter=recipient_filter,
+        )
+    if queue is not None:
+        return run_queued_batch(
+            path,
+            output,
+            url,
+            queue,
+            auth=auth,
+            concurrency=concurrency,
+            pipeline_depth=pipeline_depth,
+            template=template,
+            recipient_filter=recipient_filter,
+        )
+    items = read_items(path, template, recipient_filter)
+    with ResultWriter(output) as writer:
+        batch = send_batch(items, url, auth=auth, concurrency=concurrency, pipeline_depth=pipeline_depth)
+        for result in batch:
+            writer.write(result)
+    return writer.summary
+
+
+def run_queued_batch(
+    path: str,
+    output: str,
+    url: str,
+    queue_path: str,
+    *,
+    auth: Optional[tuple[str, str]] = None,
+    concurrency: int = 8,
+    pipeline_depth: int = 1,
+    template: Optional[MessageTemplate] = None,
+    recipient_filter: Optional[RecipientFilter] = None,
+) -> BatchSummary:
+    with OutboundQueue(queue_path) as queue:
+        queue.enqueue(read_items(path, template, recipient_filter))
+        batch = send_batch(queue.drain(), url, auth=auth, concurrency=concurrency, pipeline_depth=pipeline_depth)
+        for result in batch:
+            queue.record(result)
+        queue.flush()
+        # The output covers the whole file, including messages sent before an earlier run was interrupted.
+        with ResultWriter(output) as writer:
+            for result in queue.results():
+                writer.write(result)
+    return writer.summary
@@ -0,0 +1,178 @@
+import heapq
+import mmap
+import os
+import re
+import struct
+import tempfile
+from array import array
+from bisect import bisect_left, bisect_right
+from types import TracebackType
+from typing import BinaryIO, Iterable, Iterator, Optional, Union
+
+from app.batch.reader import BatchItem
+from app.exceptions import ConfigError
+
+MAGIC = b"SMSSUP\x00\x01"
+# Count and a byte-order mark: the numbers are stored in native order so they can be mapped without conversion.
+HEADER = struct.Struct("=8sQQ")
+ORDER_MARK = 0x0102030405060708
+# One fence per block keeps a lookup to a binary search of a small in-memory array and then of one block.
+BLOCK = 512
+RUN_SIZE = 1_000_000
+READ_SIZE = 65_536
+
+SEPARATORS_RE = re.compile(r"[\s\-().]")
+
+SUPPRESSED = "Recipient is on the suppression list"
+DUPLICATE = "Duplicate recipient"
+
+
+def normalize_phone(phone: Union[str, int]) -> Optional[int]:
+    # E.164 digits as an integer: "+1 (987) 654-3210", "0019876543210" and "19876543210" are the same number.
+    if isinstance(phone, int):
+        return phone if 10**9 <= phone < 10**15 else None
+    if not phone[1:].isdigit():
+        phone = SEPARATORS_RE.sub("", phone)
+    digits = phone[1:] if phone.startswith("+") else phone[2:] if phone.startswith("00") else phone
+    # E.164 never starts with 0: "01612345678" is a national number, and as an int it would lose the zero.
+    if not (10 <= len(digits) <= 15 and digits.isdigit()) or digits[0] == "0":
+        return None
+    return int(digits)
+
+
+def _write_run(values: list[int], directory: str) -> str:
+    with tempfile.NamedTemporaryFile("wb", dir=directory, suffix=".run", delete=False) as file:
+        array("q", values).tofile(file)
+        return file.name
+
+
+def _read_run(path: str) -> Iterator[int]:
+    with open(path, "rb") as file:
+        while True:
+            chunk = array("q")
+            try:
+                chunk.fromfile(file, READ_SIZE)
+            except EOFError:
+                yield from chunk
+                return
+            yield from chunk
+
+
+def _write_sorted(file: BinaryIO, values: Iterable[int]) -> int:
+    count, previous, buffer = 0, -1, array("q")
+    for value in values:
+        if value != previous:
+            buffer.append(value)
+            previous = value
+            if len(buffer) >= READ_SIZE:
+                buffer.tofile(file)
+                count += len(buffer)
+                buffer = array("q")
+    buffer.tofile(file)
+    return count + len(buffer)
+
+
+class SuppressionIndex:
+    def __init__(self, path: str):
+        self.path = path
+        try:
+            with open(path, "rb") as file:
+                self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as err:
+            raise ConfigError(f"Cannot open suppression index: {err}")
+        if len(self._mmap) < HEADER.size:
+            self._mmap.close()
+            raise ConfigError(f"Not a suppression index: {path}")
+        magic, order, count = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or order != ORDER_MARK or len(self._mmap) != HEADER.size + count * 8:
+            self._mmap.close()
+            raise ConfigError(f"Not a suppression index, or built on another platform: {path}")
+        self._numbers = memoryview(self._mmap)[HEADER.size :].cast("q")
+        self._fences = array("q", self._numbers[::BLOCK])
+
+    @classmethod
+    def build(cls, numbers: Iterable[str], path: str, *, run_size: int = RUN_SIZE) -> tuple[int, int]:
+        # An external merge sort: at most run_size numbers are held in memory, however long the list is.
+        directory = os.path.dirname(os.path.abspath(path))
+        rejected = 0
+        runs: list[str] = []
+        chunk: list[int] = []
+        with tempfile.TemporaryDirectory(dir=directory) as scratch:
+            for line in numbers:
+                phone = line.strip()
+                if not phone:
+                    continue
+                number = normalize_phone(phone)
+                if number is None:
+                    rejected += 1
+                    continue
+                chunk.append(number)
+                if len(chunk) >= run_size:
+                    runs.append(_write_run(sorted(set(chunk)), scratch))
+                    chunk = []
+            temporary = f"{path}.{os.getpid()}.tmp"
+            with open(temporary, "wb") as file:
+                file.write(HEADER.pack(MAGIC, ORDER_MARK, 0))
+                merged = heapq.merge(*map(_read_run, runs), sorted(chunk)) if runs else sorted(chunk)
+                count = _write_sorted(file, merged)
+                file.seek(0)
+                file.write(HEADER.pack(MAGIC, ORDER_MARK, count))
+        os.replace(temporary, path)
+        return count, rejected
+
+    def __len__(self) -> int:
+        return len(self._numbers)
+
+    def __contains__(self, phone: object) -> bool:
+        number = normalize_phone(phone) if isinstance(phone, (str, int)) else None
+        if number is None:
+            return False
+        block = bisect_right(self._fences, number) - 1
+        if block < 0:
+            return False
+        low = block * BLOCK
+        high = min(low + BLOCK, len(self._numbers))
+        index = bisect_left(self._numbers, number, low, high)
+        return index < high and self._numbers[index] == number
+
+    def __enter__(self) -> "SuppressionIndex":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if not self._mmap.closed:
+            self._numbers.release()
+            self._mmap.close()
+
+
+class RecipientFilter:
+    def __init__(self, suppression: Optional[SuppressionIndex] = None, *, dedupe: bool = False):
+        self.suppression = suppression
+        self.dedupe = dedupe
+
+    def apply(self, items: Iterable[BatchItem]) -> Iterator[BatchItem]:
+        # Filtered rows stay in the stream as skipped items, so the results still cover every input line.
+        seen: set[Union[int, str]] = set()
+        suppression = self.suppression
+        for item in items:
+            if item.message is not None:
+                recipient = item.message.recipient
+                number = normalize_phone(recipient)
+                if suppression is not None and number is not None and number in suppression:
+                    yield BatchItem(item.line, error=SUPPRESSED, recipient=item.recipient, skipped=True)
+                    continue
+                if self.dedupe:
+                    # A number without an international form is only a duplicate of the same spelling.
+                    key = number if number is not None else recipient
+                    if key in seen:
+                        yield BatchItem(item.line, error=DUPLICATE, recipient=item.recipient, skipped=True)
+                        continue
+                    seen.add(key)
+            yield item
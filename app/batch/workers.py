@@ -0,0 +1,237 @@
+import multiprocessing
+import os
+import queue
+import zlib
+from collections import deque
+from multiprocessing.process import BaseProcess
+from multiprocessing.queues import Queue
+from typing import Any, Iterator, Optional
+
+from app.batch.reader import check_template, iter_messages, iter_rows
+from app.batch.results import BatchResult, BatchSummary, ResultWriter
+from app.batch.sender import send_batch
+from app.batch.suppression import RecipientFilter, normalize_phone
+from app.exceptions import SMSClientError
+from app.http_client.connection_pool import ConnectionPool
+from app.http_client.journal import SendJournal
+from app.http_client.request import Request
+from app.http_client.templates import MessageTemplate
+from app.utils import logging as sms_logging
+from app.utils.metrics import registry
+
+CHUNK_SIZE = 256
+# Chunks a worker may have waiting; bounds memory when the file is much faster to read than to send.
+QUEUE_CHUNKS = 4
+POLL_INTERVAL = 0.1
+
+Row = tuple[int, Any]
+
+
+def shard_of(row: Any, workers: int) -> int:
+    # A stable hash, so one recipient always lands on the same worker and its messages keep their relative order.
+    # Hashing the normalized number also keeps differently written duplicates together for deduplication.
+    recipient = row.get("recipient") if isinstance(row, dict) else None
+    number = normalize_phone(recipient) if isinstance(recipient, str) else None
+    key = str(number if number is not None else recipient)
+    return zlib.crc32(key.encode()) % workers
+
+
+def worker_path(path: str, shard: int) -> str:
+    root, extension = os.path.splitext(path)
+    return f"{root}.worker{shard}{extension}"
+
+
+def prepare_worker(shard: int, workers: int) -> None:
+    # State inherited from the parent is either shared with it (sockets, files) or describes its own sends.
+    Request.pool = ConnectionPool()
+    if Request.rate_limiter is not None:
+        Request.rate_limiter = Request.rate_limiter.share(workers)
+    if Request.journal is not None:
+        journal, Request.journal = Request.journal, None
+        journal.close()
+        Request.journal = SendJournal(worker_path(journal.path, shard))
+    if sms_logging._config is not None:
+        sms_logging.reopen_logger(worker_path(sms_logging._config.file, shard))
+    registry.reset()
+
+
+def run_worker(
+    shard: int,
+    workers: int,
+    tasks: "Queue[Optional[list[Row]]]",
+    results: "Queue[tuple[int, Any]]",
+    url: str,
+    auth: Optional[tuple[str, str]],
+    concurrency: int,
+    pipeline_depth: int,
+    template: Optional[MessageTemplate] = None,
+    recipient_filter: Optional[RecipientFilter] = None,
+) -> None:
+    prepare_worker(shard, workers)
+
+    def rows() -> Iterator[Row]:
+        while (chunk := tasks.get()) is not None:
+            yield from chunk
+
+    items = iter_messages(rows(), template)
+    if recipient_filter is not None:
+        items = recipient_filter.apply(items)
+    buffer: list[BatchResult] = []
+    for result in send_batch(items, url, auth=auth, concurrency=concurrency, pipeline_depth=pipeline_depth):
+        buffer.append(result)
+        if len(buffer) >= CHUNK_SIZE:
+            results.put((shard, buffer))
+            buffer = []
+    if buffer:
+        results.put((shard, buffer))
+    results.put((shard, registry.export_state()))
+    # A forked child leaves through os._exit, so atexit handlers would never flush these.
+    sms_logging.shutdown_logger()
+    if Request.journal is not None:
+        Request.journal.close()
+
+
+class ShardedBatch:
+    def __init__(
+        self,
+        output: str,
+        url: str,
+        *,
+        workers: int,
+        auth: Optional[tuple[str, str]] = None,
+        concurrency: int = 8,
+        pipeline_depth: int = 1,
+        template: Optional[MessageTemplate] = None,
+        recipient_filter: Optional[RecipientFilter] = None,
+    ):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.output = output
+        self.url = url
+        self.workers = workers
+        self.auth = auth
+        self.concurrency = concurrency
+        self.pipeline_depth = pipeline_depth
+        self.template = template
+        self.recipient_filter = recipient_filter
+        self._context = multiprocessing.get_context("fork")
+        self._results: "Queue[tuple[int, Any]]" = self._context.Queue()
+        self._tasks: list["Queue[Optional[list[Row]]]"] = []
+        self._processes: list[BaseProcess] = []
+        self._expected: deque[int] = deque()
+        self._pending: dict[int, BatchResult] = {}
+        self._finished = 0
+
+    def start(self) -> None:
+        if Request.journal is not None:
+            # Otherwise its buffered lines would be written again by every child.
+            Request.journal.flush()
+        with sms_logging.logger_stopped():
+            for shard in range(self.workers):
+                self._start_worker(shard)
+
+    def _start_worker(self, shard: int) -> None:
+        tasks: "Queue[Optional[list[Row]]]" = self._context.Queue(QUEUE_CHUNKS)
+        process = self._context.Process(
+            target=run_worker,
+            args=(shard, self.workers, tasks, self._results, self.url, self.auth),
+            kwargs={
+                "concurrency": self.concurrency,
+                "pipeline_depth": self.pipeline_depth,
+                "template": self.template,
+                "recipient_filter": self.recipient_filter,
+            },
+            name=f"sms-batch-{shard}",
+            daemon=True,
+        )
+        process.start()
+        self._tasks.append(tasks)
+        self._processes.append(process)
+
+    def run(self, path: str) -> BatchSummary:
+        if self.template is not None:
+            check_template(path, self.template)
+        self.start()
+        try:
+            with ResultWriter(self.output) as writer:
+                chunks: list[list[Row]] = [[] for _ in range(self.workers)]
+                for line, row in iter_rows(path):
+                    shard = shard_of(row, self.workers)
+                    self._expected.append(line)
+                    chunks[shard].append((line, row))
+                    if len(chunks[shard]) >= CHUNK_SIZE:
+                        self._dispatch(shard, chunks[shard], writer)
+                        chunks[shard] = []
+                for shard, chunk in enumerate(chunks):
+                    if chunk:
+                        self._dispatch(shard, chunk, writer)
+                    self._dispatch(shard, None, writer)
+                while self._finished < self.workers:
+                    self._collect(writer, block=True)
+        except BaseException:
+            self.terminate()
+            raise
+        for process in self._processes:
+            process.join()
+        return writer.summary
+
+    def terminate(self) -> None:
+        for process in self._processes:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+
+    def _dispatch(self, shard: int, chunk: Optional[list[Row]], writer: ResultWriter) -> None:
+        # A full worker queue must not block the results it is waiting on from being drained.
+        while True:
+            try:
+                self._tasks[shard].put(chunk, timeout=POLL_INTERVAL)
+                return
+            except queue.Full:
+                self._collect(writer, block=False)
+
+    def _collect(self, writer: ResultWriter, *, block: bool) -> None:
+        try:
+            shard, payload = self._results.get(timeout=POLL_INTERVAL) if block else self._results.get_nowait()
+        except queue.Empty:
+            self._check_workers()
+            return
+        if isinstance(payload, dict):
+            registry.merge_state(payload)
+            self._finished += 1
+        else:
+            for result in payload:
+                self._pending[result.line] = result
+        # Workers finish out of order; results go out in input order.
+        while self._expected and self._expected[0] in self._pending:
+            writer.write(self._pending.pop(self._expected.popleft()))
+
+    def _check_workers(self) -> None:
+        for shard, process in enumerate(self._processes):
+            if process.exitcode not in (None, 0):
+                raise SMSClientError(f"Batch worker {shard} exited with code {process.exitcode}")
+
+
+def run_sharded_batch(
+    path: str,
+    output: str,
+    url: str,
+    *,
+    workers: int,
+    auth: Optional[tuple[str, str]] = None,
+    concurrency: int = 8,
+    pipeline_depth: int = 1,
+    template: Optional[MessageTemplate] = None,
+    recipient_filter: Optional[RecipientFilter] = None,
+) -> BatchSummary:
+    batch = ShardedBatch(
+        output,
+        url,
+        workers=workers,
+        auth=auth,
+        concurrency=concurrency,
+        pipeline_depth=pipeline_depth,
+        template=template,
+        recipient_filter=recipient_filter,
+    )
+    return batch.run(path)
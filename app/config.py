@@ -1,9 +1,9 @@
 from typing import Any
 
-import toml
-
 from app.exceptions import ConfigError
 
+_MISSING = object()
+
 
 class Config:
     def __init__(self, config_file: str = "config.toml"):
@@ -11,6 +11,8 @@ class Config:
         self.config_data = self.load_config()
 
     def load_config(self) -> dict[str, Any]:
+        import toml
+
         try:
             with open(self.config_file, "r") as file:
                 return toml.load(file)
@@ -19,7 +21,9 @@ class Config:
         except toml.TomlDecodeError:
             raise ConfigError(f"Error parsing the TOML file '{self.config_file}'.")
 
-    def get(self, key: str) -> Any:
+    def get(self, key: str, default: Any = _MISSING) -> Any:
         if key not in self.config_data:
+            if default is not _MISSING:
+                return default
             raise ConfigError(f"Missing required config key: '{key}'")
         return self.config_data[key]
@@ -0,0 +1,65 @@
+import json
+import os
+import socket
+import stat
+from typing import Optional
+
+from app import exceptions
+from app.http_client.http_message import HTTPResponse
+
+
+def is_own_socket(path: str) -> bool:
+    try:
+        info = os.stat(path)
+    except OSError:
+        return False
+    return stat.S_ISSOCK(info.st_mode) and info.st_uid == os.getuid()
+
+
+def connect(path: str, timeout: Optional[float] = 30.0) -> Optional[socket.socket]:
+    # None means no daemon is listening, so the caller may send directly without risking a duplicate SMS.
+    if not os.path.lexists(path):
+        return None
+    if not is_own_socket(path):
+        from app.utils.logging import logger
+
+        # Message contents only go to a daemon run by this user; another user's socket could fake the replies.
+        logger.warning("Ignoring %s: not a socket owned by this user", path)
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(path)
+    except (FileNotFoundError, ConnectionRefusedError, PermissionError):
+        sock.close()
+        return None
+    except BaseException:
+        sock.close()
+        raise
+    return sock
+
+
+def submit(sock: socket.socket, sender: str, recipient: str, message: str) -> HTTPResponse:
+    request = json.dumps({"sender": sender, "recipient": recipient, "message": message}, ensure_ascii=False)
+    try:
+        sock.sendall(request.encode() + b"\n")
+        with sock.makefile("rb") as reader:
+            line = reader.readline()
+    except OSError as err:
+        raise exceptions.NetworkError(f"SMS daemon connection failed: {err}")
+    if not line:
+        raise exceptions.NetworkError("SMS daemon closed the connection without a reply")
+    return parse_reply(line)
+
+
+def parse_reply(line: bytes) -> HTTPResponse:
+    try:
+        reply = json.loads(line)
+    except ValueError as err:
+        raise exceptions.NetworkError(f"Invalid reply from SMS daemon: {err}")
+    if "error" in reply:
+        error_type = getattr(exceptions, reply.get("type", ""), None)
+        if not (isinstance(error_type, type) and issubclass(error_type, exceptions.SMSClientError)):
+            error_type = exceptions.SMSClientError
+        raise error_type(reply["error"])
+    return HTTPResponse(reply["status_code"], reply["status_message"], body=reply["body"])
@@ -0,0 +1,37 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.utils.metrics import MetricsRegistry
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    server: "MetricsEndpoint"
+
+    def do_GET(self) -> None:
+        if self.path.partition("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        payload = self.server.registry.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+class MetricsEndpoint(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port: int, registry: MetricsRegistry, host: str = "127.0.0.1"):
+        super().__init__((host, port), MetricsHandler)
+        self.registry = registry
+
+    def start(self) -> threading.Thread:
+        thread = threading.Thread(target=self.serve_forever, name="sms-metrics", daemon=True)
+        thread.start()
+        return thread
@@ -0,0 +1,16 @@
+import os
+
+
+def default_socket_path() -> str:
+    override = os.environ.get("SMS_CLIENT_SOCKET")
+    if override:
+        return override
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, f"sms-client-{os.getuid()}.sock")
+    return os.path.join(fallback_socket_dir(), "daemon.sock")
+
+
+def fallback_socket_dir() -> str:
+    # /tmp is shared with other users, so the socket lives in a directory the daemon creates private (0700).
+    return os.path.join("/tmp", f"sms-client-{os.getuid()}")
@@ -0,0 +1,106 @@
+import os
+import socket
+import socketserver
+import stat
+from typing import Any, Optional
+
+from app.daemon.paths import fallback_socket_dir
+from app.exceptions import NetworkError, SMSClientError
+from app.http_client.connection_pool import ConnectionPool
+from app.http_client.request import Request
+from app.http_client.schemas import SMSMessage
+from app.utils import json_codec
+from app.utils.logging import logger
+
+
+class SubmissionHandler(socketserver.StreamRequestHandler):
+    server: "SubmissionServer"
+
+    def handle(self) -> None:
+        # One JSON submission per line; a client may keep the connection open for several sends.
+        for line in self.rfile:
+            if line.strip():
+                self.wfile.write(self.server.submit(line))
+
+
+class SubmissionServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        path: str,
+        url: str,
+        *,
+        auth: Optional[tuple[str, str]] = None,
+        pool: Optional[ConnectionPool] = None,
+    ):
+        self.path = path
+        self.url = url
+        self.auth = auth
+        self.pool = pool
+        self.bound = False
+        if os.path.dirname(path) == fallback_socket_dir():
+            make_private_dir(fallback_socket_dir())
+        remove_stale_socket(path)
+        super().__init__(path, SubmissionHandler)
+
+    def server_bind(self) -> None:
+        super().server_bind()
+        self.bound = True
+        os.chmod(self.path, 0o600)
+
+    def server_close(self) -> None:
+        super().server_close()
+        if self.bound:
+            self.bound = False
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+
+    def submit(self, line: bytes) -> bytes:
+        reply: dict[str, Any]
+        try:
+            fields = json_codec.loads(line)
+            sms_message = SMSMessage(fields["sender"], fields["recipient"], fields["message"])
+            response = Request.post(self.url, auth=self.auth, body=sms_message, pool=self.pool)
+        except SMSClientError as err:
+            logger.error("Submission failed: %s", err)
+            reply = {"error": str(err), "type": type(err).__name__}
+        except (ValueError, KeyError, TypeError) as err:
+            reply = {"error": f"Invalid submission: {err!r}", "type": "ValidationError"}
+        else:
+            reply = {"status_code": response.status_code, "status_message": response.status_message}
+            reply["body"] = response.body
+        return (json_codec.dumps(reply) + "\n").encode()
+
+
+def make_private_dir(path: str) -> None:
+    # Another user may have created it first: it is only used if this user owns it and no one else can enter it.
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise NetworkError(f"Refusing to use {path}: it must be a directory private to this user")
+
+
+def remove_stale_socket(path: str) -> None:
+    try:
+        info = os.stat(path)
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(info.st_mode):
+        raise NetworkError(f"Refusing to replace {path}: it is not a socket")
+    if info.st_uid != os.getuid():
+        raise NetworkError(f"Refusing to replace {path}: it belongs to another user")
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except ConnectionRefusedError:
+        os.unlink(path)
+        return
+    finally:
+        probe.close()
+    raise NetworkError(f"An SMS daemon is already listening on {path}")
@@ -14,6 +14,12 @@ class NetworkError(SMSClientError):
     pass
 
 
+class PoolTimeoutError(NetworkError):
+    """Нет свободного соединения в пуле за отведённое время"""
+
+    pass
+
+
 class ValidationError(SMSClientError):
     """Ошибки валидации данных"""
 
@@ -56,6 +62,12 @@ class MessageError(ValidationError):
     pass
 
 
+class TemplateError(ValidationError):
+    """Ошибки шаблона сообщения"""
+
+    pass
+
+
 class SerializationError(SMSClientError):
     """Ошибки сериализации/десериализации данных"""
 
@@ -0,0 +1,292 @@
+import asyncio
+import logging
+import ssl
+import time
+from typing import Any, Iterable, Optional, Union
+
+from app.exceptions import HTTPRequestError, HTTPResponseError, NetworkError, SMSClientError
+from app.http_client.http_message import HTTPRequest, HTTPResponse
+from app.http_client.request import Request
+from app.http_client.response_reader import (
+    HEADER_TERMINATOR,
+    MAX_CHUNK_LINE_SIZE,
+    MAX_HEAD_SIZE,
+    BodyFraming,
+    normalize_head,
+    parse_chunk_size,
+    parse_framing,
+)
+from app.http_client.schemas import HTTPBody
+from app.http_client.tracing import current_trace, trace_send
+from app.utils import metrics
+from app.utils.logging import logger
+
+StreamPair = tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+
+async def read_message(reader: asyncio.StreamReader, request_method: str = "GET") -> tuple[bytes, bool]:
+    while True:
+        try:
+            head = await reader.readuntil(HEADER_TERMINATOR)
+        except asyncio.IncompleteReadError as err:
+            if not err.partial:
+                raise ConnectionResetError("Connection closed before any response was received")
+            raise HTTPResponseError("Connection closed before the end of the response")
+        except asyncio.LimitOverrunError:
+            raise HTTPResponseError(f"Response head exceeds {MAX_HEAD_SIZE} bytes")
+        framing = parse_framing(head, request_method)
+        if not 100 <= framing.status_code < 200:
+            break
+
+    try:
+        if framing.kind == BodyFraming.NONE:
+            return head, True
+        if framing.kind == BodyFraming.LENGTH:
+            return head + await reader.readexactly(framing.length), True
+        if framing.kind == BodyFraming.UNTIL_CLOSE:
+            body = await reader.read()
+            return normalize_head(head, len(body)) + body, False
+
+        chunks = bytearray()
+        while size := parse_chunk_size(await reader.readuntil(b"\r\n")):
+            chunks += await reader.readexactly(size)
+            if await reader.readexactly(2) != b"\r\n":
+                raise HTTPResponseError("Chunk data is not followed by CRLF")
+        while await reader.readuntil(b"\r\n") != b"\r\n":
+            pass
+        return normalize_head(head, len(chunks)) + chunks, True
+    except asyncio.IncompleteReadError:
+        raise HTTPResponseError("Connection closed before the end of the response")
+    except asyncio.LimitOverrunError:
+        raise HTTPResponseError(f"Chunk line exceeds {MAX_CHUNK_LINE_SIZE} bytes")
+
+
+class AsyncConnectionPool:
+    def __init__(self, *, max_idle_per_host: int = 100):
+        self.max_idle_per_host = max_idle_per_host
+        self._idle: dict[tuple[str, int], list[StreamPair]] = {}
+
+    async def acquire(
+        self, host: str, port: int, ssl_context: Optional[ssl.SSLContext] = None
+    ) -> tuple[StreamPair, bool]:
+        idle = self._idle.get((host, port))
+        while idle:
+            reader, writer = idle.pop()
+            if not reader.at_eof() and not writer.is_closing():
+                metrics.CONNECTIONS_ACTIVE.inc()
+                metrics.CONNECTIONS_REUSED.inc()
+                return (reader, writer), True
+            writer.close()
+        started = time.perf_counter()
+        streams = await asyncio.open_connection(
+            host, port, ssl=ssl_context, server_hostname=host if ssl_context else None, limit=MAX_HEAD_SIZE
+        )
+        trace = current_trace()
+        if trace is not None:
+            # open_connection() resolves, connects and handshakes in one call, so all of it counts as connect time.
+            trace.connect += time.perf_counter() - started
+        metrics.CONNECTIONS_OPENED.inc()
+        metrics.CONNECTIONS_ACTIVE.inc()
+        return streams, False
+
+    def release(self, host: str, port: int, streams: StreamPair, *, reusable: bool = True) -> None:
+        metrics.CONNECTIONS_ACTIVE.dec()
+        idle = self._idle.setdefault((host, port), [])
+        if reusable and len(idle) < self.max_idle_per_host:
+            idle.append(streams)
+        else:
+            streams[1].close()
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for _, writer in connections:
+                writer.close()
+                try:
+                    await writer.wait_closed()
+                except OSError:
+                    pass
+
+
+class AsyncRequest:
+    @staticmethod
+    async def method(
+        method: str,
+        url: str,
+        *,
+        auth: Optional[tuple[str, str]] = None,
+        headers: Optional[dict[str, str]] = None,
+        body: Optional[Union[HTTPBody, dict[str, Any], str]] = None,
+        pool: Optional[AsyncConnectionPool] = None,
+    ) -> HTTPResponse:
+        journal = Request.journal
+        if journal is None:
+            return await AsyncRequest._method(method, url, auth=auth, headers=headers, body=body, pool=pool)
+
+        recipient = getattr(body, "recipient", None)
+        try:
+            with trace_send() as trace:
+                response = await AsyncRequest._method(method, url, auth=auth, headers=headers, body=body, pool=pool)
+        except SMSClientError as err:
+            journal.record(trace, recipient=recipient, error=str(err))
+            raise
+        journal.record(trace, recipient=recipient, status_code=response.status_code)
+        return response
+
+    @staticmethod
+    async def _method(
+        method: str,
+        url: str,
+        *,
+        auth: Optional[tuple[str, str]] = None,
+        headers: Optional[dict[str, str]] = None,
+        body: Optional[Union[HTTPBody, dict[str, Any], str]] = None,
+        pool: Optional[AsyncConnectionPool] = None,
+    ) -> HTTPResponse:
+        try:
+            request, port, ssl_context = Request.build_request(method, url, auth=auth, headers=headers, body=body)
+            account = Request.rate_limit_account(request.host, auth)
+            policy = Request.retry_policy
+            if policy:
+                policy.start()
+            trace = current_trace()
+            if trace is not None:
+                trace.message_id = request.headers.get("Idempotency-Key")
+
+            attempt = 1
+            while True:
+                if trace is not None:
+                    trace.attempts = attempt
+                try:
+                    response = await AsyncRequest._send(pool, port, request, account, ssl_context)
+                except NetworkError as err:
+                    metrics.REQUESTS.inc("error")
+                    delay = policy.retry_delay(attempt) if policy else None
+                    if delay is None:
+                        raise
+                    logger.warning("Attempt %d failed (%s), retrying in %.2fs", attempt, err, delay)
+                else:
+                    metrics.REQUESTS.inc(str(response.status_code))
+                    delay = policy.retry_delay(attempt, response) if policy else None
+                    if delay is None:
+                        logger.info("Response: %s", response.start_line)
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug("Response Body: %s", response.body)
+                        return response
+                    logger.warning("Attempt %d got %s, retrying in %.2fs", attempt, response.status_code, delay)
+                metrics.RETRIES.inc()
+                await asyncio.sleep(delay)
+                attempt += 1
+
+        except NetworkError:
+            raise
+        except (OSError, asyncio.TimeoutError) as err:
+            raise NetworkError(f"Network error: {err}")
+        except Exception as err:
+            raise HTTPRequestError(f"Request failed: {err}")
+
+    @staticmethod
+    async def _send(
+        pool: Optional[AsyncConnectionPool],
+        port: int,
+        request: HTTPRequest,
+        account: str,
+        ssl_context: Optional[ssl.SSLContext] = None,
+    ) -> HTTPResponse:
+        if Request.rate_limiter:
+            await asyncio.sleep(Request.rate_limiter.reserve(account))
+        try:
+            response = await AsyncRequest._exchange(
+                pool or AsyncConnectionPool(max_idle_per_host=0), request, port, ssl_context
+            )
+        except (OSError, asyncio.TimeoutError) as err:
+            raise NetworkError(f"Network error: {err}")
+        Request.apply_throttling(account, response)
+        return response
+
+    @staticmethod
+    async def _exchange(
+        pool: AsyncConnectionPool, request: HTTPRequest, port: int, ssl_context: Optional[ssl.SSLContext] = None
+    ) -> HTTPResponse:
+        buffers = request.to_buffers()
+        sent_bytes = sum(len(buffer) for buffer in buffers)
+        trace = current_trace()
+        while True:
+            (reader, writer), reused = await pool.acquire(request.host, port, ssl_context)
+            try:
+                started = time.perf_counter()
+                writer.writelines(buffers)
+                await writer.drain()
+                sent = time.perf_counter()
+                response_data, reusable = await read_message(reader, request.method)
+                metrics.REQUEST_LATENCY.observe(time.perf_counter() - started)
+                metrics.BYTES_SENT.inc(amount=sent_bytes)
+                metrics.BYTES_RECEIVED.inc(amount=len(response_data))
+                response = HTTPResponse.from_bytes(response_data)
+                if trace is not None:
+                    trace.write += sent - started
+                    # Streams hide when the first byte arrived; gateway replies are small, so the whole read counts.
+                    trace.ttfb += time.perf_counter() - sent
+            except ConnectionError:
+                pool.release(request.host, port, (reader, writer), reusable=False)
+                if reused:
+                    continue
+                raise
+            except BaseException:
+                pool.release(request.host, port, (reader, writer), reusable=False)
+                raise
+
+            pool.release(request.host, port, (reader, writer), reusable=reusable and Request.is_keep_alive(response))
+            return response
+
+    @staticmethod
+    async def post(
+        url: str,
+        *,
+        auth: Optional[tuple[str, str]] = None,
+        headers: Optional[dict[str, str]] = None,
+        body: Optional[Union[HTTPBody, dict[str, Any], str]] = None,
+        pool: Optional[AsyncConnectionPool] = None,
+    ) -> HTTPResponse:
+        return await AsyncRequest.method("POST", url, auth=auth, headers=headers, body=body, pool=pool)
+
+    @staticmethod
+    async def send_many(
+        url: str,
+        bodies: Iterable[HTTPBody],
+        *,
+        auth: Optional[tuple[str, str]] = None,
+        headers: Optional[dict[str, str]] = None,
+        concurrency: int = 100,
+    ) -> list[Union[HTTPResponse, SMSClientError]]:
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        semaphore = asyncio.Semaphore(concurrency)
+        pool = AsyncConnectionPool(max_idle_per_host=concurrency)
+        results: list[Union[HTTPResponse, SMSClientError]] = []
+        tasks: set[asyncio.Task[None]] = set()
+
+        async def send(index: int, body: HTTPBody) -> None:
+            try:
+                results[index] = await AsyncRequest.post(url, auth=auth, headers=headers, body=body, pool=pool)
+            except SMSClientError as err:
+                results[index] = err
+            finally:
+                semaphore.release()
+
+        try:
+            # Tasks are created only once a slot is free, so a huge input never materialises as pending tasks.
+            for index, body in enumerate(bodies):
+                await semaphore.acquire()
+                results.append(HTTPRequestError("Request was not sent"))
+                task = asyncio.create_task(send(index, body))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await pool.close()
+        return results
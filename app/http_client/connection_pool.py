@@ -0,0 +1,216 @@
+import select
+import socket
+import ssl
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional, Sequence
+
+from app.exceptions import PoolTimeoutError
+from app.http_client.http_message import Buffer
+from app.http_client.tracing import SendTrace, current_trace
+from app.utils import metrics
+
+PoolKey = tuple[str, int]
+
+
+@dataclass
+class PooledConnection:
+    sock: socket.socket
+    host: str
+    port: int
+    created_at: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+    requests: int = 0
+
+    @property
+    def key(self) -> PoolKey:
+        return self.host, self.port
+
+    @property
+    def is_reused(self) -> bool:
+        return self.requests > 0
+
+    def is_alive(self, idle_timeout: float) -> bool:
+        if time.monotonic() - self.last_used > idle_timeout:
+            return False
+        try:
+            # An idle keep-alive socket must have nothing to read: readable means EOF or stray data.
+            readable = self._readable()
+        except (OSError, ValueError):
+            return False
+        if readable and isinstance(self.sock, ssl.SSLSocket):
+            # TLS 1.3 session tickets make an idle socket readable without carrying any application data.
+            return self._only_tls_records_pending()
+        return not readable
+
+    def _readable(self) -> bool:
+        if not hasattr(select, "poll"):
+            readable, _, _ = select.select([self.sock], [], [], 0)
+            return bool(readable)
+        # poll() rather than select(), which cannot watch descriptors above FD_SETSIZE (1024).
+        poller = select.poll()
+        poller.register(self.sock, select.POLLIN)
+        return bool(poller.poll(0))
+
+    def _only_tls_records_pending(self) -> bool:
+        timeout = self.sock.gettimeout()
+        self.sock.setblocking(False)
+        try:
+            self.sock.recv(1)
+        except ssl.SSLWantReadError:
+            return True
+        except OSError:
+            return False
+        finally:
+            self.sock.settimeout(timeout)
+        return False
+
+    def send(self, buffers: Sequence[Buffer]) -> int:
+        if isinstance(self.sock, ssl.SSLSocket):
+            # SSL sockets have no sendmsg(); one write keeps the request in as few TLS records as possible.
+            payload = buffers[0] if len(buffers) == 1 else b"".join(buffers)
+            self.sock.sendall(payload)
+            return len(payload)
+
+        views = [memoryview(buffer) for buffer in buffers if buffer]
+        total = 0
+        while views:
+            sent = self.sock.sendmsg(views)
+            total += sent
+            while views and sent >= len(views[0]):
+                sent -= len(views.pop(0))
+            if sent:
+                views[0] = views[0][sent:]
+        return total
+
+    def close(self) -> None:
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class ConnectionPool:
+    def __init__(
+        self,
+        *,
+        max_per_host: int = 10,
+        idle_timeout: float = 30.0,
+        timeout: Optional[float] = None,
+        acquire_timeout: Optional[float] = None,
+    ):
+        if max_per_host < 1:
+            raise ValueError("max_per_host must be at least 1")
+        self.max_per_host = max_per_host
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.acquire_timeout = acquire_timeout
+        self._idle: dict[PoolKey, deque[PooledConnection]] = {}
+        self._active: dict[PoolKey, int] = {}
+        self._sessions: dict[PoolKey, ssl.SSLSession] = {}
+        self._cond = threading.Condition()
+
+    def acquire(self, host: str, port: int, ssl_context: Optional[ssl.SSLContext] = None) -> PooledConnection:
+        key = (host, port)
+        deadline = None if self.acquire_timeout is None else time.monotonic() + self.acquire_timeout
+
+        with self._cond:
+            while True:
+                idle = self._idle.get(key)
+                while idle:
+                    conn = idle.pop()
+                    if conn.is_alive(self.idle_timeout):
+                        self._active[key] = self._active.get(key, 0) + 1
+                        metrics.CONNECTIONS_ACTIVE.inc()
+                        metrics.CONNECTIONS_REUSED.inc()
+                        return conn
+                    conn.close()
+
+                if self._active.get(key, 0) < self.max_per_host:
+                    self._active[key] = self._active.get(key, 0) + 1
+                    metrics.CONNECTIONS_ACTIVE.inc()
+                    break
+
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise PoolTimeoutError(f"No free connection to {host}:{port} within {self.acquire_timeout}s")
+                self._cond.wait(remaining)
+
+        try:
+            sock = self._connect(host, port, ssl_context)
+        except BaseException:
+            self._checkin(key)
+            raise
+        metrics.CONNECTIONS_OPENED.inc()
+        return PooledConnection(sock, host, port)
+
+    def _connect(self, host: str, port: int, ssl_context: Optional[ssl.SSLContext]) -> socket.socket:
+        trace = current_trace()
+        if trace is None:
+            sock = socket.create_connection((host, port), timeout=self.timeout)
+        else:
+            sock = self._traced_connect(host, port, trace)
+        if ssl_context is None:
+            return sock
+        started = time.perf_counter()
+        try:
+            # Resuming a previous session to the same host skips the full handshake.
+            return ssl_context.wrap_socket(sock, server_hostname=host, session=self._sessions.get((host, port)))
+        except BaseException:
+            sock.close()
+            raise
+        finally:
+            if trace is not None:
+                trace.tls += time.perf_counter() - started
+
+    def _traced_connect(self, host: str, port: int, trace: SendTrace) -> socket.socket:
+        # Resolving separately from create_connection() lets the journal tell DNS time from connect time.
+        started = time.perf_counter()
+        addresses = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        resolved = time.perf_counter()
+        trace.dns += resolved - started
+        error: Optional[OSError] = None
+        try:
+            for *_, address in addresses:
+                try:
+                    return socket.create_connection((str(address[0]), port), timeout=self.timeout)
+                except OSError as err:
+                    error = err
+            raise error or OSError(f"getaddrinfo returned no addresses for {host}")
+        finally:
+            trace.connect += time.perf_counter() - resolved
+
+    def release(self, conn: PooledConnection, *, reusable: bool = True) -> None:
+        conn.requests += 1
+        conn.last_used = time.monotonic()
+        if isinstance(conn.sock, ssl.SSLSocket) and conn.sock.session is not None:
+            with self._cond:
+                self._sessions[conn.key] = conn.sock.session
+        if not reusable:
+            conn.close()
+        self._checkin(conn.key, conn if reusable else None)
+
+    def _checkin(self, key: PoolKey, conn: Optional[PooledConnection] = None) -> None:
+        with self._cond:
+            self._active[key] = max(self._active.get(key, 0) - 1, 0)
+            metrics.CONNECTIONS_ACTIVE.dec()
+            if conn is not None:
+                self._idle.setdefault(key, deque()).append(conn)
+            self._cond.notify()
+
+    def idle_count(self, host: str, port: int) -> int:
+        with self._cond:
+            return len(self._idle.get((host, port), ()))
+
+    def active_count(self, host: str, port: int) -> int:
+        with self._cond:
+            return self._active.get((host, port), 0)
+
+    def clear(self) -> None:
+        with self._cond:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for conn in connections:
+                conn.close()
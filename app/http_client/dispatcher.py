@@ -0,0 +1,113 @@
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from dataclasses import dataclass
+from types import TracebackType
+from typing import Any, Callable, Iterable, Iterator, Optional, TypeVar, Union
+
+from app.exceptions import SMSClientError
+from app.http_client.connection_pool import ConnectionPool
+from app.http_client.http_message import HTTPResponse
+from app.http_client.request import Request
+from app.http_client.schemas import HTTPBody
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+@dataclass
+class DispatchResult:
+    index: int
+    body: Union[HTTPBody, dict[str, Any], str]
+    response: Optional[HTTPResponse] = None
+    error: Optional[SMSClientError] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.response is not None and self.response.status_code < 400
+
+
+class Dispatcher:
+    def __init__(
+        self,
+        url: str,
+        *,
+        auth: Optional[tuple[str, str]] = None,
+        headers: Optional[dict[str, str]] = None,
+        max_workers: int = 8,
+        max_pending: Optional[int] = None,
+        connections_per_worker: int = 1,
+    ):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.url = url
+        self.auth = auth
+        self.headers = headers
+        self.max_workers = max_workers
+        self.max_pending = max(max_pending or max_workers * 2, max_workers)
+        self.connections_per_worker = connections_per_worker
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sms-dispatch")
+        self._local = threading.local()
+        self._pools: list[ConnectionPool] = []
+        self._pools_lock = threading.Lock()
+
+    def __enter__(self) -> "Dispatcher":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def worker_pool(self) -> ConnectionPool:
+        pool: Optional[ConnectionPool] = getattr(self._local, "pool", None)
+        if pool is None:
+            # Each worker thread keeps its own sockets, so a connection is never shared between threads.
+            pool = ConnectionPool(max_per_host=self.connections_per_worker)
+            self._local.pool = pool
+            with self._pools_lock:
+                self._pools.append(pool)
+        return pool
+
+    def send(self, index: int, body: Union[HTTPBody, dict[str, Any], str]) -> DispatchResult:
+        try:
+            response = Request.post(self.url, auth=self.auth, headers=self.headers, body=body, pool=self.worker_pool())
+        except SMSClientError as err:
+            return DispatchResult(index, body, error=err)
+        return DispatchResult(index, body, response=response)
+
+    def run(self, func: Callable[[T], R], items: Iterable[T], *, ordered: bool = True) -> Iterator[R]:
+        if ordered:
+            window: deque[Future[R]] = deque()
+            for item in items:
+                window.append(self._executor.submit(func, item))
+                if len(window) >= self.max_pending:
+                    yield window.popleft().result()
+            while window:
+                yield window.popleft().result()
+            return
+
+        pending: set[Future[R]] = set()
+        for item in items:
+            pending.add(self._executor.submit(func, item))
+            if len(pending) >= self.max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        for future in as_completed(pending):
+            yield future.result()
+
+    def map(
+        self, bodies: Iterable[Union[HTTPBody, dict[str, Any], str]], *, ordered: bool = True
+    ) -> Iterator[DispatchResult]:
+        return self.run(lambda item: self.send(*item), enumerate(bodies), ordered=ordered)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        with self._pools_lock:
+            pools, self._pools = self._pools, []
+        for pool in pools:
+            pool.clear()
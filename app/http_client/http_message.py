@@ -1,14 +1,101 @@
 from abc import ABC, abstractmethod
-from typing import Optional, Self
+from collections.abc import Iterator, Mapping, MutableMapping
+from typing import Optional, Self, Union
 
 from app.auth.basic_auth import HTTPBasicAuth
 from app.exceptions import AuthenticationError, HTTPMessageError, HTTPRequestError, HTTPResponseError
 
+Buffer = Union[bytes, bytearray, memoryview]
+
+HEADER_TERMINATOR = b"\r\n\r\n"
+
+
+class HTTPHeaders(MutableMapping[str, str]):
+    def __init__(self, headers: Optional[Mapping[str, str]] = None):
+        self._store: dict[str, str] = {}
+        if headers is not None:
+            self._store.update(headers._store if isinstance(headers, HTTPHeaders) else headers)
+        # Lower-cased name -> stored name, built on the first lookup that misses the exact spelling.
+        self._names: Optional[dict[str, str]] = None
+
+    def _name(self, key: str) -> Optional[str]:
+        if key in self._store:
+            return key
+        if self._names is None:
+            self._names = {name.lower(): name for name in self._store}
+        return self._names.get(key.lower())
+
+    def __getitem__(self, key: str) -> str:
+        name = self._name(key)
+        if name is None:
+            raise KeyError(key)
+        return self._store[name]
+
+    def __setitem__(self, key: str, value: str) -> None:
+        name = self._name(key)
+        if name is not None and name != key:
+            del self._store[name]
+        self._store[key] = value
+        if self._names is not None:
+            self._names[key.lower()] = key
+
+    def __delitem__(self, key: str) -> None:
+        name = self._name(key)
+        if name is None:
+            raise KeyError(key)
+        del self._store[name]
+        if self._names is not None:
+            del self._names[name.lower()]
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self._name(key) is not None
+
+    def get(self, key: str, default: Optional[str] = None) -> Optional[str]:  # type: ignore[override]
+        name = self._name(key)
+        return default if name is None else self._store[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._store)
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._store!r})"
+
+    def copy(self) -> "HTTPHeaders":
+        return HTTPHeaders(self)
+
 
 class HTTPMessage(ABC):
-    def __init__(self, *, headers: Optional[dict[str, str]] = None, body: Optional[str] = None):
-        self.headers = headers or {}
-        self.body = body or ""
+    _body: Buffer
+    _body_text: Optional[str]
+
+    def __init__(self, *, headers: Optional[Mapping[str, str]] = None, body: Optional[Union[str, Buffer]] = None):
+        self.headers = HTTPHeaders(headers)
+        self.body = body or b""
+
+    @property
+    def body(self) -> str:
+        if self._body_text is None:
+            self._body_text = str(self._body, "utf-8", "replace")
+        return self._body_text
+
+    @body.setter
+    def body(self, value: Union[str, Buffer]) -> None:
+        if isinstance(value, str):
+            self._body, self._body_text = value.encode(), value
+        elif isinstance(value, memoryview) and value.readonly:
+            # A parsed body stays a view into the received buffer until someone asks for bytes.
+            self._body, self._body_text = value, None
+        else:
+            self._body, self._body_text = bytes(value), None
+
+    @property
+    def body_bytes(self) -> bytes:
+        if not isinstance(self._body, bytes):
+            self._body = bytes(self._body)
+        return self._body
 
     @property
     @abstractmethod
@@ -20,43 +107,56 @@ class HTTPMessage(ABC):
     def from_bytes(cls, binary_data: bytes) -> Self:
         pass
 
+    def get_header(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        return self.headers.get(name, default)
+
     def _update_headers(self) -> None:
-        self.headers["Content-Length"] = str(len(self.body))
+        self.headers["Content-Length"] = str(len(self._body))
 
-    def to_bytes(self) -> bytes:
+    def to_buffers(self) -> list[Buffer]:
         self._update_headers()
-        headers = "\r\n".join(f"{key}: {value}" for key, value in self.headers.items())
-        return f"{self.start_line}\r\n{headers}\r\n\r\n{self.body}".encode()
+        head = "".join(
+            [self.start_line, "\r\n", *(f"{key}: {value}\r\n" for key, value in self.headers.items()), "\r\n"]
+        )
+        # The body stays a separate buffer so it can go out with sendmsg() without being copied into the head.
+        return [head.encode(), self._body] if self._body else [head.encode()]
+
+    def to_bytes(self) -> bytes:
+        return b"".join(self.to_buffers())
 
     @staticmethod
-    def _parse_message(binary_data: bytes) -> tuple[list[str], dict[str, str], str]:
+    def _parse_message(binary_data: bytes) -> tuple[list[str], HTTPHeaders, memoryview]:
+        # Only the head is decoded; the body is sliced out of the original buffer without a copy.
+        head_end = binary_data.find(HEADER_TERMINATOR)
+        body_start = head_end + len(HEADER_TERMINATOR)
+        if head_end == -1:
+            head_end = body_start = len(binary_data)
+
         try:
-            data = binary_data.decode()
+            data = binary_data[:head_end].decode()
         except UnicodeDecodeError:
             raise HTTPMessageError("Failed to decode binary data.")
 
-        lines = data.split("\r\n")
-        if not lines or not lines[0]:
+        start_line, *lines = data.split("\r\n")
+        if not start_line:
             raise HTTPMessageError("Invalid message format: No start line found.")
 
-        start_line, *lines = lines
-        headers, body = {}, ""
-        blank_line_idx = lines.index("") if "" in lines else len(lines)
-
-        try:
-            for line in lines[:blank_line_idx]:
-                key, value = line.split(": ", 1)
-                headers[key] = value
-        except ValueError:
-            raise HTTPMessageError("Invalid header format. Expected 'key: value'.")
-
-        if blank_line_idx + 1 < len(lines):
-            body = "\r\n".join(lines[blank_line_idx + 1 :])
+        headers = HTTPHeaders()
+        store = headers._store
+        for line in lines:
+            if not line:
+                break
+            # RFC 9112: the whitespace around a field value is optional and not part of it.
+            key, sep, value = line.partition(":")
+            if not sep:
+                raise HTTPMessageError("Invalid header format. Expected 'key: value'.")
+            store[key] = value.strip(" \t")
 
         parts = start_line.split(" ", 2)
         if len(parts) != 3:
             raise HTTPMessageError(f"Invalid start line format: {start_line}")
 
+        body = memoryview(binary_data)[body_start:]
         if body:
             content_length_str = headers.get("Content-Length")
             if content_length_str is None:
@@ -81,8 +181,8 @@ class HTTPRequest(HTTPMessage):
         path: str,
         *,
         auth: Optional[tuple[str, str]] = None,
-        headers: Optional[dict[str, str]] = None,
-        body: Optional[str] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        body: Optional[Union[str, Buffer]] = None,
     ):
         super().__init__(headers=headers, body=body)
         self.method = method
@@ -97,6 +197,7 @@ class HTTPRequest(HTTPMessage):
     def _update_headers(self) -> None:
         super()._update_headers()
         self.headers["Host"] = self.host
+        self.headers.setdefault("Connection", "keep-alive")
         if self.auth:
             self.headers["Authorization"] = HTTPBasicAuth.encode(self.auth)
         else:
@@ -133,8 +234,8 @@ class HTTPResponse(HTTPMessage):
         status_code: int,
         status_message: str,
         *,
-        headers: Optional[dict[str, str]] = None,
-        body: Optional[str] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        body: Optional[Union[str, Buffer]] = None,
     ):
         super().__init__(headers=headers, body=body)
         self.status_code = status_code
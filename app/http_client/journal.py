@@ -0,0 +1,85 @@
+import hashlib
+import threading
+import time
+from types import TracebackType
+from typing import Any, Optional, TextIO
+
+from app.exceptions import ConfigError
+from app.http_client.tracing import SendTrace
+from app.utils import json_codec
+
+
+def hash_recipient(recipient: str) -> str:
+    # Records are meant for analytics, so the phone number itself is never written.
+    return hashlib.sha256(recipient.encode()).hexdigest()[:16]
+
+
+class SendJournal:
+    def __init__(self, path: str, *, buffer_size: int = 64 * 1024):
+        if buffer_size < 1:
+            raise ValueError("buffer_size must be at least 1")
+        self.path = path
+        self._file: Optional[TextIO] = open(path, "a", encoding="utf-8", buffering=buffer_size)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, options: Optional[dict[str, Any]]) -> Optional["SendJournal"]:
+        if not options:
+            return None
+        try:
+            return cls(options["file"], buffer_size=int(options.get("buffer_size", 64 * 1024)))
+        except KeyError:
+            raise ConfigError("Missing required config key: 'journal.file'")
+        except (TypeError, ValueError) as err:
+            raise ConfigError(f"Invalid journal settings: {err}")
+        except OSError as err:
+            raise ConfigError(f"Cannot open journal file: {err}")
+
+    def __enter__(self) -> "SendJournal":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def record(
+        self,
+        trace: SendTrace,
+        *,
+        recipient: Optional[str] = None,
+        status_code: Optional[int] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        entry = {
+            "ts": round(time.time(), 3),
+            "message_id": trace.message_id,
+            "recipient_hash": hash_recipient(recipient) if recipient else None,
+            "dns_ms": round(trace.dns * 1000, 3),
+            "connect_ms": round(trace.connect * 1000, 3),
+            "tls_ms": round(trace.tls * 1000, 3),
+            "write_ms": round(trace.write * 1000, 3),
+            "ttfb_ms": round(trace.ttfb * 1000, 3),
+            "total_ms": round(trace.total * 1000, 3),
+            "status_code": status_code,
+            "retries": trace.retries,
+            "error": error,
+        }
+        line = json_codec.dumps(entry) + "\n"
+        with self._lock:
+            if self._file is not None:
+                self._file.write(line)
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
@@ -0,0 +1,200 @@
+import socket
+import ssl
+import time
+from collections import deque
+from typing import Any, Optional, Sequence, Union
+
+from app.exceptions import HTTPRequestError, SMSClientError
+from app.http_client.connection_pool import ConnectionPool
+from app.http_client.http_message import HTTPRequest, HTTPResponse
+from app.http_client.request import Request
+from app.http_client.response_reader import ResponseReader
+from app.http_client.schemas import HTTPBody
+from app.http_client.tracing import SendTrace
+from app.utils import metrics
+from app.utils.logging import logger
+
+Body = Union[HTTPBody, dict[str, Any], str]
+PipelineResult = Union[HTTPResponse, SMSClientError]
+
+
+class Pipeline:
+    def __init__(
+        self,
+        url: str,
+        *,
+        auth: Optional[tuple[str, str]] = None,
+        headers: Optional[dict[str, str]] = None,
+        depth: int = 8,
+        pool: Optional[ConnectionPool] = None,
+    ):
+        if depth < 1:
+            raise ValueError("depth must be at least 1")
+        self.url = url
+        self.auth = auth
+        self.headers = headers
+        self.depth = depth
+        self.pool = pool or Request.pool
+
+    def post(self, bodies: Sequence[Body]) -> list[PipelineResult]:
+        results: list[PipelineResult] = [HTTPRequestError("Request was not sent")] * len(bodies)
+        prepared: list[tuple[int, HTTPRequest]] = []
+        # Traces of pipelined sends by index, kept only when a journal will record them.
+        traces: Optional[dict[int, SendTrace]] = {} if Request.journal is not None else None
+        port, ssl_context = 0, None
+        for index, body in enumerate(bodies):
+            try:
+                request, port, ssl_context = Request.build_request(
+                    "POST", self.url, auth=self.auth, headers=self.headers, body=body
+                )
+            except SMSClientError as err:
+                results[index] = err
+                if traces is not None:
+                    traces[index] = SendTrace()
+            else:
+                prepared.append((index, request))
+
+        unanswered = self._pipeline(prepared, port, ssl_context, results, traces) if prepared else []
+        if unanswered:
+            logger.warning("Pipeline to %s stopped early, sending %d requests serially", self.url, len(unanswered))
+        retried = self._retryable(prepared, unanswered, results)
+        if traces is not None:
+            # Requests sent again serially are journaled by Request.post, once, with their final outcome.
+            self._journal(bodies, results, traces, set(unanswered + retried))
+        keys = {index: request.headers.get("Idempotency-Key") for index, request in prepared}
+        resent_after_response = set(retried)
+        for index in sorted(unanswered + retried):
+            # A retried response was attempt 1; a request the pipeline never got an answer to has not been tried.
+            first_attempt = 2 if index in resent_after_response else 1
+            results[index] = self._post_serial(bodies[index], keys[index], first_attempt)
+        return results
+
+    @staticmethod
+    def _journal(
+        bodies: Sequence[Body], results: list[PipelineResult], traces: dict[int, SendTrace], resent: set[int]
+    ) -> None:
+        journal = Request.journal
+        if journal is None:
+            return
+        for index, trace in sorted(traces.items()):
+            if index in resent:
+                continue
+            recipient = getattr(bodies[index], "recipient", None)
+            result = results[index]
+            if isinstance(result, HTTPResponse):
+                journal.record(trace, recipient=recipient, status_code=result.status_code)
+            else:
+                journal.record(trace, recipient=recipient, error=str(result))
+
+    def _retryable(
+        self, prepared: list[tuple[int, HTTPRequest]], unanswered: list[int], results: list[PipelineResult]
+    ) -> list[int]:
+        # Retryable statuses get the same policy as a serial send: after one backoff, they go out again serially.
+        policy = Request.retry_policy
+        if policy is None:
+            return []
+        retried, delay, skipped = [], 0.0, set(unanswered)
+        for index, _ in prepared:
+            result = results[index]
+            if index in skipped or not isinstance(result, HTTPResponse):
+                continue
+            policy.start()
+            retry_delay = policy.retry_delay(1, result)
+            if retry_delay is not None:
+                retried.append(index)
+                delay = max(delay, retry_delay)
+        if retried:
+            logger.warning(
+                "Pipeline to %s got %d retryable responses, retrying in %.2fs", self.url, len(retried), delay
+            )
+            metrics.RETRIES.inc(amount=len(retried))
+            time.sleep(delay)
+        return retried
+
+    def _pipeline(
+        self,
+        prepared: list[tuple[int, HTTPRequest]],
+        port: int,
+        ssl_context: Optional[ssl.SSLContext],
+        results: list[PipelineResult],
+        traces: Optional[dict[int, SendTrace]] = None,
+    ) -> list[int]:
+        host = prepared[0][1].host
+        account = Request.rate_limit_account(host, self.auth)
+        queue = deque(prepared)
+        # Each request in flight with the times its write started and finished.
+        in_flight: deque[tuple[int, HTTPRequest, float, float]] = deque()
+        reusable = False
+
+        try:
+            conn = self.pool.acquire(host, port, ssl_context)
+        except (OSError, SMSClientError) as err:
+            logger.warning("Pipeline connection to %s:%d failed: %s", host, port, err)
+            return [index for index, _ in prepared]
+
+        sending = True
+        try:
+            reader = ResponseReader(conn.sock, Request.BUFF_SIZE)
+            while in_flight or (sending and queue):
+                # Keep up to `depth` requests on the wire; the server answers them strictly in order.
+                while sending and queue and len(in_flight) < self.depth:
+                    if Request.rate_limiter:
+                        Request.rate_limiter.acquire(account)
+                    try:
+                        started = time.perf_counter()
+                        metrics.BYTES_SENT.inc(amount=conn.send(queue[0][1].to_buffers()))
+                    except (socket.error, socket.timeout) as err:
+                        # The server may already be closing; responses to what it did receive can still be read.
+                        logger.warning("Pipelined send to %s:%d failed: %s", host, port, err)
+                        sending = False
+                    else:
+                        in_flight.append((*queue.popleft(), started, time.perf_counter()))
+                if not in_flight:
+                    break
+
+                index, request, started, sent = in_flight[0]
+                # A response already buffered behind the previous one arrived no later than now.
+                reader.first_byte_at = time.perf_counter() if reader.has_buffered_data else None
+                try:
+                    raw_response = reader.read_message(request.method)
+                    # From this request's write to its full response, so time queued behind earlier ones counts.
+                    metrics.REQUEST_LATENCY.observe(time.perf_counter() - started)
+                    metrics.BYTES_RECEIVED.inc(amount=len(raw_response))
+                    response = HTTPResponse.from_bytes(raw_response)
+                finally:
+                    if traces is not None and reader.first_byte_at is not None:
+                        traces[index] = SendTrace(
+                            message_id=request.headers.get("Idempotency-Key"),
+                            attempts=1,
+                            write=sent - started,
+                            ttfb=max(reader.first_byte_at - sent, 0.0),
+                            total=time.perf_counter() - started,
+                        )
+                metrics.REQUESTS.inc(str(response.status_code))
+                in_flight.popleft()
+                results[index] = response
+                Request.apply_throttling(account, response)
+                if not (reader.reusable and Request.is_keep_alive(response)):
+                    break
+            else:
+                reusable = sending and not reader.has_buffered_data
+        except (socket.error, socket.timeout) as err:
+            logger.warning("Pipelined connection to %s:%d dropped: %s", host, port, err)
+        except SMSClientError as err:
+            # A malformed response leaves the stream position unknown, so nothing after it can be trusted.
+            results[in_flight.popleft()[0]] = err
+        finally:
+            self.pool.release(conn, reusable=reusable)
+
+        # Requests the server never answered are resent one by one under the same Idempotency-Key.
+        return [index for index, *_ in in_flight] + [index for index, _ in queue]
+
+    def _post_serial(self, body: Body, key: Optional[str] = None, first_attempt: int = 1) -> PipelineResult:
+        # The resend keeps the key the pipelined attempt went out with, whatever the kind of body.
+        headers = {**(self.headers or {}), "Idempotency-Key": key} if key else self.headers
+        try:
+            return Request.post(
+                self.url, auth=self.auth, headers=headers, body=body, pool=self.pool, first_attempt=first_attempt
+            )
+        except SMSClientError as err:
+            return err
@@ -0,0 +1,111 @@
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Optional
+
+from app.exceptions import ConfigError
+
+
+def parse_retry_after(value: Optional[str], now: Optional[datetime] = None) -> Optional[float]:
+    if value is None or not value.strip():
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    from email.utils import parsedate_to_datetime
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - (now or datetime.now(timezone.utc))).total_seconds(), 0.0)
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: Optional[float] = None, *, clock: Callable[[], float] = time.monotonic):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = burst if burst is not None else max(rate, 1.0)
+        if self.capacity < 1:
+            raise ValueError("burst must be at least 1")
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        if now > self._updated:
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        # Tokens may go negative: the debt is the caller's reservation and turns into a wait time.
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._tokens -= tokens
+            return max(self._updated - now, 0.0) + max(-self._tokens, 0.0) / self.rate
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        delay = self.reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._updated = max(self._updated, now + seconds)
+            self._tokens = min(self._tokens, 0.0)
+
+
+class RateLimiter:
+    def __init__(self, rate: float, burst: Optional[float] = None, *, clock: Callable[[], float] = time.monotonic):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst is not None and burst < 1:
+            raise ValueError("burst must be at least 1")
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._buckets: dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, options: Optional[dict[str, Any]]) -> Optional["RateLimiter"]:
+        if not options:
+            return None
+        try:
+            rate = float(options["rate"])
+            burst = float(options["burst"]) if "burst" in options else None
+            return cls(rate, burst)
+        except KeyError:
+            raise ConfigError("Missing required config key: 'rate_limit.rate'")
+        except (TypeError, ValueError) as err:
+            raise ConfigError(f"Invalid rate_limit settings: {err}")
+
+    def share(self, parts: int) -> "RateLimiter":
+        # Each of `parts` independent senders gets an equal slice, so together they keep to the configured rate.
+        burst = max(self.burst / parts, 1.0) if self.burst is not None else None
+        return RateLimiter(self.rate / parts, burst, clock=self._clock)
+
+    def bucket(self, account: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(account)
+            if bucket is None:
+                bucket = self._buckets[account] = TokenBucket(self.rate, self.burst, clock=self._clock)
+            return bucket
+
+    def reserve(self, account: str) -> float:
+        return self.bucket(account).reserve()
+
+    def acquire(self, account: str) -> float:
+        return self.bucket(account).acquire()
+
+    def pause(self, account: str, seconds: float) -> None:
+        self.bucket(account).pause(seconds)
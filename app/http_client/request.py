@@ -1,16 +1,32 @@
-import json
+import logging
 import re
 import socket
+import ssl
+import time
 from typing import Any, Optional, Union
 
-from app.exceptions import HTTPRequestError, NetworkError, SerializationError, ValidationError
+from app.exceptions import HTTPRequestError, NetworkError, SerializationError, SMSClientError, ValidationError
+from app.http_client.connection_pool import ConnectionPool
 from app.http_client.http_message import HTTPRequest, HTTPResponse
-from app.http_client.schemas import HTTPBody
+from app.http_client.journal import SendJournal
+from app.http_client.rate_limiter import RateLimiter, parse_retry_after
+from app.http_client.response_reader import ResponseReader
+from app.http_client.retry import RetryPolicy
+from app.http_client.schemas import HTTPBody, SMSMessageBase, new_idempotency_key
+from app.http_client.tls import TLSConfig, create_ssl_context
+from app.http_client.tracing import current_trace, trace_send
+from app.utils import json_codec, metrics
 from app.utils.logging import logger
 
 
 class Request:
     BUFF_SIZE = 4096
+    THROTTLE_STATUSES = {429, 503}
+    pool = ConnectionPool()
+    rate_limiter: Optional[RateLimiter] = None
+    retry_policy: Optional[RetryPolicy] = None
+    tls_config = TLSConfig()
+    journal: Optional[SendJournal] = None
 
     @staticmethod
     def parse_url(url: str) -> tuple[str, str, int, str]:
@@ -41,7 +57,7 @@ class Request:
         headers: dict[str, str] = {}
         if isinstance(body, dict):
             try:
-                body = json.dumps(body)
+                body = json_codec.dumps(body)
             except TypeError as err:
                 raise SerializationError(f"Error serializing body to JSON: {err}")
             headers.setdefault("Content-Type", "application/json")
@@ -52,10 +68,36 @@ class Request:
             headers.setdefault("Content-Type", "text/plain")
         else:
             raise ValidationError(f"Unsupported body type: {type(body)}")
-        headers.setdefault("Content-Length", str(len(body)))
+        headers.setdefault("Content-Length", str(len(body) if body.isascii() else len(body.encode())))
 
         return body, headers
 
+    @staticmethod
+    def build_request(
+        method: str,
+        url: str,
+        *,
+        auth: Optional[tuple[str, str]] = None,
+        headers: Optional[dict[str, str]] = None,
+        body: Optional[Union[HTTPBody, dict[str, Any], str]] = None,
+    ) -> tuple[HTTPRequest, int, Optional[ssl.SSLContext]]:
+        protocol, host, port, path = Request.parse_url(url)
+        ssl_context = create_ssl_context(Request.tls_config) if protocol.lower() == "https" else None
+        payload = None
+        if body:
+            payload, body_headers = Request.prepare_body(body)
+            headers = {**(headers or {}), **body_headers}
+
+        request = HTTPRequest(method, host, path, auth=auth, headers=headers, body=payload)
+        if payload:
+            # Retries and resends of this request reuse it, so any body that may go out twice carries a key.
+            key = body.idempotency_key() if isinstance(body, SMSMessageBase) else new_idempotency_key()
+            request.headers.setdefault("Idempotency-Key", key)
+        logger.info("Request: %s", request.start_line)
+        if payload and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Request Body: %s", request.body)
+        return request, port, ssl_context
+
     @staticmethod
     def method(
         method: str,
@@ -64,32 +106,156 @@ class Request:
         auth: Optional[tuple[str, str]] = None,
         headers: Optional[dict[str, str]] = None,
         body: Optional[Union[HTTPBody, dict[str, Any], str]] = None,
+        pool: Optional[ConnectionPool] = None,
+        first_attempt: int = 1,
     ) -> HTTPResponse:
+        journal = Request.journal
+        if journal is None:
+            return Request._method(
+                method, url, auth=auth, headers=headers, body=body, pool=pool, first_attempt=first_attempt
+            )
+
+        recipient = getattr(body, "recipient", None)
         try:
-            _, host, port, path = Request.parse_url(url)
-            if body:
-                body, body_headers = Request.prepare_body(body)
-                headers = {**(headers or {}), **body_headers}
-
-            request = HTTPRequest(method, host, path, auth=auth, headers=headers, body=body)  # type: ignore
-            logger.info(f"Request: {request.start_line}")
-            if body:
-                logger.debug(f"Request Body: {request.body}")
-
-            with socket.create_connection((host, port)) as sock:
-                sock.sendall(request.to_bytes())
-                response_data = sock.recv(Request.BUFF_SIZE)
-
-            response = HTTPResponse.from_bytes(response_data)
-            logger.info(f"Response: {response.start_line}")
-            logger.debug(f"Response Body: {response.body}")
-            return response
+            with trace_send() as trace:
+                response = Request._method(
+                    method, url, auth=auth, headers=headers, body=body, pool=pool, first_attempt=first_attempt
+                )
+        except SMSClientError as err:
+            journal.record(trace, recipient=recipient, error=str(err))
+            raise
+        journal.record(trace, recipient=recipient, status_code=response.status_code)
+        return response
+
+    @staticmethod
+    def _method(
+        method: str,
+        url: str,
+        *,
+        auth: Optional[tuple[str, str]] = None,
+        headers: Optional[dict[str, str]] = None,
+        body: Optional[Union[HTTPBody, dict[str, Any], str]] = None,
+        pool: Optional[ConnectionPool] = None,
+        first_attempt: int = 1,
+    ) -> HTTPResponse:
+        # first_attempt > 1 continues a send whose earlier attempts went out elsewhere, such as in a pipeline.
+        try:
+            request, port, ssl_context = Request.build_request(method, url, auth=auth, headers=headers, body=body)
+            account = Request.rate_limit_account(request.host, auth)
+            policy = Request.retry_policy
+            if policy and first_attempt == 1:
+                policy.start()
+            trace = current_trace()
+            if trace is not None:
+                trace.message_id = request.headers.get("Idempotency-Key")
+
+            attempt = first_attempt
+            while True:
+                if trace is not None:
+                    trace.attempts = attempt
+                try:
+                    response = Request._send(pool or Request.pool, port, request, account, ssl_context)
+                except NetworkError as err:
+                    metrics.REQUESTS.inc("error")
+                    delay = policy.retry_delay(attempt) if policy else None
+                    if delay is None:
+                        raise
+                    logger.warning("Attempt %d failed (%s), retrying in %.2fs", attempt, err, delay)
+                else:
+                    metrics.REQUESTS.inc(str(response.status_code))
+                    delay = policy.retry_delay(attempt, response) if policy else None
+                    if delay is None:
+                        logger.info("Response: %s", response.start_line)
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug("Response Body: %s", response.body)
+                        return response
+                    logger.warning("Attempt %d got %s, retrying in %.2fs", attempt, response.status_code, delay)
+                metrics.RETRIES.inc()
+                time.sleep(delay)
+                attempt += 1
 
+        except NetworkError:
+            raise
         except (socket.error, socket.timeout) as err:
             raise NetworkError(f"Network error: {err}")
         except Exception as err:
             raise HTTPRequestError(f"Request failed: {err}")
 
+    @staticmethod
+    def _send(
+        pool: ConnectionPool,
+        port: int,
+        request: HTTPRequest,
+        account: str,
+        ssl_context: Optional[ssl.SSLContext] = None,
+    ) -> HTTPResponse:
+        if Request.rate_limiter:
+            Request.rate_limiter.acquire(account)
+        try:
+            response = Request._exchange(pool, request.host, port, request, ssl_context)
+        except (socket.error, socket.timeout) as err:
+            raise NetworkError(f"Network error: {err}")
+        Request.apply_throttling(account, response)
+        return response
+
+    @staticmethod
+    def _exchange(
+        pool: ConnectionPool,
+        host: str,
+        port: int,
+        request: HTTPRequest,
+        ssl_context: Optional[ssl.SSLContext] = None,
+    ) -> HTTPResponse:
+        buffers = request.to_buffers()
+        trace = current_trace()
+        while True:
+            conn = pool.acquire(host, port, ssl_context)
+            reused = conn.is_reused
+            try:
+                started = time.perf_counter()
+                sent_bytes = conn.send(buffers)
+                sent = time.perf_counter()
+                reader = ResponseReader(conn.sock, Request.BUFF_SIZE)
+                raw_response = reader.read_message(request.method)
+                metrics.REQUEST_LATENCY.observe(time.perf_counter() - started)
+                metrics.BYTES_SENT.inc(amount=sent_bytes)
+                metrics.BYTES_RECEIVED.inc(amount=len(raw_response))
+                response = HTTPResponse.from_bytes(raw_response)
+                if trace is not None:
+                    trace.write += sent - started
+                    trace.ttfb += (reader.first_byte_at or sent) - sent
+            except ConnectionError:
+                pool.release(conn, reusable=False)
+                # The server may drop an idle keep-alive socket at any moment: retry on a fresh one.
+                if reused:
+                    continue
+                raise
+            except BaseException:
+                pool.release(conn, reusable=False)
+                raise
+
+            reusable = reader.reusable and not reader.has_buffered_data and Request.is_keep_alive(response)
+            pool.release(conn, reusable=reusable)
+            return response
+
+    @staticmethod
+    def is_keep_alive(response: HTTPResponse) -> bool:
+        return "close" not in (response.get_header("Connection") or "").lower()
+
+    @staticmethod
+    def rate_limit_account(host: str, auth: Optional[tuple[str, str]]) -> str:
+        return auth[0] if auth else host
+
+    @staticmethod
+    def apply_throttling(account: str, response: HTTPResponse) -> Optional[float]:
+        if Request.rate_limiter is None or response.status_code not in Request.THROTTLE_STATUSES:
+            return None
+        retry_after = parse_retry_after(response.get_header("Retry-After"))
+        if retry_after is not None:
+            logger.warning("Throttled by server for account '%s', pausing for %ss", account, retry_after)
+            Request.rate_limiter.pause(account, retry_after)
+        return retry_after
+
     @staticmethod
     def post(
         url: str,
@@ -97,5 +263,9 @@ class Request:
         auth: Optional[tuple[str, str]] = None,
         headers: Optional[dict[str, str]] = None,
         body: Optional[Union[HTTPBody, dict[str, Any], str]] = None,
+        pool: Optional[ConnectionPool] = None,
+        first_attempt: int = 1,
     ) -> HTTPResponse:
-        return Request.method("POST", url, auth=auth, headers=headers, body=body)
+        return Request.method(
+            "POST", url, auth=auth, headers=headers, body=body, pool=pool, first_attempt=first_attempt
+        )
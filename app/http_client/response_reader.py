@@ -0,0 +1,180 @@
+import socket
+import time
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from app.exceptions import HTTPResponseError
+
+HEADER_TERMINATOR = b"\r\n\r\n"
+MAX_HEAD_SIZE = 64 * 1024
+MAX_CHUNK_LINE_SIZE = 1024
+
+
+@dataclass(frozen=True)
+class BodyFraming:
+    NONE = "none"
+    LENGTH = "length"
+    CHUNKED = "chunked"
+    UNTIL_CLOSE = "until-close"
+
+    kind: str
+    length: int = 0
+    status_code: int = 0
+
+
+def parse_framing(head: bytes, request_method: str = "GET") -> BodyFraming:
+    lines = head.rstrip(b"\r\n").split(b"\r\n")
+    parts = lines[0].split(b" ", 2)
+    try:
+        status_code = int(parts[1])
+    except (IndexError, ValueError):
+        raise HTTPResponseError(f"Invalid status line: {lines[0]!r}")
+
+    if request_method == "HEAD" or 100 <= status_code < 200 or status_code in (204, 304):
+        return BodyFraming(BodyFraming.NONE, status_code=status_code)
+
+    content_length = None
+    for line in lines[1:]:
+        name, _, value = line.partition(b":")
+        name = name.strip().lower()
+        if name == b"transfer-encoding" and b"chunked" in value.lower():
+            return BodyFraming(BodyFraming.CHUNKED, status_code=status_code)
+        if name == b"content-length":
+            try:
+                content_length = int(value.strip())
+            except ValueError:
+                raise HTTPResponseError(f"Invalid Content-Length value: {value.strip()!r}")
+
+    if content_length is not None:
+        return BodyFraming(BodyFraming.LENGTH, content_length, status_code)
+    return BodyFraming(BodyFraming.UNTIL_CLOSE, status_code=status_code)
+
+
+def parse_chunk_size(line: bytes) -> int:
+    size = line.split(b";", 1)[0].strip()
+    try:
+        return int(size, 16)
+    except ValueError:
+        raise HTTPResponseError(f"Invalid chunk size: {size!r}")
+
+
+def normalize_head(head: bytes, body_length: int) -> bytes:
+    lines = [
+        line
+        for line in head.rstrip(b"\r\n").split(b"\r\n")
+        if line.partition(b":")[0].strip().lower() not in (b"transfer-encoding", b"content-length")
+    ]
+    lines.append(b"Content-Length: %d" % body_length)
+    return b"\r\n".join(lines) + HEADER_TERMINATOR
+
+
+class ResponseReader:
+    def __init__(self, sock: socket.socket, buff_size: int = 4096):
+        self.sock = sock
+        self._buffer = bytearray()
+        self._chunk = memoryview(bytearray(buff_size))
+        self._eof = False
+        self._framing = BodyFraming(BodyFraming.NONE)
+        self.first_byte_at: Optional[float] = None
+
+    @property
+    def reusable(self) -> bool:
+        return not self._eof and self._framing.kind != BodyFraming.UNTIL_CLOSE
+
+    @property
+    def has_buffered_data(self) -> bool:
+        return bool(self._buffer)
+
+    def _fill(self) -> int:
+        received = self.sock.recv_into(self._chunk)
+        if received:
+            if self.first_byte_at is None:
+                self.first_byte_at = time.perf_counter()
+            self._buffer += self._chunk[:received]
+        else:
+            self._eof = True
+        return received
+
+    def _take(self, size: int) -> bytes:
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    def _read_until(self, delimiter: bytes, limit: int) -> bytes:
+        start = 0
+        while True:
+            idx = self._buffer.find(delimiter, start)
+            if idx != -1:
+                return self._take(idx + len(delimiter))
+            if len(self._buffer) > limit:
+                raise HTTPResponseError(f"Line exceeds {limit} bytes without {delimiter!r}")
+            start = max(len(self._buffer) - len(delimiter) + 1, 0)
+            if not self._fill():
+                raise HTTPResponseError("Connection closed before the end of the response")
+
+    def read_head(self, request_method: str = "GET") -> bytes:
+        while True:
+            if not self._buffer and not self._fill():
+                raise ConnectionResetError("Connection closed before any response was received")
+            head = self._read_until(HEADER_TERMINATOR, MAX_HEAD_SIZE)
+            self._framing = parse_framing(head, request_method)
+            # Interim 1xx responses (e.g. 100 Continue) precede the final one.
+            if not 100 <= self._framing.status_code < 200:
+                return head
+
+    def iter_body(self) -> Iterator[bytes]:
+        framing = self._framing
+        if framing.kind == BodyFraming.LENGTH:
+            yield from self._iter_exact(framing.length)
+        elif framing.kind == BodyFraming.CHUNKED:
+            yield from self._iter_chunked()
+        elif framing.kind == BodyFraming.UNTIL_CLOSE:
+            while self._buffer or self._fill():
+                yield self._take(len(self._buffer))
+
+    def _iter_exact(self, size: int) -> Iterator[bytes]:
+        while size > 0:
+            if not self._buffer and not self._fill():
+                raise HTTPResponseError(f"Connection closed with {size} body bytes outstanding")
+            data = self._take(min(size, len(self._buffer)))
+            size -= len(data)
+            yield data
+
+    def _iter_chunked(self) -> Iterator[bytes]:
+        while True:
+            size = parse_chunk_size(self._read_until(b"\r\n", MAX_CHUNK_LINE_SIZE))
+            if size == 0:
+                break
+            yield from self._iter_exact(size)
+            if self._read_until(b"\r\n", MAX_CHUNK_LINE_SIZE) != b"\r\n":
+                raise HTTPResponseError("Chunk data is not followed by CRLF")
+        while self._read_until(b"\r\n", MAX_HEAD_SIZE) != b"\r\n":
+            pass
+
+    def read_body(self) -> bytes:
+        if self._framing.kind != BodyFraming.LENGTH:
+            body = bytearray()
+            for chunk in self.iter_body():
+                body += chunk
+            return bytes(body)
+
+        size = self._framing.length
+        body = bytearray(size)
+        view = memoryview(body)
+        filled = min(size, len(self._buffer))
+        view[:filled] = self._buffer[:filled]
+        del self._buffer[:filled]
+        while filled < size:
+            received = self.sock.recv_into(view[filled:])
+            if not received:
+                self._eof = True
+                raise HTTPResponseError(f"Connection closed with {size - filled} body bytes outstanding")
+            filled += received
+        return bytes(body)
+
+    def read_message(self, request_method: str = "GET") -> bytes:
+        head = self.read_head(request_method)
+        body = self.read_body()
+        if self._framing.kind in (BodyFraming.LENGTH, BodyFraming.NONE):
+            return head + body
+        return normalize_head(head, len(body)) + body
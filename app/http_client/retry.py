@@ -0,0 +1,89 @@
+import random
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from app.exceptions import ConfigError
+from app.http_client.http_message import HTTPResponse
+from app.http_client.rate_limiter import parse_retry_after
+
+
+class RetryBudget:
+    def __init__(self, ratio: float = 0.2, min_retries: int = 10, max_balance: Optional[float] = None):
+        if ratio < 0:
+            raise ValueError("ratio must not be negative")
+        self.ratio = ratio
+        self.max_balance = max_balance if max_balance is not None else max(float(min_retries), 100.0)
+        self._balance = float(min_retries)
+        self._lock = threading.Lock()
+
+    @property
+    def balance(self) -> float:
+        return self._balance
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._balance = min(self._balance + self.ratio, self.max_balance)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self._balance < 1:
+                return False
+            self._balance -= 1
+            return True
+
+
+@dataclass
+class RetryPolicy:
+    max_attempts: int = 3
+    backoff_base: float = 0.5
+    backoff_max: float = 30.0
+    retry_statuses: frozenset[int] = frozenset({429, 500, 502, 503, 504})
+    budget: RetryBudget = field(default_factory=RetryBudget)
+    rng: Callable[[], float] = random.random
+
+    def __post_init__(self) -> None:
+        if self.max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        if self.backoff_base < 0 or self.backoff_max < 0:
+            raise ValueError("backoff must not be negative")
+
+    @classmethod
+    def from_config(cls, options: Optional[dict[str, Any]]) -> Optional["RetryPolicy"]:
+        if not options:
+            return None
+        try:
+            policy = cls(
+                max_attempts=int(options.get("max_attempts", cls.max_attempts)),
+                backoff_base=float(options.get("backoff_base", cls.backoff_base)),
+                backoff_max=float(options.get("backoff_max", cls.backoff_max)),
+                budget=RetryBudget(float(options.get("budget_ratio", 0.2)), int(options.get("budget_min_retries", 10))),
+            )
+            if "retry_statuses" in options:
+                policy.retry_statuses = frozenset(int(status) for status in options["retry_statuses"])
+            return policy
+        except (TypeError, ValueError) as err:
+            raise ConfigError(f"Invalid retry settings: {err}")
+
+    def backoff(self, attempt: int) -> float:
+        # "Full jitter": a uniform delay up to the exponential cap spreads retries of many clients apart.
+        return self.rng() * min(self.backoff_max, self.backoff_base * 2.0 ** (attempt - 1))
+
+    def start(self) -> None:
+        self.budget.deposit()
+
+    def retry_delay(self, attempt: int, response: Optional[HTTPResponse] = None) -> Optional[float]:
+        if attempt >= self.max_attempts:
+            return None
+        delay = self.backoff(attempt)
+        if response is not None:
+            if response.status_code not in self.retry_statuses:
+                return None
+            retry_after = parse_retry_after(response.get_header("Retry-After"))
+            if retry_after is not None:
+                if retry_after > self.backoff_max:
+                    return None
+                delay = max(delay, retry_after)
+        if not self.budget.withdraw():
+            return None
+        return delay
@@ -1,40 +1,135 @@
-import json
 import re
-from dataclasses import dataclass
-from typing import Any, get_type_hints
+import uuid
+from dataclasses import dataclass, field, fields, is_dataclass
+from json.encoder import encode_basestring
+from operator import itemgetter
+from typing import Any, Optional, Sequence, get_type_hints
 
 from app.exceptions import MessageError, PhoneNumberError, SerializationError, ValidationError
+from app.http_client import segments
+from app.utils import json_codec
+
+
+def new_idempotency_key() -> str:
+    # Random rather than derived from the body: two identical messages are still two sends.
+    return uuid.uuid4().hex
+
+
+_FIELD_TYPES: dict[type, dict[str, Any]] = {}
+_FIELD_NAMES: dict[type, tuple[str, ...]] = {}
+
+
+def field_types(cls: type) -> dict[str, Any]:
+    # Resolving annotations is far slower than the isinstance checks it feeds, so it is done once per class.
+    types = _FIELD_TYPES.get(cls)
+    if types is None:
+        types = _FIELD_TYPES[cls] = get_type_hints(cls)
+    return types
+
+
+def field_names(cls: type) -> tuple[str, ...]:
+    names = _FIELD_NAMES.get(cls)
+    if names is None:
+        names = _FIELD_NAMES[cls] = tuple(item.name for item in fields(cls))
+    return names
+
+
+def type_error(field: str, expected_type: Any, value: Any) -> str:
+    return f"Field '{field}' must be of type {expected_type}, but got {type(value)}"
 
 
 @dataclass
+class ValidationReport:
+    total: int
+    errors: list[tuple[int, str]] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    @property
+    def valid(self) -> int:
+        return self.total - len(self.errors)
+
+    @property
+    def invalid_rows(self) -> set[int]:
+        return {index for index, _ in self.errors}
+
+
 class HTTPBody:
+    # Empty slots keep the base from adding a __dict__ to slotted subclasses.
+    __slots__ = ()
+
+    def __new__(cls, *args: Any, **kwargs: Any) -> "HTTPBody":
+        # A bare HTTPBody is filled in attribute by attribute, so it is made with a __dict__ after all.
+        return super().__new__(_AdHocBody if cls is HTTPBody else cls)
+
     def __post_init__(self) -> None:
         self.validate()
 
     def to_dict(self) -> dict[str, Any]:
-        return self.__dict__
+        if hasattr(self, "__dict__"):
+            return dict(self.__dict__)
+        if not is_dataclass(self):
+            return {}
+        return {name: getattr(self, name) for name in field_names(self.__class__)}
 
     def to_json(self) -> str:
         try:
-            return json.dumps(self.to_dict(), ensure_ascii=False)
+            return json_codec.dumps(self.to_dict())
         except TypeError as err:
             raise SerializationError(f"Error serializing body to JSON: {err}")
 
     def validate(self) -> None:
-        annotations = get_type_hints(self.__class__)
-        for field, expected_type in annotations.items():
-            value = getattr(self, field)
+        for name, expected_type in field_types(self.__class__).items():
+            value = getattr(self, name)
             if not isinstance(value, expected_type):
-                raise ValidationError(f"Field '{field}' must be of type {expected_type}, but got {type(value)}")
+                raise ValidationError(type_error(name, expected_type, value))
 
 
-@dataclass
-class SMSMessage(HTTPBody):
+class _AdHocBody(HTTPBody):
+    pass
+
+
+class SMSMessageBase(HTTPBody):
+    __slots__ = ("_idempotency_key",)
+
     sender: str
     recipient: str
     message: str
 
     PHONE_PATTERN = r"^\+?\d{10,15}$"
+    PHONE_RE = re.compile(PHONE_PATTERN)
+    JSON_TEMPLATE = '{"sender": %s, "recipient": %s, "message": %s}'
+
+    def __post_init__(self) -> None:
+        super().__post_init__()
+        policy = segments.get_policy()
+        if policy is not None:
+            # Set through object so the frozen variant can be adjusted while it is being built.
+            object.__setattr__(self, "message", policy.apply(self.message))
+
+    def idempotency_key(self) -> str:
+        # Made on first use and kept, so every retry and resend of this message carries the same key.
+        key: Optional[str] = getattr(self, "_idempotency_key", None)
+        if key is None:
+            key = new_idempotency_key()
+            self.set_idempotency_key(key)
+        return key
+
+    def set_idempotency_key(self, key: str) -> None:
+        object.__setattr__(self, "_idempotency_key", key)
+
+    def segment_info(self) -> segments.SegmentInfo:
+        return segments.count_segments(self.message)
+
+    def to_json(self) -> str:
+        # The shape is fixed, so the three strings are escaped straight into a template instead of walking a dict.
+        return self.JSON_TEMPLATE % (
+            encode_basestring(self.sender),
+            encode_basestring(self.recipient),
+            encode_basestring(self.message),
+        )
 
     def validate(self) -> None:
         super().validate()
@@ -47,4 +142,61 @@ class SMSMessage(HTTPBody):
 
     @classmethod
     def _is_valid_phone(cls, phone: str) -> bool:
-        return bool(re.match(cls.PHONE_PATTERN, phone))
+        return cls.PHONE_RE.match(phone) is not None
+
+    @classmethod
+    def validate_batch(
+        cls, senders: Sequence[Any], recipients: Sequence[Any], messages: Sequence[Any]
+    ) -> ValidationReport:
+        if not len(senders) == len(recipients) == len(messages):
+            raise ValueError("senders, recipients and messages must have the same length")
+
+        report = ValidationReport(len(senders))
+        errors = report.errors
+        types = field_types(cls)
+        match = cls.PHONE_RE.match
+        policy = segments.get_policy()
+        # Rows that pass the field checks, measured afterwards against the segment budget as a column.
+        passed: list[int] = []
+        for index, row in enumerate(zip(senders, recipients, messages)):
+            sender, recipient, message = row
+            if not (type(sender) is str and type(recipient) is str and type(message) is str):
+                error = next(
+                    (
+                        type_error(name, types[name], value)
+                        for name, value in zip(("sender", "recipient", "message"), row)
+                        if not isinstance(value, types[name])
+                    ),
+                    None,
+                )
+                if error is not None:
+                    errors.append((index, error))
+                    continue
+            if match(sender) is None:
+                errors.append((index, f"Invalid sender phone number: {sender}"))
+            elif match(recipient) is None:
+                errors.append((index, f"Invalid recipient phone number: {recipient}"))
+            elif not message.strip():
+                errors.append((index, "Message cannot be empty"))
+            elif policy is not None:
+                passed.append(index)
+
+        if policy is not None and passed:
+            over_budget = policy.budget_errors([messages[index] for index in passed])
+            errors.extend((passed[position], error) for position, error in over_budget)
+            errors.sort(key=itemgetter(0))
+        return report
+
+
+@dataclass(slots=True)
+class SMSMessage(SMSMessageBase):
+    sender: str
+    recipient: str
+    message: str
+
+
+@dataclass(slots=True, frozen=True)
+class FrozenSMSMessage(SMSMessageBase):
+    sender: str
+    recipient: str
+    message: str
@@ -0,0 +1,196 @@
+import re
+import unicodedata
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from app.exceptions import ConfigError, MessageError
+
+GSM7 = "GSM-7"
+UCS2 = "UCS-2"
+
+# GSM 03.38: the basic table costs one septet per character, the extension table two (escape + character).
+GSM_BASIC = frozenset(
+    "@£$¥èéùìòÇ\nØø\rÅåΔ_ΦΓΛΩΠΨΣΘΞÆæßÉ !\"#¤%&'()*+,-./0123456789:;<=>?"
+    "¡ABCDEFGHIJKLMNOPQRSTUVWXYZÄÖÑÜ§¿abcdefghijklmnopqrstuvwxyzäöñüà"
+)
+GSM_EXTENDED = frozenset("\f^{}\\[~]|€")
+GSM_CHARS = GSM_BASIC | GSM_EXTENDED
+GSM_EXTENDED_RE = re.compile("[%s]" % re.escape("".join(sorted(GSM_EXTENDED))))
+
+# (single-part, per-part of a multipart message): multipart messages give up room to the concatenation header.
+LIMITS = {GSM7: (160, 153), UCS2: (70, 67)}
+
+_CYRILLIC = {
+    "а": "a", "б": "b", "в": "v", "г": "g", "д": "d", "е": "e", "ё": "yo", "ж": "zh", "з": "z", "и": "i",
+    "й": "y", "к": "k", "л": "l", "м": "m", "н": "n", "о": "o", "п": "p", "р": "r", "с": "s", "т": "t",
+    "у": "u", "ф": "f", "х": "kh", "ц": "ts", "ч": "ch", "ш": "sh", "щ": "shch", "ъ": "", "ы": "y", "ь": "",
+    "э": "e", "ю": "yu", "я": "ya",
+}  # fmt: skip
+_PUNCTUATION = {
+    "‘": "'", "’": "'", "‚": "'", "‛": "'", "′": "'", "‹": "'", "›": "'",
+    "“": '"', "”": '"', "„": '"', "‟": '"', "″": '"', "«": '"', "»": '"',
+    "‐": "-", "‑": "-", "‒": "-", "–": "-", "—": "-", "―": "-", "−": "-",
+    "…": "...", "•": "*", "№": "No", "\u00a0": " ", "\u2009": " ", "\u202f": " ", "\t": " ",
+}  # fmt: skip
+TRANSLITERATION = str.maketrans(
+    {
+        **_CYRILLIC,
+        **{letter.upper(): latin.capitalize() for letter, latin in _CYRILLIC.items()},
+        **_PUNCTUATION,
+    }
+)
+
+
+@dataclass(slots=True, frozen=True)
+class SegmentInfo:
+    encoding: str
+    # Septets for GSM-7, UTF-16 code units for UCS-2.
+    units: int
+    segments: int
+
+
+def _split(units: int, per_part: int, cuts_pair: Callable[[int], bool]) -> int:
+    # Steps from boundary to boundary; a cut that would separate an escape or surrogate pair moves back one unit.
+    segments, position = 0, 0
+    while position < units:
+        end = position + per_part
+        if end < units and cuts_pair(end):
+            end -= 1
+        segments, position = segments + 1, end
+    return segments
+
+
+# One campaign text often goes to many recipients, so measurements are cached by text.
+@lru_cache(maxsize=4096)
+def count_segments(text: str) -> SegmentInfo:
+    return measure(text)
+
+
+def measure(text: str) -> SegmentInfo:
+    chars = set(text)
+    if chars <= GSM_CHARS:
+        encoding, extended = GSM7, chars & GSM_EXTENDED
+        units = len(text) + sum(text.count(char) for char in extended)
+        single, per_part = LIMITS[GSM7]
+        if units > single and extended:
+            # The k-th extension character's escape septet sits k septets after its character index.
+            escapes = {match.start() + index for index, match in enumerate(GSM_EXTENDED_RE.finditer(text))}
+            return SegmentInfo(GSM7, units, _split(units, per_part, lambda end: end - 1 in escapes))
+    else:
+        encoding = UCS2
+        data = text.encode("utf-16-le")
+        units = len(data) // 2
+        single, per_part = LIMITS[UCS2]
+        if units > single and units != len(text):
+            # A high surrogate (D800-DBFF) as the last unit of a part would be cut from its low half.
+            return SegmentInfo(UCS2, units, _split(units, per_part, lambda end: 0xD8 <= data[2 * end - 1] <= 0xDB))
+    if units <= single:
+        return SegmentInfo(encoding, units, 1 if units else 0)
+    return SegmentInfo(encoding, units, -(-units // per_part))
+
+
+def segment_counts(texts: Iterable[str]) -> list[int]:
+    # For a whole column at once: each distinct text is measured once, without touching the shared cache.
+    seen: dict[str, int] = {}
+    counts = []
+    for text in texts:
+        count = seen.get(text)
+        if count is None:
+            count = seen[text] = measure(text).segments
+        counts.append(count)
+    return counts
+
+
+def _fold(char: str) -> str:
+    stripped = "".join(part for part in unicodedata.normalize("NFKD", char) if not unicodedata.combining(part))
+    return stripped if stripped and set(stripped) <= GSM_CHARS else char
+
+
+def transliterate(text: str) -> str:
+    if set(text) <= GSM_CHARS:
+        return text
+    text = text.translate(TRANSLITERATION)
+    leftovers = set(text) - GSM_CHARS
+    if leftovers:
+        # Accented letters outside the GSM table lose their accents: "ç" becomes "c", "ł" stays as it is.
+        text = text.translate({ord(char): _fold(char) for char in leftovers})
+    return text
+
+
+def fit(text: str, max_segments: int) -> str:
+    if max_segments < 1:
+        raise ValueError("max_segments must be at least 1")
+    if count_segments(text).segments <= max_segments:
+        return text
+    # The count only grows with length, so the longest prefix that fits is found by bisection.
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if measure(text[:middle]).segments <= max_segments:
+            low = middle
+        else:
+            high = middle - 1
+    return text[:low]
+
+
+@dataclass
+class SegmentPolicy:
+    max_segments: Optional[int] = None
+    transliterate: bool = False
+    trim: bool = False
+
+    @classmethod
+    def from_config(cls, options: Optional[dict[str, Any]]) -> Optional["SegmentPolicy"]:
+        if not options:
+            return None
+        try:
+            max_segments = options.get("max_segments")
+            policy = cls(
+                max_segments=int(max_segments) if max_segments is not None else None,
+                transliterate=bool(options.get("transliterate", False)),
+                trim=bool(options.get("trim", False)),
+            )
+        except (TypeError, ValueError) as err:
+            raise ConfigError(f"Invalid segments settings: {err}")
+        if policy.max_segments is not None and policy.max_segments < 1:
+            raise ConfigError("Invalid segments settings: max_segments must be at least 1")
+        if policy.trim and policy.max_segments is None:
+            raise ConfigError("Invalid segments settings: trim requires max_segments")
+        return policy
+
+    def apply(self, text: str) -> str:
+        if self.transliterate:
+            text = transliterate(text)
+        if self.max_segments is not None:
+            segments = count_segments(text).segments
+            if segments > self.max_segments:
+                if not self.trim:
+                    raise MessageError(self.budget_error(segments))
+                text = fit(text, self.max_segments)
+        return text
+
+    def budget_errors(self, texts: Iterable[str]) -> Iterator[tuple[int, str]]:
+        # The positions of texts that apply() would reject, measuring each distinct text once.
+        if self.max_segments is None or self.trim:
+            return
+        if self.transliterate:
+            texts = map(transliterate, texts)
+        for index, segments in enumerate(segment_counts(texts)):
+            if segments > self.max_segments:
+                yield index, self.budget_error(segments)
+
+    def budget_error(self, segments: int) -> str:
+        return f"Message needs {segments} segments, more than the limit of {self.max_segments}"
+
+
+_policy: Optional[SegmentPolicy] = None
+
+
+def get_policy() -> Optional[SegmentPolicy]:
+    return _policy
+
+
+def set_policy(policy: Optional[SegmentPolicy]) -> None:
+    global _policy
+    _policy = policy
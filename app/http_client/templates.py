@@ -0,0 +1,115 @@
+from json.encoder import encode_basestring
+from operator import itemgetter
+from string import Formatter
+from typing import Any, Callable, Collection, Iterable, Iterator, Mapping, Optional
+
+from app.exceptions import MessageError, PhoneNumberError, TemplateError, ValidationError
+from app.http_client import segments
+from app.http_client.schemas import SMSMessage, type_error
+
+
+class RenderedSMSMessage(SMSMessage):
+    # Built only by MessageTemplate, which has already validated the fields and encoded the body.
+    __slots__ = ("_json",)
+
+    def __init__(self, sender: str, recipient: str, message: str, body: str):
+        self.sender = sender
+        self.recipient = recipient
+        self.message = message
+        self._json = body
+
+    def to_json(self) -> str:
+        return self._json
+
+
+class MessageTemplate:
+    def __init__(self, text: str, *, sender: Optional[str] = None):
+        self.text = text
+        self.sender = sender
+        fields: list[str] = []
+        parts: list[str] = []
+        try:
+            parsed = list(Formatter().parse(text))
+        except ValueError as err:
+            raise TemplateError(f"Invalid template: {err}")
+        for literal, name, format_spec, conversion in parsed:
+            parts.append(literal.replace("%", "%%"))
+            if name is None:
+                continue
+            if not name.isidentifier():
+                raise TemplateError(f"Invalid placeholder '{{{name}}}': use a variable name such as {{name}}")
+            if format_spec or conversion:
+                raise TemplateError(f"Placeholder '{{{name}}}' cannot have a format spec or conversion")
+            fields.append(name)
+            parts.append("%s")
+        if not fields and not text.strip():
+            raise TemplateError("Template cannot be empty")
+        if sender is not None:
+            self.check_sender(sender)
+        self.fields = tuple(fields)
+        self.placeholders = tuple(dict.fromkeys(fields))
+        # Compiled once: a %-format string for the text and a getter that pulls every variable in one call.
+        self._format = "".join(parts)
+        self._getter: Callable[[Mapping[str, Any]], Any] = itemgetter(*fields) if fields else lambda row: ()
+        self._single = len(fields) == 1
+        self._prefix = self.json_prefix(sender) if sender is not None else None
+
+    @staticmethod
+    def json_prefix(sender: str) -> str:
+        return '{"sender": %s, "recipient": ' % encode_basestring(sender)
+
+    @staticmethod
+    def check_sender(sender: Any) -> None:
+        if type(sender) is not str:
+            raise ValidationError(type_error("sender", str, sender))
+        if SMSMessage.PHONE_RE.match(sender) is None:
+            raise PhoneNumberError(f"Invalid sender phone number: {sender}")
+
+    def check(self, names: Collection[str]) -> None:
+        missing = [name for name in self.placeholders if name not in names]
+        if missing:
+            raise TemplateError(f"Template variable(s) not provided: {', '.join(missing)}")
+
+    def values(self, variables: Mapping[str, Any]) -> tuple[Any, ...]:
+        try:
+            values: tuple[Any, ...] = self._getter(variables)
+        except KeyError:
+            values = (None,)
+        else:
+            if self._single:
+                values = (values,)
+        if None in values:
+            self.check([name for name, value in variables.items() if value is not None])
+        return values
+
+    def render_text(self, variables: Mapping[str, Any]) -> str:
+        return self._format % self.values(variables)
+
+    def render(
+        self, recipient: str, variables: Mapping[str, Any], *, sender: Optional[str] = None
+    ) -> RenderedSMSMessage:
+        if sender is None or sender == self.sender:
+            sender, prefix = self.sender, self._prefix
+            if sender is None or prefix is None:
+                raise TemplateError("Template has no sender and none was given")
+        else:
+            self.check_sender(sender)
+            prefix = self.json_prefix(sender)
+        if type(recipient) is not str:
+            raise ValidationError(type_error("recipient", str, recipient))
+        if SMSMessage.PHONE_RE.match(recipient) is None:
+            raise PhoneNumberError(f"Invalid recipient phone number: {recipient}")
+        message = self._format % self.values(variables)
+        if not message.strip():
+            raise MessageError("Message cannot be empty")
+        policy = segments.get_policy()
+        if policy is not None:
+            message = policy.apply(message)
+        # The sender part of the body is cached; only the recipient and the rendered text are escaped here.
+        body = prefix + encode_basestring(recipient) + ', "message": ' + encode_basestring(message) + "}"
+        return RenderedSMSMessage(sender, recipient, message, body)
+
+    def render_rows(self, rows: Iterable[Mapping[str, Any]]) -> Iterator[RenderedSMSMessage]:
+        # Lazy, so a large campaign streams through without holding every rendered message.
+        for row in rows:
+            yield self.render(row["recipient"], row, sender=row.get("sender"))
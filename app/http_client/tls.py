@@ -0,0 +1,41 @@
+import ssl
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Optional
+
+from app.exceptions import ConfigError
+
+
+@dataclass(frozen=True)
+class TLSConfig:
+    cafile: Optional[str] = None
+    capath: Optional[str] = None
+    certfile: Optional[str] = None
+    keyfile: Optional[str] = None
+    verify: bool = True
+
+    @classmethod
+    def from_config(cls, options: Optional[dict[str, Any]]) -> "TLSConfig":
+        if not options:
+            return cls()
+        unknown = set(options) - {"cafile", "capath", "certfile", "keyfile", "verify"}
+        if unknown:
+            raise ConfigError(f"Unknown tls settings: {', '.join(sorted(unknown))}")
+        if options.get("keyfile") and not options.get("certfile"):
+            raise ConfigError("tls.keyfile requires tls.certfile")
+        return cls(**options)
+
+
+@lru_cache(maxsize=None)
+def create_ssl_context(config: TLSConfig = TLSConfig()) -> ssl.SSLContext:
+    # Building a context loads the CA store from disk, so one context per configuration is shared by all sockets.
+    try:
+        context = ssl.create_default_context(cafile=config.cafile, capath=config.capath)
+        if config.certfile:
+            context.load_cert_chain(config.certfile, config.keyfile)
+    except (OSError, ssl.SSLError) as err:
+        raise ConfigError(f"Failed to load TLS certificates: {err}")
+    if not config.verify:
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    return context
@@ -0,0 +1,42 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+
+@dataclass(slots=True)
+class SendTrace:
+    # Durations are in seconds and add up over every attempt of one send.
+    message_id: Optional[str] = None
+    attempts: int = 0
+    dns: float = 0.0
+    connect: float = 0.0
+    tls: float = 0.0
+    write: float = 0.0
+    ttfb: float = 0.0
+    total: float = 0.0
+
+    @property
+    def retries(self) -> int:
+        return max(self.attempts - 1, 0)
+
+
+# A context variable is private to each thread and to each asyncio task, so concurrent sends never share a trace.
+_current: ContextVar[Optional[SendTrace]] = ContextVar("send_trace", default=None)
+
+
+def current_trace() -> Optional[SendTrace]:
+    return _current.get()
+
+
+@contextmanager
+def trace_send() -> Iterator[SendTrace]:
+    trace = SendTrace()
+    token = _current.set(trace)
+    started = time.perf_counter()
+    try:
+        yield trace
+    finally:
+        trace.total = time.perf_counter() - started
+        _current.reset(token)
@@ -1,19 +1,142 @@
-from app.config import Config
-from app.http_client.request import Request
-from app.http_client.schemas import SMSMessage
+from typing import Optional
+
 from app.utils.cli_parser import parse_arguments
-from app.utils.console import print_json_response
 
 
-def main() -> None:
+def configure() -> tuple[str, tuple[str, str]]:
+    import atexit
+
+    from app.config import Config
+    from app.http_client.journal import SendJournal
+    from app.http_client.rate_limiter import RateLimiter
+    from app.http_client.request import Request
+    from app.http_client.retry import RetryPolicy
+    from app.http_client.segments import SegmentPolicy, set_policy
+    from app.http_client.tls import TLSConfig
+    from app.utils import json_codec
+    from app.utils.logging import LogConfig, setup_logger
+
     config = Config("config.toml")
+    setup_logger(LogConfig.from_config(config.get("logging", None)))
     api_url = config.get("api_url")
     username, password = config.get("username"), config.get("password")
+    Request.rate_limiter = RateLimiter.from_config(config.get("rate_limit", None))
+    Request.retry_policy = RetryPolicy.from_config(config.get("retry", None))
+    Request.tls_config = TLSConfig.from_config(config.get("tls", None))
+    json_codec.set_codec(json_codec.JSONCodec.from_config(config.get("json", None)))
+    set_policy(SegmentPolicy.from_config(config.get("segments", None)))
+    Request.journal = SendJournal.from_config(config.get("journal", None))
+    if Request.journal is not None:
+        atexit.register(Request.journal.close)
+    return api_url, (username, password)
+
+
+def serve(socket_path: str, metrics_port: Optional[int] = None) -> None:
+    import signal
+
+    from app.daemon.metrics_endpoint import MetricsEndpoint
+    from app.daemon.server import SubmissionServer
+    from app.utils.logging import logger
+    from app.utils.metrics import registry
+
+    api_url, auth = configure()
+    # SIGTERM unwinds like Ctrl-C, so the socket file is removed on a normal service stop.
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    endpoint = MetricsEndpoint(metrics_port, registry) if metrics_port is not None else None
+    if endpoint is not None:
+        endpoint.start()
+        logger.info("Serving metrics on http://127.0.0.1:%d/metrics", endpoint.server_address[1])
+    with SubmissionServer(socket_path, api_url, auth=auth) as server:
+        logger.info("Serving SMS submissions on %s", socket_path)
+        print(f"Serving SMS submissions on {socket_path}", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if endpoint is not None:
+                endpoint.shutdown()
+                endpoint.server_close()
+
+
+def build_suppression(source: str, index: str) -> None:
+    from app.batch.suppression import SuppressionIndex
+
+    with open(source, encoding="utf-8") as file:
+        count, rejected = SuppressionIndex.build(file, index)
+    print(f"Indexed {count} numbers into {index}, skipped {rejected} invalid lines")
+
+
+def write_metrics(path: Optional[str]) -> None:
+    if path is not None:
+        from app.utils.metrics import registry
+
+        registry.write_textfile(path)
+
+
+def main() -> None:
+    # Arguments are parsed before anything heavy is imported, so `--help` and usage errors return immediately.
     args = parse_arguments()
 
+    if args.command == "serve":
+        serve(args.socket, args.metrics_port)
+        return
+    if args.command == "build-suppression":
+        build_suppression(args.source, args.index)
+        return
+
+    from app.utils.console import print_batch_summary, print_json_response, print_metrics_summary
+
+    if args.batch is None and not args.direct:
+        from app.daemon.client import connect, submit
+
+        # A running daemon already holds the config and warm connections: hand the message off to it.
+        sock = connect(args.socket)
+        if sock is not None:
+            with sock:
+                response = submit(sock, args.sender, args.recipient, args.message)
+            print_json_response("SMS Response", response, plain=args.plain)
+            return
+
+    api_url, auth = configure()
+
+    if args.batch:
+        from app.batch.sender import run_batch
+        from app.batch.suppression import RecipientFilter, SuppressionIndex
+        from app.http_client.templates import MessageTemplate
+
+        template = MessageTemplate(args.template, sender=args.sender) if args.template is not None else None
+        suppression = SuppressionIndex(args.suppress) if args.suppress is not None else None
+        recipient_filter = None
+        if suppression is not None or args.dedupe:
+            recipient_filter = RecipientFilter(suppression, dedupe=args.dedupe)
+
+        summary = run_batch(
+            args.batch,
+            args.output,
+            api_url,
+            auth=auth,
+            concurrency=args.concurrency,
+            pipeline_depth=args.pipeline,
+            queue=args.queue,
+            workers=args.workers,
+            template=template,
+            recipient_filter=recipient_filter,
+        )
+        if suppression is not None:
+            suppression.close()
+        print_batch_summary("SMS Batch Summary", summary, plain=args.plain)
+        print_metrics_summary("SMS Send Metrics", plain=args.plain)
+        write_metrics(args.metrics)
+        return
+
+    from app.http_client.request import Request
+    from app.http_client.schemas import SMSMessage
+
     sms_message = SMSMessage(args.sender, args.recipient, args.message)
-    response = Request.post(api_url, auth=(username, password), body=sms_message)
-    print_json_response("SMS Response", response)
+    response = Request.post(api_url, auth=auth, body=sms_message)
+    print_json_response("SMS Response", response, plain=args.plain)
+    write_metrics(args.metrics)
 
 
 if __name__ == "__main__":
@@ -1,13 +1,26 @@
 import json
+import shutil
+import socket
+import ssl
+import subprocess
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from typing import Callable, Generator, Optional
 from unittest.mock import MagicMock, patch
 
 import pytest
 
 from app.http_client.http_message import HTTPResponse
+from app.http_client.request import Request
 from app.http_client.schemas import HTTPBody
 
 
+@pytest.fixture(autouse=True)
+def reset_connection_pool() -> Generator[None, None, None]:
+    yield
+    Request.pool.clear()
+
+
 @pytest.fixture
 def mock_response() -> Callable[[int, Optional[str], bool], MagicMock]:
     def _factory(status_code: int = 200, body: Optional[str] = None, is_json: bool = True) -> MagicMock:
@@ -21,8 +34,8 @@ def mock_response() -> Callable[[int, Optional[str], bool], MagicMock]:
 
 @pytest.fixture
 def mock_console() -> Generator[MagicMock, None, None]:
-    with patch("app.utils.console.console") as mock:
-        yield mock
+    with patch("app.utils.console.get_console") as get_console:
+        yield get_console.return_value
 
 
 @pytest.fixture
@@ -31,6 +44,35 @@ def mock_create_connection() -> Generator[MagicMock, None, None]:
         yield mock
 
 
+@pytest.fixture
+def fake_socket() -> Callable[..., MagicMock]:
+    def _factory(*chunks: bytes) -> MagicMock:
+        pending = list(chunks)
+
+        def recv_into(buffer: memoryview) -> int:
+            if not pending:
+                return 0
+            data = pending.pop(0)
+            size = min(len(buffer), len(data))
+            buffer[:size] = data[:size]
+            if size < len(data):
+                pending.insert(0, data[size:])
+            return size
+
+        def sendmsg(buffers: list[memoryview]) -> int:
+            data = b"".join(buffers)
+            sock.sent += data
+            return len(data)
+
+        sock = MagicMock()
+        sock.sent = bytearray()
+        sock.recv_into.side_effect = recv_into
+        sock.sendmsg.side_effect = sendmsg
+        return sock
+
+    return _factory
+
+
 @pytest.fixture
 def valid_credentials() -> tuple[str, str]:
     return ("test_user", "test_password")
@@ -45,3 +87,89 @@ def valid_auth_header() -> str:
 @pytest.fixture
 def http_body() -> HTTPBody:
     return HTTPBody()
+
+
+class GatewayHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "StandInGateway"
+
+    def setup(self) -> None:
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_POST(self) -> None:
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with self.server.lock:
+            self.server.requests.append(body)
+        payload = json.dumps({"status": "success", "echo": json.loads(body or b"null")}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+class StandInGateway(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        handler: type[BaseHTTPRequestHandler] = GatewayHandler,
+        ssl_context: Optional[ssl.SSLContext] = None,
+    ):
+        super().__init__(("127.0.0.1", 0), handler)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.requests: list[bytes] = []
+        self.scheme = "http"
+        if ssl_context is not None:
+            self.socket = ssl_context.wrap_socket(self.socket, server_side=True)
+            self.scheme = "https"
+
+    @property
+    def url(self) -> str:
+        host = "localhost" if self.scheme == "https" else "127.0.0.1"
+        return f"{self.scheme}://{host}:{self.server_address[1]}/send_sms"
+
+
+def run_gateway(server: StandInGateway) -> Generator[StandInGateway, None, None]:
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def gateway() -> Generator[StandInGateway, None, None]:
+    yield from run_gateway(StandInGateway())
+
+
+@pytest.fixture(scope="session")
+def tls_certificate(tmp_path_factory: pytest.TempPathFactory) -> tuple[str, str]:
+    if shutil.which("openssl") is None:
+        pytest.skip("openssl is required to generate a test certificate")
+    directory = tmp_path_factory.mktemp("tls")
+    certfile, keyfile = directory / "cert.pem", directory / "key.pem"
+    subprocess.run(
+        [
+            "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+            "-keyout", str(keyfile), "-out", str(certfile),
+            "-subj", "/CN=localhost", "-addext", "subjectAltName=DNS:localhost,IP:127.0.0.1",
+        ],
+        check=True,
+        capture_output=True,
+    )  # fmt: skip
+    return str(certfile), str(keyfile)
+
+
+@pytest.fixture
+def tls_gateway(tls_certificate: tuple[str, str]) -> Generator[StandInGateway, None, None]:
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(*tls_certificate)
+    yield from run_gateway(StandInGateway(ssl_context=context))
@@ -0,0 +1,65 @@
+import json
+
+import pytest
+
+from app.batch.columnar import SMSBatch, decode_phone, encode_phone
+from app.exceptions import PhoneNumberError
+from app.http_client.schemas import SMSMessage
+
+
+class TestPhoneEncoding:
+    @pytest.mark.parametrize("phone", ["+12345678901", "12345678901", "0012345678", "+001234567890123"])
+    def test_round_trip(self, phone: str) -> None:
+        assert decode_phone(encode_phone(phone)) == phone
+
+    def test_fits_unsigned_64_bit(self) -> None:
+        assert encode_phone("+999999999999999") < 2**64
+
+
+class TestSMSBatch:
+    def test_rows_round_trip(self) -> None:
+        rows = [("+12345678901", f"+1987654{index:04d}", f"Message {index}") for index in range(10)]
+        batch = SMSBatch(rows)
+
+        assert len(batch) == 10
+        assert [batch.row(index) for index in range(10)] == rows
+        assert batch[3] == SMSMessage(*rows[3])
+        assert batch.senders == ["+12345678901"]
+
+    def test_serializes_through_http_body(self) -> None:
+        batch = SMSBatch([("+12345678901", "0098765432", "Привет")])
+
+        assert json.loads(batch[0].to_json()) == {
+            "sender": "+12345678901",
+            "recipient": "0098765432",
+            "message": "Привет",
+        }
+
+    def test_append_validates(self) -> None:
+        batch = SMSBatch()
+        with pytest.raises(PhoneNumberError):
+            batch.append("+12345678901", "oops", "Hello")
+        assert len(batch) == 0
+
+    def test_from_columns_skips_invalid_rows(self) -> None:
+        batch, report = SMSBatch.from_columns(
+            ["+12345678901", "+12345678901", "+12345678902"],
+            ["+19876543210", "bad", "+19876543211"],
+            ["One", "Two", "Three"],
+        )
+
+        assert report.invalid_rows == {1}
+        assert [message.message for message in batch] == ["One", "Three"]
+        assert len(batch.senders) == 2
+
+    def test_slice(self) -> None:
+        batch = SMSBatch(("+12345678901", f"+1987654{index:04d}", "Hi") for index in range(6))
+
+        part = batch[2:4]
+        assert isinstance(part, SMSBatch)
+        assert [message.recipient for message in part] == ["+19876540002", "+19876540003"]
+
+    def test_segments(self) -> None:
+        batch = SMSBatch([("+12345678901", "+19876543210", "Hi"), ("+12345678901", "+19876543211", "я" * 71)])
+
+        assert list(batch.segments()) == [1, 2]
@@ -0,0 +1,115 @@
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from app.batch.queue import ACKED, FAILED, INVALID, QUEUED, SENDING, OutboundQueue
+from app.batch.reader import BatchItem
+from app.batch.results import BatchResult
+from app.http_client.schemas import SMSMessage
+
+
+def make_item(line: int) -> BatchItem:
+    return BatchItem(line, message=SMSMessage("+12345678901", f"+1987654{line:04d}", f"Message {line}"))
+
+
+@pytest.fixture
+def queue_path(tmp_path: Path) -> str:
+    return str(tmp_path / "queue.db")
+
+
+class TestOutboundQueue:
+    def test_enqueue_is_idempotent(self, queue_path: str) -> None:
+        with OutboundQueue(queue_path) as queue:
+            assert queue.enqueue([make_item(1), make_item(2), BatchItem(3, error="bad row")]) == 3
+            assert queue.enqueue([make_item(1), make_item(2), make_item(4)]) == 1
+
+            assert queue.counts() == {QUEUED: 3, INVALID: 1}
+
+    def test_drain_marks_attempts(self, queue_path: str) -> None:
+        with OutboundQueue(queue_path, sync_every=2) as queue:
+            queue.enqueue(make_item(line) for line in range(1, 6))
+            items = list(queue.drain())
+
+            assert [item.line for item in items] == [1, 2, 3, 4, 5]
+            assert items[0].message == SMSMessage("+12345678901", "+19876540001", "Message 1")
+            assert queue.counts() == {SENDING: 5}
+
+    def test_record_sets_terminal_state(self, queue_path: str) -> None:
+        with OutboundQueue(queue_path) as queue:
+            queue.enqueue([make_item(1), make_item(2)])
+            list(queue.drain())
+            queue.record(BatchResult(1, status_code=200, body="{}"))
+            queue.record(BatchResult(2, error="Network error"))
+
+            assert queue.counts() == {ACKED: 1, FAILED: 1}
+            assert [result.ok for result in queue.results()] == [True, False]
+
+    def test_state_survives_reopen(self, queue_path: str) -> None:
+        with OutboundQueue(queue_path) as queue:
+            queue.enqueue(make_item(line) for line in range(1, 4))
+            drained = queue.drain()
+            next(drained)
+            queue.record(BatchResult(1, status_code=200))
+
+        with OutboundQueue(queue_path) as queue:
+            # Line 1 was acked; lines 2 and 3 were claimed or still queued and are sent again.
+            assert [item.line for item in queue.drain()] == [2, 3]
+            attempts = dict(queue.db.execute("SELECT line, attempts FROM messages").fetchall())
+
+        assert attempts == {1: 1, 2: 2, 3: 2}
+
+    def test_resume_reuses_idempotency_keys(self, queue_path: str) -> None:
+        items = [make_item(1), make_item(2)]
+        with OutboundQueue(queue_path) as queue:
+            queue.enqueue(items)
+            first = [item.message.idempotency_key() for item in queue.drain() if item.message is not None]
+
+        with OutboundQueue(queue_path) as queue:
+            again = [item.message.idempotency_key() for item in queue.drain() if item.message is not None]
+
+        assert first == again == [item.message.idempotency_key() for item in items if item.message is not None]
+
+    def test_queue_without_key_column_is_upgraded(self, queue_path: str) -> None:
+        with sqlite3.connect(queue_path) as db:
+            db.execute(
+                "CREATE TABLE messages (line INTEGER PRIMARY KEY, sender TEXT, recipient TEXT, message TEXT,"
+                " state TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0, status_code INTEGER, body TEXT, error TEXT)"
+            )
+            db.execute(
+                "INSERT INTO messages (line, sender, recipient, message, state) VALUES (1, ?, ?, 'Hi', ?)",
+                ("+12345678901", "+19876543210", SENDING),
+            )
+        db.close()
+
+        with OutboundQueue(queue_path) as queue:
+            [item] = queue.drain()
+        with OutboundQueue(queue_path) as queue:
+            [again] = queue.drain()
+
+        assert item.message is not None and again.message is not None
+        assert item.message.idempotency_key() == again.message.idempotency_key()
+
+    def test_acks_are_committed_in_batches(self, queue_path: str) -> None:
+        with OutboundQueue(queue_path, sync_every=3) as queue:
+            queue.enqueue(make_item(line) for line in range(1, 5))
+            list(queue.drain())
+            for line in range(1, 5):
+                queue.record(BatchResult(line, status_code=200))
+            observer = sqlite3.connect(queue_path)
+            committed = observer.execute("SELECT COUNT(*) FROM messages WHERE state = ?", (ACKED,)).fetchone()[0]
+            observer.close()
+
+        assert committed == 3
+
+    def test_uses_wal(self, queue_path: str) -> None:
+        with OutboundQueue(queue_path) as queue:
+            assert queue.db.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    def test_requires_open(self, queue_path: str) -> None:
+        with pytest.raises(RuntimeError):
+            OutboundQueue(queue_path).enqueue([])
+
+    def test_invalid_sync_every(self, queue_path: str) -> None:
+        with pytest.raises(ValueError):
+            OutboundQueue(queue_path, sync_every=0)
@@ -0,0 +1,74 @@
+from pathlib import Path
+from typing import Any, Iterator
+
+import pytest
+
+from app.batch.reader import iter_messages, read_batch
+from app.exceptions import TemplateError
+from app.http_client.templates import MessageTemplate
+
+
+class TestReadBatch:
+    def test_read_csv(self, tmp_path: Path) -> None:
+        path = tmp_path / "batch.csv"
+        path.write_text("sender,recipient,message\n+12345678901,+19876543210,Hello\n+12345678901,bad,Hi\n")
+
+        items = list(read_batch(str(path)))
+        assert len(items) == 2
+        assert items[0].message is not None
+        assert items[0].message.message == "Hello"
+        assert items[0].line == 2
+        assert items[1].message is None
+        assert items[1].error is not None and "Invalid recipient phone number" in items[1].error
+
+    def test_read_jsonl(self, tmp_path: Path) -> None:
+        path = tmp_path / "batch.jsonl"
+        path.write_text(
+            '{"sender": "+12345678901", "recipient": "+19876543210", "message": "Hello"}\n'
+            "\n"
+            "{not json}\n"
+            '{"sender": "+12345678901"}\n'
+        )
+
+        items = list(read_batch(str(path)))
+        assert [item.line for item in items] == [1, 3, 4]
+        assert items[0].message is not None
+        assert items[1].error is not None and items[1].error.startswith("Invalid JSON")
+        assert items[2].error == "Missing field(s): recipient, message"
+
+    def test_rows_are_validated_lazily(self) -> None:
+        def rows() -> Iterator[tuple[int, Any]]:
+            yield 1, {"sender": "+12345678901", "recipient": "+19876543210", "message": "Hello"}
+            raise AssertionError("second row must not be read")
+
+        items = iter_messages(rows())
+        assert next(items).message is not None
+
+    def test_non_object_row(self) -> None:
+        items = list(iter_messages([(1, ["+12345678901"])]))
+        assert items[0].error == "Row must be an object with sender, recipient and message"
+
+
+class TestTemplatedBatch:
+    def test_rows_fill_template(self, tmp_path: Path) -> None:
+        path = tmp_path / "batch.jsonl"
+        path.write_text(
+            '{"recipient": "+19876543210", "name": "Anna", "code": 1234}\n'
+            '{"recipient": "+19876543211", "name": "Boris"}\n'
+            '{"name": "Vera", "code": 1}\n'
+        )
+        template = MessageTemplate("Hi {name}, your code is {code}", sender="+12345678901")
+
+        items = list(read_batch(str(path), template))
+
+        assert items[0].message is not None
+        assert items[0].message.message == "Hi Anna, your code is 1234"
+        assert items[1].error == "Template variable(s) not provided: code"
+        assert items[2].error == "Missing field(s): recipient"
+
+    def test_csv_header_is_checked_up_front(self, tmp_path: Path) -> None:
+        path = tmp_path / "batch.csv"
+        path.write_text("recipient,name\n+19876543210,Anna\n")
+
+        with pytest.raises(TemplateError, match="code"):
+            read_batch(str(path), MessageTemplate("Hi {name}, code {code}", sender="+12345678901"))
@@ -0,0 +1,46 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from app.batch.results import BatchResult, BatchSummary, ResultWriter
+
+
+class TestBatchSummary:
+    def test_counts(self) -> None:
+        summary = BatchSummary()
+        summary.add(BatchResult(1, status_code=200, body="{}", segments=2))
+        summary.add(BatchResult(2, status_code=429, body="{}", segments=1))
+        summary.add(BatchResult(3, error="Network error"))
+        summary.add(BatchResult(4, error="Invalid recipient", invalid=True))
+        summary.add(BatchResult(5, error="Duplicate recipient", skipped=True))
+
+        assert (summary.total, summary.sent, summary.failed, summary.invalid, summary.skipped) == (5, 1, 2, 1, 1)
+        assert summary.status_codes == {200: 1, 429: 1}
+        assert summary.segments == 2
+
+
+class TestResultWriter:
+    def test_writes_jsonl(self, tmp_path: Path) -> None:
+        path = tmp_path / "results.jsonl"
+        with ResultWriter(str(path)) as writer:
+            writer.write(BatchResult(1, "+19876543210", status_code=200, body="Привет"))
+            writer.write(BatchResult(2, error="boom"))
+
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert json.loads(lines[0]) == {
+            "line": 1,
+            "recipient": "+19876543210",
+            "status_code": 200,
+            "body": "Привет",
+            "error": None,
+            "invalid": False,
+            "segments": None,
+            "skipped": False,
+        }
+        assert json.loads(lines[1])["error"] == "boom"
+        assert writer.summary.total == 2
+
+    def test_write_outside_context(self, tmp_path: Path) -> None:
+        with pytest.raises(RuntimeError):
+            ResultWriter(str(tmp_path / "results.jsonl")).write(BatchResult(1))
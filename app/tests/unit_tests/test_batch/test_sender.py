@@ -0,0 +1,122 @@
+import json
+from pathlib import Path
+from typing import Iterator
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.batch.reader import BatchItem
+from app.batch.sender import run_batch, send_batch
+from app.exceptions import NetworkError
+from app.http_client.schemas import SMSMessage
+from app.tests.conftest import StandInGateway
+
+
+def make_item(line: int) -> BatchItem:
+    return BatchItem(line, message=SMSMessage("+12345678901", "+19876543210", f"Message {line}"))
+
+
+class TestSendBatch:
+    def test_results_keep_input_order(self, mock_response: MagicMock) -> None:
+        with patch("app.batch.sender.Request.post", return_value=mock_response(body={"status": "ok"})):
+            results = list(send_batch((make_item(line) for line in range(1, 51)), "http://example.com", concurrency=4))
+
+        assert [result.line for result in results] == list(range(1, 51))
+        assert all(result.ok for result in results)
+
+    def test_invalid_items_are_not_sent(self) -> None:
+        with patch("app.batch.sender.Request.post") as post:
+            results = list(send_batch([BatchItem(1, error="bad row")], "http://example.com"))
+
+        post.assert_not_called()
+        assert results[0].invalid
+        assert results[0].error == "bad row"
+
+    def test_send_errors_are_recorded(self) -> None:
+        with patch("app.batch.sender.Request.post", side_effect=NetworkError("Network error: refused")):
+            results = list(send_batch([make_item(1)], "http://example.com"))
+
+        assert results[0].error == "Network error: refused"
+        assert not results[0].invalid
+
+    def test_input_is_consumed_lazily(self, mock_response: MagicMock) -> None:
+        consumed: list[int] = []
+
+        def items() -> Iterator[BatchItem]:
+            for line in range(1, 1001):
+                consumed.append(line)
+                yield make_item(line)
+
+        with patch("app.batch.sender.Request.post", return_value=mock_response(body={})):
+            results = send_batch(items(), "http://example.com", concurrency=2)
+            next(results)
+            assert len(consumed) <= 5
+
+    def test_invalid_concurrency(self) -> None:
+        with pytest.raises(ValueError):
+            list(send_batch([], "http://example.com", concurrency=0))
+
+    def test_pipelined_batch(self, gateway: StandInGateway) -> None:
+        items = [make_item(line) for line in range(1, 31)]
+        items.insert(5, BatchItem(0, error="bad row"))
+
+        results = list(send_batch(items, gateway.url, concurrency=2, pipeline_depth=8))
+
+        assert [result.line for result in results] == [item.line for item in items]
+        assert [result.invalid for result in results].count(True) == 1
+        assert all(result.ok for result in results if not result.invalid)
+        assert len(gateway.requests) == 30
+        assert gateway.connections <= 2
+
+    def test_invalid_pipeline_depth(self) -> None:
+        with pytest.raises(ValueError):
+            list(send_batch([], "http://example.com", pipeline_depth=0))
+
+
+class TestRunBatch:
+    def test_run_batch(self, tmp_path: Path, mock_response: MagicMock) -> None:
+        source = tmp_path / "batch.jsonl"
+        source.write_text(
+            '{"sender": "+12345678901", "recipient": "+19876543210", "message": "Hello"}\n'
+            '{"sender": "+12345678901", "recipient": "oops", "message": "Hello"}\n'
+        )
+        output = tmp_path / "results.jsonl"
+
+        with patch("app.batch.sender.Request.post", return_value=mock_response(body={"status": "ok"})):
+            summary = run_batch(str(source), str(output), "http://example.com", auth=("user", "pass"))
+
+        assert (summary.total, summary.sent, summary.invalid) == (2, 1, 1)
+        records = [json.loads(line) for line in output.read_text().splitlines()]
+        assert records[0]["status_code"] == 200
+        assert (records[0]["segments"], records[1]["segments"]) == (1, None)
+        assert records[1]["invalid"] is True
+
+    def test_queued_batch_resumes_after_interruption(self, tmp_path: Path, mock_response: MagicMock) -> None:
+        source = tmp_path / "batch.jsonl"
+        source.write_text(
+            "".join(
+                f'{{"sender": "+12345678901", "recipient": "+1987654321{index}", "message": "Hello"}}\n'
+                for index in range(5)
+            )
+        )
+        output, queue = tmp_path / "results.jsonl", str(tmp_path / "queue.db")
+        calls = 0
+
+        response: MagicMock = mock_response(body={"status": "ok"})
+
+        def crash_on_third(*args: object, **kwargs: object) -> MagicMock:
+            nonlocal calls
+            calls += 1
+            if calls == 3:
+                raise KeyboardInterrupt
+            return response
+
+        with patch("app.batch.sender.Request.post", side_effect=crash_on_third):
+            with pytest.raises(KeyboardInterrupt):
+                run_batch(str(source), str(output), "http://example.com", concurrency=1, queue=queue)
+        with patch("app.batch.sender.Request.post", return_value=response) as post:
+            summary = run_batch(str(source), str(output), "http://example.com", concurrency=1, queue=queue)
+
+        assert post.call_count == 3
+        assert (summary.total, summary.sent) == (5, 5)
+        assert [json.loads(line)["line"] for line in output.read_text().splitlines()] == [1, 2, 3, 4, 5]
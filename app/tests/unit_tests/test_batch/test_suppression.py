@@ -0,0 +1,138 @@
+import json
+from pathlib import Path
+from typing import Optional, Union
+
+import pytest
+
+from app.batch import suppression
+from app.batch.reader import BatchItem
+from app.batch.sender import run_batch
+from app.batch.suppression import DUPLICATE, SUPPRESSED, RecipientFilter, SuppressionIndex, normalize_phone
+from app.exceptions import ConfigError
+from app.http_client.schemas import SMSMessage
+from app.tests.conftest import StandInGateway
+
+
+def make_item(line: int, recipient: str) -> BatchItem:
+    return BatchItem(line, message=SMSMessage("+12345678901", recipient, "Hi"), recipient=recipient)
+
+
+@pytest.fixture
+def index_path(tmp_path: Path) -> str:
+    path = str(tmp_path / "optout.idx")
+    SuppressionIndex.build(["+19876543210\n", "0019876543212\n", "\n", "not a number\n"], path)
+    return path
+
+
+class TestNormalizePhone:
+    @pytest.mark.parametrize(
+        "phone, expected",
+        [
+            ("+19876543210", 19876543210),
+            ("19876543210", 19876543210),
+            ("+1 (987) 654-32-10", 19876543210),
+            ("0019876543210", 19876543210),
+            (19876543210, 19876543210),
+            ("12345", None),
+            ("+1987654321a", None),
+            ("01612345678", None),
+            ("+01612345678", None),
+            ("0001612345678", None),
+        ],
+    )
+    def test_normalize(self, phone: Union[str, int], expected: Optional[int]) -> None:
+        assert normalize_phone(phone) == expected
+
+
+class TestSuppressionIndex:
+    def test_lookup(self, index_path: str) -> None:
+        with SuppressionIndex(index_path) as index:
+            assert len(index) == 2
+            assert "+19876543210" in index
+            assert "+1 987 654 3212" in index
+            assert "+19876543211" not in index
+            assert "garbage" not in index
+
+    def test_build_reports_counts(self, tmp_path: Path) -> None:
+        count, rejected = SuppressionIndex.build(["+19876543210", "19876543210", "oops", ""], str(tmp_path / "i"))
+
+        assert (count, rejected) == (1, 1)
+
+    def test_large_build_merges_sorted_runs(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(suppression, "BLOCK", 16)
+        numbers = [f"+1{(index * 7919) % 100_000:010d}" for index in range(3000)]
+        path = str(tmp_path / "optout.idx")
+
+        count, _ = SuppressionIndex.build(numbers, path, run_size=500)
+
+        with SuppressionIndex(path) as index:
+            assert count == len(index) == len(set(numbers))
+            assert list(index._numbers) == sorted({int(number[1:]) for number in numbers})
+            assert all(number in index for number in numbers)
+            assert "+10000000001" not in index
+
+    def test_empty_index(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "empty.idx")
+        SuppressionIndex.build([], path)
+
+        with SuppressionIndex(path) as index:
+            assert "+19876543210" not in index
+
+    def test_not_an_index(self, tmp_path: Path) -> None:
+        path = tmp_path / "numbers.txt"
+        path.write_text("+19876543210\n" * 4)
+
+        with pytest.raises(ConfigError):
+            SuppressionIndex(str(path))
+        with pytest.raises(ConfigError):
+            SuppressionIndex(str(tmp_path / "missing.idx"))
+
+
+class TestRecipientFilter:
+    def test_national_number_does_not_match_international(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "optout.idx")
+        SuppressionIndex.build(["+1612345678"], path)
+        items = [make_item(1, "01612345678"), make_item(2, "+1612345678"), make_item(3, "01612345678")]
+
+        with SuppressionIndex(path) as index:
+            assert "01612345678" not in index
+            filtered = list(RecipientFilter(index, dedupe=True).apply(items))
+
+        assert [(item.line, item.error) for item in filtered] == [(1, None), (2, SUPPRESSED), (3, DUPLICATE)]
+
+    def test_suppressed_and_duplicates_are_skipped(self, index_path: str) -> None:
+        items = [
+            make_item(1, "+19876543210"),
+            make_item(2, "+19876543211"),
+            make_item(3, "19876543211"),
+            BatchItem(4, error="bad row"),
+        ]
+
+        with SuppressionIndex(index_path) as index:
+            filtered = list(RecipientFilter(index, dedupe=True).apply(items))
+
+        assert [(item.line, item.error, item.skipped) for item in filtered] == [
+            (1, SUPPRESSED, True),
+            (2, None, False),
+            (3, DUPLICATE, True),
+            (4, "bad row", False),
+        ]
+
+    def test_batch_skips_filtered_recipients(self, tmp_path: Path, index_path: str, gateway: StandInGateway) -> None:
+        source = tmp_path / "batch.jsonl"
+        source.write_text(
+            "".join(
+                f'{{"sender": "+12345678901", "recipient": "{recipient}", "message": "Hi"}}\n'
+                for recipient in ("+19876543210", "+19876543211", "+19876543211", "+19876543213")
+            )
+        )
+        output = tmp_path / "results.jsonl"
+
+        with SuppressionIndex(index_path) as index:
+            summary = run_batch(
+                str(source), str(output), gateway.url, recipient_filter=RecipientFilter(index, dedupe=True)
+            )
+
+        assert (summary.total, summary.sent, summary.skipped, summary.invalid) == (4, 2, 2, 0)
+        assert [json.loads(line)["skipped"] for line in output.read_text().splitlines()] == [True, False, True, False]
+        assert len(gateway.requests) == 2
@@ -0,0 +1,118 @@
+import json
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from app.batch.sender import run_batch
+from app.batch.suppression import RecipientFilter
+from app.batch.workers import ShardedBatch, shard_of, worker_path
+from app.http_client.templates import MessageTemplate
+from app.tests.conftest import StandInGateway
+from app.utils import logging as sms_logging
+from app.utils.logging import LogConfig, logger, setup_logger, shutdown_logger
+from app.utils.metrics import REQUESTS, registry
+
+
+class TestSharding:
+    def test_same_recipient_same_shard(self) -> None:
+        row = {"sender": "+12345678901", "recipient": "+19876543210", "message": "Hi"}
+
+        assert shard_of(row, 4) == shard_of(dict(row, message="Bye"), 4)
+        assert {shard_of({"recipient": f"+1987654{index:04d}"}, 4) for index in range(100)} == {0, 1, 2, 3}
+
+    def test_invalid_rows_have_a_shard(self) -> None:
+        assert 0 <= shard_of(ValueError("Invalid JSON"), 3) < 3
+
+    def test_worker_path(self) -> None:
+        assert worker_path("sms-log.log", 2) == "sms-log.worker2.log"
+        assert worker_path("journal", 0) == "journal.worker0"
+
+
+class TestRunShardedBatch:
+    def test_results_are_merged_in_input_order(self, tmp_path: Path, gateway: StandInGateway) -> None:
+        source = tmp_path / "batch.jsonl"
+        rows = [
+            f'{{"sender": "+12345678901", "recipient": "+1987654{index:04d}", "message": "Hello {index}"}}\n'
+            for index in range(40)
+        ]
+        rows.insert(7, '{"sender": "+12345678901", "recipient": "oops", "message": "Hello"}\n')
+        rows.insert(20, "not json\n")
+        source.write_text("".join(rows))
+        output = tmp_path / "results.jsonl"
+        registry.reset()
+
+        summary = run_batch(str(source), str(output), gateway.url, concurrency=2, workers=3)
+
+        assert (summary.total, summary.sent, summary.invalid) == (42, 40, 2)
+        assert [json.loads(line)["line"] for line in output.read_text().splitlines()] == list(range(1, 43))
+        assert len(gateway.requests) == 40
+        # Every worker's metrics are folded into the parent's registry.
+        assert REQUESTS.value("200") == 40
+        registry.reset()
+
+    def test_template_is_rendered_in_workers(self, tmp_path: Path, gateway: StandInGateway) -> None:
+        source = tmp_path / "batch.jsonl"
+        source.write_text(
+            "".join(f'{{"recipient": "+1987654{index:04d}", "name": "user{index}"}}\n' for index in range(6))
+        )
+        template = MessageTemplate("Hi {name}", sender="+12345678901")
+
+        summary = run_batch(str(source), str(tmp_path / "results.jsonl"), gateway.url, workers=2, template=template)
+
+        assert summary.sent == 6
+        assert sorted(json.loads(request)["message"] for request in gateway.requests) == [
+            f"Hi user{index}" for index in range(6)
+        ]
+
+    def test_dedupe_across_workers(self, tmp_path: Path, gateway: StandInGateway) -> None:
+        source = tmp_path / "batch.jsonl"
+        recipients = [f"+1987654{index:04d}" for index in range(10)] + [f"1987654{index:04d}" for index in range(10)]
+        source.write_text(
+            "".join(
+                f'{{"sender": "+12345678901", "recipient": "{number}", "message": "Hi"}}\n' for number in recipients
+            )
+        )
+
+        summary = run_batch(
+            str(source),
+            str(tmp_path / "out.jsonl"),
+            gateway.url,
+            workers=3,
+            recipient_filter=RecipientFilter(dedupe=True),
+        )
+
+        assert (summary.sent, summary.skipped) == (10, 10)
+        assert len(gateway.requests) == 10
+
+    def test_workers_fork_without_the_log_listener(self, tmp_path: Path, gateway: StandInGateway) -> None:
+        source = tmp_path / "batch.jsonl"
+        source.write_text(
+            "".join(
+                f'{{"sender": "+12345678901", "recipient": "+1987654{index:04d}", "message": "Hi"}}\n'
+                for index in range(10)
+            )
+        )
+        log_file = tmp_path / "sms.log"
+        setup_logger(LogConfig(file=str(log_file), level="INFO"))
+        listener_at_fork = []
+        start_worker = ShardedBatch._start_worker
+
+        def recording_start(batch: ShardedBatch, shard: int) -> None:
+            listener_at_fork.append(sms_logging._listener)
+            start_worker(batch, shard)
+
+        try:
+            with mock.patch.object(ShardedBatch, "_start_worker", recording_start):
+                run_batch(str(source), str(tmp_path / "out.jsonl"), gateway.url, workers=2)
+            logger.info("parent still logs")
+        finally:
+            shutdown_logger()
+
+        assert listener_at_fork == [None, None]
+        assert "parent still logs" in log_file.read_text()
+        assert all("Request: POST" in (tmp_path / f"sms.worker{shard}.log").read_text() for shard in range(2))
+
+    def test_queue_cannot_be_sharded(self, tmp_path: Path) -> None:
+        with pytest.raises(ValueError):
+            run_batch("batch.jsonl", "out.jsonl", "http://example.com", queue=str(tmp_path / "q.db"), workers=2)
@@ -49,3 +49,10 @@ class TestConfig:
             config = Config(str(config_file))
             with pytest.raises(ConfigError, match="Missing required config key: 'missing_key'"):
                 config.get("missing_key")
+
+    def test_get_missing_key_with_default(self, tmp_path: Path) -> None:
+        config_file = tmp_path / "test.toml"
+        with patch.object(Config, "load_config", return_value={}):
+            config = Config(str(config_file))
+            assert config.get("rate_limit", None) is None
+            assert config.get("rate_limit", {"rate": 1}) == {"rate": 1}
@@ -0,0 +1,82 @@
+import os
+import socket
+from pathlib import Path
+
+import pytest
+
+from app.daemon.client import connect, parse_reply
+from app.daemon.paths import default_socket_path
+from app.exceptions import NetworkError, PhoneNumberError, SMSClientError
+
+
+class TestDefaultSocketPath:
+    def test_environment_override(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("SMS_CLIENT_SOCKET", "/run/sms.sock")
+
+        assert default_socket_path() == "/run/sms.sock"
+
+    def test_runtime_dir(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.delenv("SMS_CLIENT_SOCKET", raising=False)
+        monkeypatch.setenv("XDG_RUNTIME_DIR", "/run/user/1000")
+
+        assert default_socket_path().startswith("/run/user/1000/sms-client-")
+
+    def test_tmp_fallback_is_a_private_directory(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.delenv("SMS_CLIENT_SOCKET", raising=False)
+        monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+
+        assert default_socket_path() == f"/tmp/sms-client-{os.getuid()}/daemon.sock"
+
+
+class TestConnect:
+    def test_missing_socket_returns_none(self, tmp_path: Path) -> None:
+        assert connect(str(tmp_path / "absent.sock")) is None
+
+    def test_own_socket_is_used(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "sms.sock")
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+            listener.bind(path)
+            listener.listen()
+            sock = connect(path)
+            assert sock is not None
+            sock.close()
+
+    def test_socket_of_another_user_is_ignored(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        path = str(tmp_path / "sms.sock")
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+            listener.bind(path)
+            listener.listen()
+            listener.settimeout(0)
+            monkeypatch.setattr(os, "getuid", lambda: os.stat(path).st_uid + 1)
+
+            assert connect(path) is None
+            with pytest.raises(BlockingIOError):
+                listener.accept()
+
+    def test_regular_file_is_ignored(self, tmp_path: Path) -> None:
+        path = tmp_path / "sms.sock"
+        path.write_text("")
+
+        assert connect(str(path)) is None
+
+
+class TestParseReply:
+    def test_response(self) -> None:
+        response = parse_reply(b'{"status_code": 200, "status_message": "OK", "body": "{}"}\n')
+
+        assert (response.status_code, response.status_message, response.body) == (200, "OK", "{}")
+
+    def test_known_error_type(self) -> None:
+        with pytest.raises(PhoneNumberError, match="bad number"):
+            parse_reply(b'{"error": "bad number", "type": "PhoneNumberError"}\n')
+
+    @pytest.mark.parametrize("error_type", ["KeyError", "SystemExit", "Unknown"])
+    def test_unknown_error_type(self, error_type: str) -> None:
+        with pytest.raises(SMSClientError) as excinfo:
+            parse_reply(f'{{"error": "boom", "type": "{error_type}"}}'.encode())
+
+        assert type(excinfo.value) is SMSClientError
+
+    def test_invalid_reply(self) -> None:
+        with pytest.raises(NetworkError):
+            parse_reply(b"not json")
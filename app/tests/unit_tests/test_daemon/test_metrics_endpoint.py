@@ -0,0 +1,34 @@
+import urllib.error
+import urllib.request
+from typing import Generator
+
+import pytest
+
+from app.daemon.metrics_endpoint import CONTENT_TYPE, MetricsEndpoint
+from app.utils.metrics import MetricsRegistry
+
+
+@pytest.fixture
+def endpoint() -> Generator[MetricsEndpoint, None, None]:
+    registry = MetricsRegistry()
+    registry.counter("sms_requests_total", "Requests.", ["status"]).inc("200")
+    endpoint = MetricsEndpoint(0, registry)
+    endpoint.start()
+    yield endpoint
+    endpoint.shutdown()
+    endpoint.server_close()
+
+
+class TestMetricsEndpoint:
+    def test_serves_metrics(self, endpoint: MetricsEndpoint) -> None:
+        with urllib.request.urlopen(f"http://127.0.0.1:{endpoint.server_address[1]}/metrics") as response:
+            body = response.read().decode()
+
+        assert response.headers["Content-Type"] == CONTENT_TYPE
+        assert body == endpoint.registry.render()
+
+    def test_unknown_path(self, endpoint: MetricsEndpoint) -> None:
+        with pytest.raises(urllib.error.HTTPError) as excinfo:
+            urllib.request.urlopen(f"http://127.0.0.1:{endpoint.server_address[1]}/")
+
+        assert excinfo.value.code == 404
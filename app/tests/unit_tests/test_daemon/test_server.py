@@ -0,0 +1,140 @@
+import json
+import os
+import socket
+import stat
+import threading
+from pathlib import Path
+from typing import Generator
+
+import pytest
+
+from app.daemon.client import connect, submit
+from app.daemon.server import SubmissionServer
+from app.exceptions import NetworkError, PhoneNumberError
+from app.http_client.connection_pool import ConnectionPool
+from app.tests.conftest import StandInGateway
+
+
+@pytest.fixture
+def socket_path(tmp_path: Path) -> str:
+    return str(tmp_path / "sms.sock")
+
+
+@pytest.fixture
+def daemon(gateway: StandInGateway, socket_path: str) -> Generator[SubmissionServer, None, None]:
+    server = SubmissionServer(socket_path, gateway.url, pool=ConnectionPool())
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TestSubmissionServer:
+    def test_submission_is_forwarded_to_gateway(self, daemon: SubmissionServer, gateway: StandInGateway) -> None:
+        sock = connect(daemon.path)
+        assert sock is not None
+        with sock:
+            response = submit(sock, "+12345678901", "+19876543210", "Привет")
+
+        assert response.status_code == 200
+        assert json.loads(response.body)["echo"] == {
+            "sender": "+12345678901",
+            "recipient": "+19876543210",
+            "message": "Привет",
+        }
+
+    def test_gateway_connection_stays_warm_across_clients(
+        self, daemon: SubmissionServer, gateway: StandInGateway
+    ) -> None:
+        for index in range(3):
+            sock = connect(daemon.path)
+            assert sock is not None
+            with sock:
+                submit(sock, "+12345678901", f"+1987654321{index}", "Hello")
+
+        assert len(gateway.requests) == 3
+        assert gateway.connections == 1
+
+    def test_several_submissions_on_one_connection(self, daemon: SubmissionServer, gateway: StandInGateway) -> None:
+        sock = connect(daemon.path)
+        assert sock is not None
+        with sock:
+            codes = [submit(sock, "+12345678901", "+19876543210", "Hello").status_code for _ in range(3)]
+
+        assert codes == [200, 200, 200]
+
+    def test_validation_error_is_raised_on_client(self, daemon: SubmissionServer, gateway: StandInGateway) -> None:
+        sock = connect(daemon.path)
+        assert sock is not None
+        with sock, pytest.raises(PhoneNumberError):
+            submit(sock, "not a phone", "+19876543210", "Hello")
+
+        assert gateway.requests == []
+
+    def test_malformed_submission_gets_error_reply(self, daemon: SubmissionServer) -> None:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(daemon.path)
+            sock.sendall(b'{"sender": "+12345678901"}\n')
+            reply = json.loads(sock.makefile("rb").readline())
+
+        assert reply["type"] == "ValidationError"
+
+    def test_socket_is_private_and_removed_on_close(self, gateway: StandInGateway, socket_path: str) -> None:
+        server = SubmissionServer(socket_path, gateway.url)
+
+        assert stat.S_IMODE(os.stat(socket_path).st_mode) == 0o600
+        server.server_close()
+        assert not os.path.exists(socket_path)
+
+    def test_stale_socket_is_replaced(self, gateway: StandInGateway, socket_path: str) -> None:
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(socket_path)
+        stale.close()
+
+        SubmissionServer(socket_path, gateway.url).server_close()
+
+    def test_refuses_to_replace_live_daemon(self, daemon: SubmissionServer, gateway: StandInGateway) -> None:
+        with pytest.raises(NetworkError, match="already listening"):
+            SubmissionServer(daemon.path, gateway.url)
+        assert os.path.exists(daemon.path)
+
+    def test_refuses_to_replace_regular_file(self, gateway: StandInGateway, socket_path: str) -> None:
+        Path(socket_path).write_text("keep me")
+
+        with pytest.raises(NetworkError, match="not a socket"):
+            SubmissionServer(socket_path, gateway.url)
+        assert Path(socket_path).read_text() == "keep me"
+
+    def test_refuses_to_replace_socket_of_another_user(
+        self, gateway: StandInGateway, socket_path: str, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(socket_path)
+        stale.close()
+        monkeypatch.setattr(os, "getuid", lambda: os.stat(socket_path).st_uid + 1)
+
+        with pytest.raises(NetworkError, match="another user"):
+            SubmissionServer(socket_path, gateway.url)
+        assert os.path.exists(socket_path)
+
+    def test_tmp_fallback_directory_is_created_private(
+        self, gateway: StandInGateway, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        directory = tmp_path / "sms-client"
+        monkeypatch.setattr("app.daemon.server.fallback_socket_dir", lambda: str(directory))
+
+        SubmissionServer(str(directory / "daemon.sock"), gateway.url).server_close()
+
+        assert stat.S_IMODE(os.stat(directory).st_mode) == 0o700
+
+    def test_refuses_shared_tmp_fallback_directory(
+        self, gateway: StandInGateway, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        directory = tmp_path / "sms-client"
+        directory.mkdir()
+        directory.chmod(0o755)
+        monkeypatch.setattr("app.daemon.server.fallback_socket_dir", lambda: str(directory))
+
+        with pytest.raises(NetworkError, match="private to this user"):
+            SubmissionServer(str(directory / "daemon.sock"), gateway.url)
@@ -0,0 +1,120 @@
+import asyncio
+import json
+from typing import Awaitable, Callable
+
+import pytest
+
+from app.exceptions import HTTPResponseError, NetworkError
+from app.http_client.async_request import AsyncRequest, read_message
+from app.http_client.http_message import HTTPResponse
+from app.http_client.schemas import SMSMessage
+
+Handler = Callable[[asyncio.StreamReader, asyncio.StreamWriter], Awaitable[None]]
+
+
+def run_with_server(handler: Handler, scenario: Callable[[int], Awaitable[object]]) -> object:
+    async def _main() -> object:
+        server = await asyncio.start_server(handler, "127.0.0.1", 0)
+        async with server:
+            return await scenario(server.sockets[0].getsockname()[1])
+
+    return asyncio.run(_main())
+
+
+def echo_gateway(connections: list[int]) -> Handler:
+    async def handler(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        connections.append(1)
+        while True:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except asyncio.IncompleteReadError:
+                break
+            length = next(
+                int(line.split(b":")[1]) for line in head.split(b"\r\n") if line.lower().startswith(b"content-length")
+            )
+            body = await reader.readexactly(length)
+            recipient = json.loads(body)["recipient"].encode()
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n%s" % (len(recipient), recipient))
+            await writer.drain()
+        writer.close()
+
+    return handler
+
+
+def read(data: bytes) -> tuple[bytes, bool]:
+    async def _main() -> tuple[bytes, bool]:
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        return await read_message(reader)
+
+    return asyncio.run(_main())
+
+
+class TestReadMessage:
+    def test_content_length(self) -> None:
+        message = b"HTTP/1.1 200 OK\r\nContent-Length: 5\r\n\r\nHello"
+        assert read(message) == (message, True)
+
+    def test_chunked(self) -> None:
+        data, reusable = read(b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n3\r\nabc\r\n0\r\n\r\n")
+        assert data == b"HTTP/1.1 200 OK\r\nContent-Length: 3\r\n\r\nabc"
+        assert reusable
+
+    def test_until_close(self) -> None:
+        data, reusable = read(b"HTTP/1.1 200 OK\r\n\r\nabc")
+        assert data == b"HTTP/1.1 200 OK\r\nContent-Length: 3\r\n\r\nabc"
+        assert not reusable
+
+    def test_empty_stream(self) -> None:
+        with pytest.raises(ConnectionResetError):
+            read(b"")
+
+    def test_truncated_body(self) -> None:
+        with pytest.raises(HTTPResponseError):
+            read(b"HTTP/1.1 200 OK\r\nContent-Length: 10\r\n\r\nabc")
+
+
+class TestAsyncRequest:
+    def test_post_success(self) -> None:
+        message = SMSMessage("+12345678901", "+19876543210", "Hello")
+
+        async def scenario(port: int) -> HTTPResponse:
+            return await AsyncRequest.post(f"http://127.0.0.1:{port}/send_sms", body=message)
+
+        response = run_with_server(echo_gateway([]), scenario)
+        assert isinstance(response, HTTPResponse)
+        assert response.status_code == 200
+        assert response.body == "+19876543210"
+
+    def test_network_error(self) -> None:
+        async def scenario() -> HTTPResponse:
+            return await AsyncRequest.post("http://127.0.0.1:1/send_sms", body="Test")
+
+        with pytest.raises(NetworkError):
+            asyncio.run(scenario())
+
+    def test_send_many_preserves_order_and_reuses_connections(self) -> None:
+        connections: list[int] = []
+        messages = [SMSMessage("+12345678901", f"+1987654{index:04d}", "Hello") for index in range(200)]
+
+        async def scenario(port: int) -> object:
+            return await AsyncRequest.send_many(f"http://127.0.0.1:{port}/send_sms", messages, concurrency=10)
+
+        results = run_with_server(echo_gateway(connections), scenario)
+        assert isinstance(results, list)
+        assert [result.body for result in results] == [message.recipient for message in messages]
+        assert len(connections) <= 10
+
+    def test_send_many_collects_errors(self) -> None:
+        async def scenario() -> object:
+            messages = [SMSMessage("+12345678901", "+19876543210", "Hello")]
+            return await AsyncRequest.send_many("http://127.0.0.1:1/send_sms", messages)
+
+        results = asyncio.run(scenario())
+        assert isinstance(results, list)
+        assert isinstance(results[0], NetworkError)
+
+    def test_send_many_invalid_concurrency(self) -> None:
+        with pytest.raises(ValueError):
+            asyncio.run(AsyncRequest.send_many("http://127.0.0.1/send_sms", [], concurrency=0))
@@ -0,0 +1,131 @@
+import os
+import resource
+import socket
+import time
+from typing import Generator
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.exceptions import PoolTimeoutError
+from app.http_client.connection_pool import ConnectionPool, PooledConnection
+
+
+@pytest.fixture
+def server() -> Generator[socket.socket, None, None]:
+    with socket.create_server(("127.0.0.1", 0)) as sock:
+        yield sock
+
+
+def server_port(server: socket.socket) -> int:
+    port: int = server.getsockname()[1]
+    return port
+
+
+class TestConnectionPool:
+    def test_reuses_released_connection(self, server: socket.socket) -> None:
+        pool = ConnectionPool()
+        first = pool.acquire("127.0.0.1", server_port(server))
+        pool.release(first)
+
+        second = pool.acquire("127.0.0.1", server_port(server))
+        assert second is first
+        assert second.is_reused
+        pool.release(second)
+        pool.clear()
+
+    def test_not_reusable_connection_is_closed(self, server: socket.socket) -> None:
+        pool = ConnectionPool()
+        conn = pool.acquire("127.0.0.1", server_port(server))
+        pool.release(conn, reusable=False)
+
+        assert conn.sock.fileno() == -1
+        assert pool.idle_count("127.0.0.1", server_port(server)) == 0
+
+    def test_idle_timeout_discards_connection(self, server: socket.socket) -> None:
+        pool = ConnectionPool(idle_timeout=0.0)
+        first = pool.acquire("127.0.0.1", server_port(server))
+        pool.release(first)
+        time.sleep(0.01)
+
+        second = pool.acquire("127.0.0.1", server_port(server))
+        assert second is not first
+        assert first.sock.fileno() == -1
+        pool.release(second)
+        pool.clear()
+
+    def test_peer_closed_connection_fails_health_check(self, server: socket.socket) -> None:
+        pool = ConnectionPool()
+        first = pool.acquire("127.0.0.1", server_port(server))
+        peer, _ = server.accept()
+        pool.release(first)
+        peer.close()
+        time.sleep(0.01)
+
+        second = pool.acquire("127.0.0.1", server_port(server))
+        assert second is not first
+        pool.release(second)
+        pool.clear()
+
+    def test_health_check_on_high_descriptor(self, server: socket.socket) -> None:
+        # select() rejects descriptors from 1024 up, which used to mark every such connection dead.
+        if resource.getrlimit(resource.RLIMIT_NOFILE)[0] <= 1100:
+            pytest.skip("needs more than 1100 open files")
+        client = socket.create_connection(("127.0.0.1", server_port(server)))
+        high = socket.socket(fileno=os.dup2(client.fileno(), 1100))
+        client.close()
+        conn = PooledConnection(high, "127.0.0.1", server_port(server))
+        peer, _ = server.accept()
+
+        assert conn.is_alive(idle_timeout=60)
+        peer.close()
+        time.sleep(0.01)
+        assert not conn.is_alive(idle_timeout=60)
+        conn.close()
+
+    def test_max_per_host_limit(self, server: socket.socket) -> None:
+        pool = ConnectionPool(max_per_host=1, acquire_timeout=0.01)
+        conn = pool.acquire("127.0.0.1", server_port(server))
+
+        with pytest.raises(PoolTimeoutError):
+            pool.acquire("127.0.0.1", server_port(server))
+
+        pool.release(conn)
+        assert pool.acquire("127.0.0.1", server_port(server)) is conn
+        pool.clear()
+
+    def test_failed_connect_frees_slot(self) -> None:
+        pool = ConnectionPool(max_per_host=1, acquire_timeout=0.01)
+        with socket.create_server(("127.0.0.1", 0)) as closed:
+            port = closed.getsockname()[1]
+
+        with pytest.raises(OSError):
+            pool.acquire("127.0.0.1", port)
+        assert pool.active_count("127.0.0.1", port) == 0
+
+    def test_invalid_max_per_host(self) -> None:
+        with pytest.raises(ValueError):
+            ConnectionPool(max_per_host=0)
+
+
+class TestPooledConnectionSend:
+    def test_send_handles_partial_writes(self) -> None:
+        sent = bytearray()
+
+        def sendmsg(buffers: list[memoryview]) -> int:
+            data = b"".join(buffers)[:3]
+            sent.extend(data)
+            return len(data)
+
+        sock = MagicMock()
+        sock.sendmsg.side_effect = sendmsg
+        conn = PooledConnection(sock, "example.com", 80)
+
+        assert conn.send([b"head\r\n\r\n", b"", b"body"]) == 12
+        assert bytes(sent) == b"head\r\n\r\nbody"
+
+    def test_send_over_real_socket(self) -> None:
+        left, right = socket.socketpair()
+        with left, right:
+            PooledConnection(left, "example.com", 80).send([b"head", b"body"])
+            assert right.recv(8) == b"headbody"
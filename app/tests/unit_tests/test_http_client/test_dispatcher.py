@@ -0,0 +1,79 @@
+import json
+import threading
+import time
+from typing import Iterator
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.exceptions import NetworkError
+from app.http_client.dispatcher import Dispatcher
+from app.http_client.schemas import SMSMessage
+from app.tests.conftest import StandInGateway
+
+
+def make_messages(count: int) -> list[SMSMessage]:
+    return [SMSMessage("+12345678901", f"+1987654{index:04d}", "Hello") for index in range(count)]
+
+
+class TestDispatcher:
+    def test_map_preserves_input_order(self, gateway: StandInGateway) -> None:
+        messages = make_messages(100)
+        with Dispatcher(gateway.url, max_workers=4) as dispatcher:
+            results = list(dispatcher.map(messages))
+
+        assert [result.index for result in results] == list(range(100))
+        assert all(result.ok for result in results)
+        assert [json.loads(result.response.body)["echo"]["recipient"] for result in results if result.response] == [
+            message.recipient for message in messages
+        ]
+
+    def test_worker_connection_affinity(self, gateway: StandInGateway) -> None:
+        with Dispatcher(gateway.url, max_workers=4) as dispatcher:
+            list(dispatcher.map(make_messages(100)))
+
+        assert gateway.connections <= 4
+
+    def test_completion_order(self) -> None:
+        def slow_first(index: int) -> int:
+            if index == 0:
+                time.sleep(0.05)
+            return index
+
+        with Dispatcher("http://example.com", max_workers=2) as dispatcher:
+            results = list(dispatcher.run(slow_first, range(4), ordered=False))
+
+        assert sorted(results) == [0, 1, 2, 3]
+        assert results[-1] == 0
+
+    def test_backpressure_limits_pending_submissions(self) -> None:
+        consumed: list[int] = []
+        release = threading.Event()
+
+        def items() -> Iterator[int]:
+            for index in range(1000):
+                consumed.append(index)
+                yield index
+
+        def blocked(index: int) -> int:
+            release.wait()
+            return index
+
+        with Dispatcher("http://example.com", max_workers=2, max_pending=3) as dispatcher:
+            results = dispatcher.run(blocked, items())
+            release.set()
+            assert next(results) == 0
+            assert len(consumed) <= 4
+            assert list(results) == list(range(1, 1000))
+
+    def test_errors_are_captured(self) -> None:
+        with patch("app.http_client.dispatcher.Request.post", MagicMock(side_effect=NetworkError("refused"))):
+            with Dispatcher("http://example.com") as dispatcher:
+                result = next(dispatcher.map(["Test"]))
+
+        assert not result.ok
+        assert isinstance(result.error, NetworkError)
+
+    def test_invalid_max_workers(self) -> None:
+        with pytest.raises(ValueError):
+            Dispatcher("http://example.com", max_workers=0)
@@ -0,0 +1,136 @@
+import asyncio
+import json
+import socket
+from pathlib import Path
+from typing import Any, Generator
+from unittest import mock
+
+import pytest
+
+from app.exceptions import ConfigError, NetworkError
+from app.http_client.async_request import AsyncRequest
+from app.http_client.connection_pool import ConnectionPool
+from app.http_client.journal import SendJournal, hash_recipient
+from app.http_client.pipeline import Pipeline
+from app.http_client.request import Request
+from app.http_client.schemas import SMSMessage
+from app.http_client.tls import TLSConfig
+from app.http_client.tracing import SendTrace
+from app.tests.conftest import StandInGateway
+
+SMS = SMSMessage("+12345678901", "+19876543210", "Hello")
+
+
+@pytest.fixture
+def journal(tmp_path: Path) -> Generator[SendJournal, None, None]:
+    journal = SendJournal(str(tmp_path / "journal.jsonl"))
+    Request.journal = journal
+    yield journal
+    Request.journal = None
+    journal.close()
+
+
+def read_records(journal: SendJournal) -> list[dict[str, Any]]:
+    journal.flush()
+    return [json.loads(line) for line in Path(journal.path).read_text().splitlines()]
+
+
+class TestSendJournal:
+    def test_send_writes_one_record(self, journal: SendJournal, gateway: StandInGateway) -> None:
+        Request.post(gateway.url, body=SMS)
+
+        [record] = read_records(journal)
+        assert record["status_code"] == 200
+        assert record["retries"] == 0
+        assert record["error"] is None
+        assert record["message_id"] == SMS.idempotency_key()
+        assert record["recipient_hash"] == hash_recipient("+19876543210")
+        assert "+19876543210" not in json.dumps(record)
+        assert record["connect_ms"] > 0
+        assert record["tls_ms"] == 0
+        assert 0 < record["ttfb_ms"] <= record["total_ms"]
+
+    def test_reused_connection_skips_connect(self, journal: SendJournal, gateway: StandInGateway) -> None:
+        Request.post(gateway.url, body=SMS)
+        Request.post(gateway.url, body=SMS)
+
+        first, second = read_records(journal)
+        assert first["connect_ms"] > 0
+        assert second["dns_ms"] == second["connect_ms"] == 0
+
+    def test_tls_handshake_is_timed(
+        self, journal: SendJournal, tls_gateway: StandInGateway, tls_certificate: tuple[str, str]
+    ) -> None:
+        with mock.patch.object(Request, "tls_config", TLSConfig(cafile=tls_certificate[0])):
+            Request.post(tls_gateway.url, body=SMS)
+
+        [record] = read_records(journal)
+        assert record["tls_ms"] > 0
+
+    def test_failed_send_is_recorded(self, journal: SendJournal) -> None:
+        with mock.patch("socket.create_connection", side_effect=socket.error("refused")):
+            with pytest.raises(NetworkError):
+                Request.post("http://127.0.0.1:9/send_sms", body=SMS)
+
+        [record] = read_records(journal)
+        assert record["status_code"] is None
+        assert "refused" in str(record["error"])
+
+    def test_pipelined_sends_write_one_record_each(self, journal: SendJournal, gateway: StandInGateway) -> None:
+        messages = [SMSMessage("+12345678901", f"+1987654{index:04d}", "Hello") for index in range(5)]
+        Pipeline(gateway.url, depth=5, pool=ConnectionPool()).post(messages)
+
+        records = read_records(journal)
+        assert [record["message_id"] for record in records] == [message.idempotency_key() for message in messages]
+        assert [record["recipient_hash"] for record in records] == [hash_recipient(m.recipient) for m in messages]
+        assert all(record["status_code"] == 200 and record["error"] is None for record in records)
+        assert all(0 < record["write_ms"] and 0 <= record["ttfb_ms"] <= record["total_ms"] for record in records)
+
+    def test_pipelined_invalid_body_is_recorded(self, journal: SendJournal, gateway: StandInGateway) -> None:
+        Pipeline(gateway.url, pool=ConnectionPool()).post([{"bad": object()}, SMS])
+
+        invalid, sent = read_records(journal)
+        assert invalid["status_code"] is None and invalid["error"]
+        assert sent["status_code"] == 200
+
+    def test_async_sends_write_one_record_each(self, journal: SendJournal, gateway: StandInGateway) -> None:
+        messages = [SMSMessage("+12345678901", f"+1987654{index:04d}", "Hello") for index in range(5)]
+        asyncio.run(AsyncRequest.send_many(gateway.url, messages, concurrency=5))
+
+        records = read_records(journal)
+        assert sorted(record["message_id"] for record in records) == sorted(m.idempotency_key() for m in messages)
+        assert all(record["status_code"] == 200 and record["error"] is None for record in records)
+        assert all(record["connect_ms"] > 0 and 0 < record["ttfb_ms"] <= record["total_ms"] for record in records)
+
+    def test_failed_async_send_is_recorded(self, journal: SendJournal) -> None:
+        with pytest.raises(NetworkError):
+            asyncio.run(AsyncRequest.post("http://127.0.0.1:1/send_sms", body=SMS))
+
+        [record] = read_records(journal)
+        assert record["status_code"] is None and record["error"]
+
+    def test_records_are_buffered(self, tmp_path: Path) -> None:
+        with SendJournal(str(tmp_path / "journal.jsonl")) as journal:
+            journal.record(SendTrace(message_id="abc", attempts=3), status_code=200)
+            assert Path(journal.path).read_text() == ""
+
+        [record] = [json.loads(line) for line in Path(journal.path).read_text().splitlines()]
+        assert (record["message_id"], record["retries"]) == ("abc", 2)
+
+
+class TestFromConfig:
+    def test_disabled_without_options(self) -> None:
+        assert SendJournal.from_config(None) is None
+
+    def test_options(self, tmp_path: Path) -> None:
+        journal = SendJournal.from_config({"file": str(tmp_path / "j.jsonl"), "buffer_size": 1024})
+
+        assert journal is not None
+        journal.close()
+
+    @pytest.mark.parametrize("options", [{"buffer_size": 10}, {"file": "j.jsonl", "buffer_size": "big"}])
+    def test_invalid_options(self, options: dict[str, object], tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.chdir(tmp_path)
+
+        with pytest.raises(ConfigError):
+            SendJournal.from_config(options)
@@ -0,0 +1,168 @@
+import json
+import socket
+from typing import Any, Generator
+from unittest import mock
+
+import pytest
+
+from app.exceptions import NetworkError
+from app.http_client.connection_pool import ConnectionPool
+from app.http_client.http_message import HTTPResponse
+from app.http_client.pipeline import Pipeline, PipelineResult
+from app.http_client.request import Request
+from app.http_client.retry import RetryPolicy
+from app.http_client.schemas import SMSMessage
+from app.tests.conftest import GatewayHandler, StandInGateway, run_gateway
+
+
+class ClosingHandler(GatewayHandler):
+    def do_POST(self) -> None:
+        # Answer one request per connection, then hang up on whatever else was pipelined.
+        self.close_connection = True
+        super().do_POST()
+
+    def send_response(self, code: int, message: object = None) -> None:
+        super().send_response(code)
+        self.send_header("Connection", "close")
+
+
+class ThrottlingHandler(GatewayHandler):
+    def do_POST(self) -> None:
+        # Every other request of the first six is answered 429.
+        with self.server.lock:
+            throttled = len(self.server.requests) % 2 == 1 and len(self.server.requests) < 6
+        if not throttled:
+            super().do_POST()
+            return
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with self.server.lock:
+            self.server.requests.append(body)
+        self.send_response(429)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+class UnavailableHandler(GatewayHandler):
+    def do_POST(self) -> None:
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with self.server.lock:
+            self.server.requests.append(body)
+        self.send_response(503)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+@pytest.fixture
+def unavailable_gateway() -> Generator[StandInGateway, None, None]:
+    yield from run_gateway(StandInGateway(UnavailableHandler))
+
+
+@pytest.fixture
+def throttling_gateway() -> Generator[StandInGateway, None, None]:
+    yield from run_gateway(StandInGateway(ThrottlingHandler))
+
+
+@pytest.fixture
+def closing_gateway() -> Generator[StandInGateway, None, None]:
+    yield from run_gateway(StandInGateway(ClosingHandler))
+
+
+def make_messages(count: int) -> list[SMSMessage]:
+    return [SMSMessage("+12345678901", f"+1987654{index:04d}", "Hello") for index in range(count)]
+
+
+def echoed_recipients(results: list[PipelineResult]) -> list[str]:
+    assert all(isinstance(result, HTTPResponse) for result in results)
+    return [json.loads(result.body)["echo"]["recipient"] for result in results if isinstance(result, HTTPResponse)]
+
+
+class TestPipeline:
+    def test_responses_in_request_order_over_one_connection(self, gateway: StandInGateway) -> None:
+        messages = make_messages(20)
+        results = Pipeline(gateway.url, depth=8, pool=ConnectionPool()).post(messages)
+
+        assert all(isinstance(result, HTTPResponse) and result.status_code == 200 for result in results)
+        assert echoed_recipients(results) == [message.recipient for message in messages]
+        assert gateway.connections == 1
+
+    def test_connection_returned_to_pool(self, gateway: StandInGateway) -> None:
+        pool = ConnectionPool()
+        Pipeline(gateway.url, depth=4, pool=pool).post(make_messages(6))
+
+        host, port = gateway.server_address[:2]
+        assert pool.idle_count(str(host), int(port)) == 1
+
+    def test_falls_back_to_serial_when_server_closes(self, closing_gateway: StandInGateway) -> None:
+        messages = make_messages(5)
+        results = Pipeline(closing_gateway.url, depth=5, pool=ConnectionPool()).post(messages)
+
+        assert echoed_recipients(results) == [message.recipient for message in messages]
+        assert closing_gateway.connections == 5
+        assert len(closing_gateway.requests) == 5
+
+    def test_retryable_responses_follow_retry_policy(self, throttling_gateway: StandInGateway) -> None:
+        messages = make_messages(6)
+        policy = RetryPolicy(max_attempts=3, rng=lambda: 0.0)
+        with mock.patch.object(Request, "retry_policy", policy), mock.patch("app.http_client.pipeline.time.sleep"):
+            results = Pipeline(throttling_gateway.url, depth=6, pool=ConnectionPool()).post(messages)
+
+        assert echoed_recipients(results) == [message.recipient for message in messages]
+        assert len(throttling_gateway.requests) == 9
+
+    def test_attempts_match_serial_sends(self, unavailable_gateway: StandInGateway) -> None:
+        policy = RetryPolicy(max_attempts=3, rng=lambda: 0.0)
+        with (
+            mock.patch.object(Request, "retry_policy", policy),
+            mock.patch("app.http_client.pipeline.time.sleep"),
+            mock.patch("app.http_client.request.time.sleep"),
+        ):
+            Request.post(unavailable_gateway.url, body=make_messages(1)[0], pool=ConnectionPool())
+            serial = len(unavailable_gateway.requests)
+            results = Pipeline(unavailable_gateway.url, depth=4, pool=ConnectionPool()).post(make_messages(4))
+
+        assert serial == 3
+        assert len(unavailable_gateway.requests) - serial == 4 * 3
+        assert all(isinstance(result, HTTPResponse) and result.status_code == 503 for result in results)
+
+    def test_retryable_responses_kept_without_policy(self, throttling_gateway: StandInGateway) -> None:
+        results = Pipeline(throttling_gateway.url, depth=6, pool=ConnectionPool()).post(make_messages(6))
+
+        assert [result.status_code for result in results if isinstance(result, HTTPResponse)] == [200, 429] * 3
+
+    def test_serial_resend_keeps_idempotency_key(self, closing_gateway: StandInGateway) -> None:
+        bodies = [{"recipient": f"+1987654{index:04d}"} for index in range(4)]
+        keys: dict[str, list[str]] = {}
+        build_request = Request.build_request
+
+        def recording_build(*args: Any, **kwargs: Any) -> Any:
+            built = build_request(*args, **kwargs)
+            keys.setdefault(kwargs["body"]["recipient"], []).append(built[0].headers["Idempotency-Key"])
+            return built
+
+        with mock.patch.object(Request, "build_request", recording_build):
+            Pipeline(closing_gateway.url, depth=4, pool=ConnectionPool()).post(bodies)
+
+        # The first is answered on the pipelined connection; the rest are resent under the key they went out with.
+        assert [len(keys[body["recipient"]]) for body in bodies] == [1, 2, 2, 2]
+        assert all(len(set(body_keys)) == 1 for body_keys in keys.values())
+        assert len({body_keys[0] for body_keys in keys.values()}) == 4
+
+    def test_unreachable_gateway(self) -> None:
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+
+        results = Pipeline(f"http://127.0.0.1:{port}/send_sms", pool=ConnectionPool()).post(make_messages(2))
+
+        assert all(isinstance(result, NetworkError) for result in results)
+
+    def test_invalid_bodies_are_reported(self, gateway: StandInGateway) -> None:
+        results = Pipeline(gateway.url, pool=ConnectionPool()).post([{"bad": object()}, make_messages(1)[0]])
+
+        assert not isinstance(results[0], HTTPResponse)
+        assert isinstance(results[1], HTTPResponse)
+        assert len(gateway.requests) == 1
+
+    def test_invalid_depth(self) -> None:
+        with pytest.raises(ValueError):
+            Pipeline("http://example.com", depth=0)
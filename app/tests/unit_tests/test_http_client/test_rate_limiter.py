@@ -0,0 +1,97 @@
+from datetime import datetime, timezone
+from typing import Any, Optional
+from unittest import mock
+
+import pytest
+
+from app.exceptions import ConfigError
+from app.http_client.rate_limiter import RateLimiter, TokenBucket, parse_retry_after
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTokenBucket:
+    def test_burst_then_rate(self) -> None:
+        clock = FakeClock()
+        bucket = TokenBucket(rate=10, burst=3, clock=clock)
+
+        assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert bucket.reserve() == pytest.approx(0.1)
+        assert bucket.reserve() == pytest.approx(0.2)
+
+    def test_refill_is_capped_by_burst(self) -> None:
+        clock = FakeClock()
+        bucket = TokenBucket(rate=10, burst=2, clock=clock)
+        bucket.reserve()
+        clock.now += 60
+
+        assert [bucket.reserve() for _ in range(2)] == [0.0, 0.0]
+        assert bucket.reserve() > 0
+
+    def test_pause_delays_next_reservation(self) -> None:
+        clock = FakeClock()
+        bucket = TokenBucket(rate=10, burst=5, clock=clock)
+        bucket.pause(2.0)
+
+        assert bucket.reserve() == pytest.approx(2.1)
+        clock.now += 2.1
+        assert bucket.reserve() == pytest.approx(0.1)
+
+    def test_acquire_sleeps_for_delay(self) -> None:
+        bucket = TokenBucket(rate=10, burst=1, clock=FakeClock())
+        with mock.patch("app.http_client.rate_limiter.time.sleep") as sleep:
+            bucket.acquire()
+            bucket.acquire()
+
+        sleep.assert_called_once_with(pytest.approx(0.1))
+
+    @pytest.mark.parametrize("rate, burst", [(0, None), (-1, None), (10, 0.5)])
+    def test_invalid_settings(self, rate: float, burst: Optional[float]) -> None:
+        with pytest.raises(ValueError):
+            TokenBucket(rate, burst)
+
+
+class TestRateLimiter:
+    def test_buckets_are_per_account(self) -> None:
+        limiter = RateLimiter(rate=1, burst=1, clock=FakeClock())
+
+        assert limiter.reserve("first") == 0.0
+        assert limiter.reserve("second") == 0.0
+        assert limiter.reserve("first") == pytest.approx(1.0)
+
+    def test_share_splits_rate_and_burst(self) -> None:
+        limiter = RateLimiter(rate=50, burst=3).share(4)
+
+        assert (limiter.rate, limiter.burst) == (12.5, 1.0)
+        assert RateLimiter(rate=50).share(4).burst is None
+
+    def test_from_config(self) -> None:
+        limiter = RateLimiter.from_config({"rate": 50, "burst": 100})
+        assert limiter is not None
+        assert (limiter.rate, limiter.burst) == (50.0, 100.0)
+
+    def test_from_config_disabled(self) -> None:
+        assert RateLimiter.from_config(None) is None
+        assert RateLimiter.from_config({}) is None
+
+    @pytest.mark.parametrize("options", [{"burst": 10}, {"rate": "fast"}, {"rate": 0}])
+    def test_from_config_invalid(self, options: dict[str, Any]) -> None:
+        with pytest.raises(ConfigError):
+            RateLimiter.from_config(options)
+
+
+class TestParseRetryAfter:
+    @pytest.mark.parametrize("value, expected", [("5", 5.0), (" 0 ", 0.0), (None, None), ("", None), ("soon", None)])
+    def test_seconds(self, value: Optional[str], expected: Optional[float]) -> None:
+        assert parse_retry_after(value) == expected
+
+    def test_http_date(self) -> None:
+        now = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+        assert parse_retry_after("Mon, 01 Jan 2024 12:00:30 GMT", now) == 30.0
+        assert parse_retry_after("Mon, 01 Jan 2024 11:00:00 GMT", now) == 0.0
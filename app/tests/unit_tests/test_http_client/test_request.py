@@ -1,11 +1,17 @@
+import re
 import socket
+from typing import Callable, Generator
 from unittest import mock
 
 import pytest
 
 from app.exceptions import HTTPRequestError, NetworkError, SerializationError, ValidationError
+from app.http_client.rate_limiter import RateLimiter
 from app.http_client.request import Request
-from app.http_client.schemas import HTTPBody
+from app.http_client.retry import RetryPolicy
+from app.http_client.schemas import HTTPBody, SMSMessage
+
+FakeSocketFactory = Callable[..., mock.MagicMock]
 
 
 class TestRequest:
@@ -61,6 +67,10 @@ class TestRequest:
         assert headers["Content-Type"] == "text/plain"
         assert headers["Content-Length"] == str(len(result))
 
+    def test_prepare_body_utf8_content_length(self) -> None:
+        result, headers = Request.prepare_body({"message": "Привет"})
+        assert headers["Content-Length"] == str(len(result.encode()))
+
     def test_prepare_body_invalid(self) -> None:
         body = None
         with pytest.raises(ValidationError, match="Unsupported body type"):
@@ -71,10 +81,9 @@ class TestRequest:
         with pytest.raises(SerializationError, match="Error serializing body to JSON"):
             Request.prepare_body(body)
 
-    def test_post_success(self, mock_create_connection: mock.MagicMock) -> None:
-        mock_socket = mock.Mock()
-        mock_socket.recv.return_value = b"HTTP/1.1 200 OK\r\nContent-Length: 12\r\n\r\nBody content"
-        mock_create_connection.return_value.__enter__.return_value = mock_socket
+    def test_post_success(self, mock_create_connection: mock.MagicMock, fake_socket: FakeSocketFactory) -> None:
+        mock_socket = fake_socket(b"HTTP/1.1 200 OK\r\nContent-Length: 12\r\n\r\nBody content")
+        mock_create_connection.return_value = mock_socket
 
         response = Request.post("http://example.com", body="Test message")
         assert response.start_line == "HTTP/1.1 200 OK"
@@ -97,11 +106,181 @@ class TestRequest:
         with pytest.raises(HTTPRequestError):
             Request.post("http://example.com", body="Test message")
 
-    def test_get_success(self, mock_create_connection: mock.MagicMock) -> None:
-        mock_socket = mock.Mock()
-        mock_socket.recv.return_value = b"HTTP/1.1 200 OK\r\n\r\n"
-        mock_create_connection.return_value.__enter__.return_value = mock_socket
+    def test_get_success(self, mock_create_connection: mock.MagicMock, fake_socket: FakeSocketFactory) -> None:
+        mock_socket = fake_socket(b"HTTP/1.1 200 OK\r\n\r\n")
+        mock_create_connection.return_value = mock_socket
 
         response = Request.method("GET", "http://example.com")
         assert response.start_line == "HTTP/1.1 200 OK"
         assert response.body == ""
+
+    def test_connection_returned_to_pool(
+        self, mock_create_connection: mock.MagicMock, fake_socket: FakeSocketFactory
+    ) -> None:
+        mock_socket = fake_socket(b"HTTP/1.1 200 OK\r\nContent-Length: 0\r\n\r\n")
+        mock_create_connection.return_value = mock_socket
+
+        Request.method("GET", "http://example.com")
+        assert Request.pool.idle_count("example.com", 80) == 1
+        mock_socket.close.assert_not_called()
+
+    def test_connection_close_response_not_pooled(
+        self, mock_create_connection: mock.MagicMock, fake_socket: FakeSocketFactory
+    ) -> None:
+        mock_socket = fake_socket(b"HTTP/1.1 200 OK\r\nConnection: close\r\nContent-Length: 0\r\n\r\n")
+        mock_create_connection.return_value = mock_socket
+
+        Request.method("GET", "http://example.com")
+        assert Request.pool.idle_count("example.com", 80) == 0
+        mock_socket.close.assert_called_once()
+
+    def test_request_sends_keep_alive(
+        self, mock_create_connection: mock.MagicMock, fake_socket: FakeSocketFactory
+    ) -> None:
+        mock_socket = fake_socket(b"HTTP/1.1 200 OK\r\nContent-Length: 0\r\n\r\n")
+        mock_create_connection.return_value = mock_socket
+
+        Request.post("http://example.com", body="Test message")
+        assert b"Connection: keep-alive" in mock_socket.sent
+
+    def test_response_split_across_segments(
+        self, mock_create_connection: mock.MagicMock, fake_socket: FakeSocketFactory
+    ) -> None:
+        body = b"x" * 10000
+        head = b"HTTP/1.1 200 OK\r\nContent-Length: 10000\r\n\r\n"
+        mock_create_connection.return_value = fake_socket(head[:10], head[10:] + body[:100], body[100:])
+
+        response = Request.post("http://example.com", body="Test message")
+        assert response.body == body.decode()
+
+    def test_chunked_response(self, mock_create_connection: mock.MagicMock, fake_socket: FakeSocketFactory) -> None:
+        mock_create_connection.return_value = fake_socket(
+            b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n5\r\nHello\r\n6\r\n world\r\n0\r\n\r\n"
+        )
+
+        response = Request.post("http://example.com", body="Test message")
+        assert response.body == "Hello world"
+        assert response.headers["Content-Length"] == "11"
+        assert Request.pool.idle_count("example.com", 80) == 1
+
+    def test_close_delimited_response_not_pooled(
+        self, mock_create_connection: mock.MagicMock, fake_socket: FakeSocketFactory
+    ) -> None:
+        mock_create_connection.return_value = fake_socket(b"HTTP/1.1 200 OK\r\n\r\nBody", b" content")
+
+        response = Request.post("http://example.com", body="Test message")
+        assert response.body == "Body content"
+        assert Request.pool.idle_count("example.com", 80) == 0
+
+    def test_no_response_raises_network_error(
+        self, mock_create_connection: mock.MagicMock, fake_socket: FakeSocketFactory
+    ) -> None:
+        mock_create_connection.return_value = fake_socket()
+        with pytest.raises(NetworkError):
+            Request.post("http://example.com", body="Test message")
+
+
+class TestRequestRateLimiting:
+    @pytest.fixture(autouse=True)
+    def limiter(self) -> Generator[mock.MagicMock, None, None]:
+        limiter = mock.MagicMock(spec=RateLimiter)
+        with mock.patch.object(Request, "rate_limiter", limiter):
+            yield limiter
+
+    def test_acquires_token_per_account(
+        self, limiter: mock.MagicMock, mock_create_connection: mock.MagicMock, fake_socket: FakeSocketFactory
+    ) -> None:
+        mock_create_connection.return_value = fake_socket(b"HTTP/1.1 200 OK\r\nContent-Length: 0\r\n\r\n")
+
+        Request.post("http://example.com", auth=("account", "secret"), body="Test message")
+        limiter.acquire.assert_called_once_with("account")
+        limiter.pause.assert_not_called()
+
+    def test_honors_retry_after(
+        self, limiter: mock.MagicMock, mock_create_connection: mock.MagicMock, fake_socket: FakeSocketFactory
+    ) -> None:
+        mock_create_connection.return_value = fake_socket(
+            b"HTTP/1.1 429 Too Many Requests\r\nRetry-After: 3\r\nContent-Length: 0\r\n\r\n"
+        )
+
+        response = Request.post("http://example.com", body="Test message")
+        assert response.status_code == 429
+        limiter.acquire.assert_called_once_with("example.com")
+        limiter.pause.assert_called_once_with("example.com", 3.0)
+
+
+class TestRequestRetries:
+    @pytest.fixture(autouse=True)
+    def policy(self) -> Generator[RetryPolicy, None, None]:
+        policy = RetryPolicy(max_attempts=3, rng=lambda: 0.0)
+        with mock.patch.object(Request, "retry_policy", policy), mock.patch("app.http_client.request.time.sleep"):
+            yield policy
+
+    def test_retries_retryable_status(
+        self, mock_create_connection: mock.MagicMock, fake_socket: FakeSocketFactory
+    ) -> None:
+        mock_create_connection.side_effect = [
+            fake_socket(b"HTTP/1.1 503 Service Unavailable\r\nConnection: close\r\nContent-Length: 0\r\n\r\n"),
+            fake_socket(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok"),
+        ]
+
+        response = Request.post("http://example.com", body="Test message")
+        assert response.status_code == 200
+        assert mock_create_connection.call_count == 2
+
+    def test_retries_network_errors_then_gives_up(self, mock_create_connection: mock.MagicMock) -> None:
+        mock_create_connection.side_effect = ConnectionRefusedError("refused")
+
+        with pytest.raises(NetworkError):
+            Request.post("http://example.com", body="Test message")
+        assert mock_create_connection.call_count == 3
+
+    def test_returns_last_response_when_attempts_exhausted(
+        self, mock_create_connection: mock.MagicMock, fake_socket: FakeSocketFactory
+    ) -> None:
+        mock_create_connection.side_effect = lambda *args, **kwargs: fake_socket(
+            b"HTTP/1.1 500 Internal Server Error\r\nConnection: close\r\nContent-Length: 0\r\n\r\n"
+        )
+
+        response = Request.post("http://example.com", body="Test message")
+        assert response.status_code == 500
+        assert mock_create_connection.call_count == 3
+
+    def test_idempotency_key_is_stable_across_retries(
+        self, mock_create_connection: mock.MagicMock, fake_socket: FakeSocketFactory
+    ) -> None:
+        sockets = [
+            fake_socket(b"HTTP/1.1 502 Bad Gateway\r\nConnection: close\r\nContent-Length: 0\r\n\r\n"),
+            fake_socket(b"HTTP/1.1 200 OK\r\nContent-Length: 0\r\n\r\n"),
+        ]
+        mock_create_connection.side_effect = list(sockets)
+        message = SMSMessage("+12345678901", "+19876543210", "Hello")
+
+        Request.post("http://example.com", body=message)
+        payloads = [bytes(sock.sent) for sock in sockets]
+        expected = f"Idempotency-Key: {message.idempotency_key()}".encode()
+        assert all(expected in payload for payload in payloads)
+
+    def test_text_body_keeps_one_key_across_retries(
+        self, mock_create_connection: mock.MagicMock, fake_socket: FakeSocketFactory
+    ) -> None:
+        sockets = [
+            fake_socket(b"HTTP/1.1 502 Bad Gateway\r\nConnection: close\r\nContent-Length: 0\r\n\r\n"),
+            fake_socket(b"HTTP/1.1 200 OK\r\nContent-Length: 0\r\n\r\n"),
+        ]
+        mock_create_connection.side_effect = list(sockets)
+
+        Request.post("http://example.com", body="Test message")
+        keys = [re.findall(rb"Idempotency-Key: (\w+)", bytes(sock.sent)) for sock in sockets]
+        assert len(keys[0]) == 1 and keys[0] == keys[1]
+
+    def test_identical_messages_get_different_keys(
+        self, mock_create_connection: mock.MagicMock, fake_socket: FakeSocketFactory
+    ) -> None:
+        sockets = [fake_socket(b"HTTP/1.1 200 OK\r\nConnection: close\r\nContent-Length: 0\r\n\r\n") for _ in range(2)]
+        mock_create_connection.side_effect = list(sockets)
+
+        for _ in sockets:
+            Request.post("http://example.com", body=SMSMessage("+12345678901", "+19876543210", "Reminder"))
+        first, second = (re.findall(rb"Idempotency-Key: (\w+)", bytes(sock.sent)) for sock in sockets)
+        assert first != second
@@ -0,0 +1,121 @@
+from typing import Callable
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.exceptions import HTTPResponseError
+from app.http_client.response_reader import BodyFraming, ResponseReader, parse_chunk_size, parse_framing
+
+FakeSocketFactory = Callable[..., MagicMock]
+
+
+class TestParseFraming:
+    @pytest.mark.parametrize(
+        "head, method, expected",
+        [
+            (b"HTTP/1.1 200 OK\r\nContent-Length: 5\r\n\r\n", "GET", BodyFraming(BodyFraming.LENGTH, 5, 200)),
+            (b"HTTP/1.1 200 OK\r\ncontent-length: 5\r\n\r\n", "GET", BodyFraming(BodyFraming.LENGTH, 5, 200)),
+            (b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n", "GET", BodyFraming(BodyFraming.CHUNKED, 0, 200)),
+            (b"HTTP/1.1 200 OK\r\n\r\n", "GET", BodyFraming(BodyFraming.UNTIL_CLOSE, 0, 200)),
+            (b"HTTP/1.1 204 No Content\r\n\r\n", "GET", BodyFraming(BodyFraming.NONE, 0, 204)),
+            (b"HTTP/1.1 200 OK\r\nContent-Length: 5\r\n\r\n", "HEAD", BodyFraming(BodyFraming.NONE, 0, 200)),
+        ],
+    )
+    def test_framing(self, head: bytes, method: str, expected: BodyFraming) -> None:
+        assert parse_framing(head, method) == expected
+
+    @pytest.mark.parametrize(
+        "head", [b"HTTP/1.1 abc OK\r\n\r\n", b"garbage\r\n\r\n", b"HTTP/1.1 200 OK\r\nContent-Length: x\r\n\r\n"]
+    )
+    def test_invalid_head(self, head: bytes) -> None:
+        with pytest.raises(HTTPResponseError):
+            parse_framing(head)
+
+    def test_chunk_size_with_extension(self) -> None:
+        assert parse_chunk_size(b"1a;name=value\r\n") == 26
+
+    def test_invalid_chunk_size(self) -> None:
+        with pytest.raises(HTTPResponseError, match="Invalid chunk size"):
+            parse_chunk_size(b"zz\r\n")
+
+
+class TestResponseReader:
+    def test_read_message_content_length(self, fake_socket: FakeSocketFactory) -> None:
+        message = b"HTTP/1.1 200 OK\r\nContent-Length: 5\r\n\r\nHello"
+        reader = ResponseReader(fake_socket(message[:3], message[3:20], message[20:]), buff_size=8)
+
+        assert reader.read_message() == message
+        assert reader.reusable
+        assert not reader.has_buffered_data
+
+    def test_large_body_read_in_full(self, fake_socket: FakeSocketFactory) -> None:
+        body = bytes(range(256)) * 4096
+        head = b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n" % len(body)
+        reader = ResponseReader(fake_socket(head + body[:1000], body[1000:]))
+
+        assert reader.read_head() == head
+        assert reader.read_body() == body
+
+    def test_iter_body_streams_chunks(self, fake_socket: FakeSocketFactory) -> None:
+        reader = ResponseReader(
+            fake_socket(
+                b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n", b"3\r\nabc\r\n", b"2\r\nde\r\n0\r\n\r\n"
+            )
+        )
+        reader.read_head()
+
+        assert list(reader.iter_body()) == [b"abc", b"de"]
+        assert reader.reusable
+
+    def test_chunked_trailers_are_consumed(self, fake_socket: FakeSocketFactory) -> None:
+        reader = ResponseReader(
+            fake_socket(b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n3\r\nabc\r\n0\r\nX-Trailer: 1\r\n\r\n")
+        )
+
+        assert reader.read_message() == b"HTTP/1.1 200 OK\r\nContent-Length: 3\r\n\r\nabc"
+        assert not reader.has_buffered_data
+
+    def test_close_delimited_body(self, fake_socket: FakeSocketFactory) -> None:
+        reader = ResponseReader(fake_socket(b"HTTP/1.1 200 OK\r\n\r\nab", b"cd"))
+
+        assert reader.read_message() == b"HTTP/1.1 200 OK\r\nContent-Length: 4\r\n\r\nabcd"
+        assert not reader.reusable
+
+    def test_interim_response_skipped(self, fake_socket: FakeSocketFactory) -> None:
+        reader = ResponseReader(fake_socket(b"HTTP/1.1 100 Continue\r\n\r\nHTTP/1.1 204 No Content\r\n\r\n"))
+
+        assert reader.read_message() == b"HTTP/1.1 204 No Content\r\n\r\n"
+
+    def test_head_request_has_no_body(self, fake_socket: FakeSocketFactory) -> None:
+        reader = ResponseReader(fake_socket(b"HTTP/1.1 200 OK\r\nContent-Length: 5\r\n\r\n"))
+
+        assert reader.read_message("HEAD") == b"HTTP/1.1 200 OK\r\nContent-Length: 5\r\n\r\n"
+
+    def test_pipelined_responses_stay_buffered(self, fake_socket: FakeSocketFactory) -> None:
+        first = b"HTTP/1.1 200 OK\r\nContent-Length: 1\r\n\r\na"
+        second = b"HTTP/1.1 201 Created\r\nContent-Length: 1\r\n\r\nb"
+        reader = ResponseReader(fake_socket(first + second))
+
+        assert reader.read_message() == first
+        assert reader.has_buffered_data
+        assert reader.read_message() == second
+
+    def test_truncated_body_raises(self, fake_socket: FakeSocketFactory) -> None:
+        reader = ResponseReader(fake_socket(b"HTTP/1.1 200 OK\r\nContent-Length: 10\r\n\r\nabc"))
+        with pytest.raises(HTTPResponseError, match="body bytes outstanding"):
+            reader.read_message()
+
+    def test_truncated_head_raises(self, fake_socket: FakeSocketFactory) -> None:
+        reader = ResponseReader(fake_socket(b"HTTP/1.1 200 OK\r\nContent-"))
+        with pytest.raises(HTTPResponseError, match="Connection closed"):
+            reader.read_message()
+
+    def test_no_response_raises_connection_error(self, fake_socket: FakeSocketFactory) -> None:
+        reader = ResponseReader(fake_socket())
+        with pytest.raises(ConnectionResetError):
+            reader.read_message()
+
+    def test_oversized_head_raises(self, fake_socket: FakeSocketFactory) -> None:
+        reader = ResponseReader(fake_socket(b"HTTP/1.1 200 OK\r\n" + b"X-Padding: " + b"a" * 70000))
+        with pytest.raises(HTTPResponseError, match="exceeds"):
+            reader.read_message()
@@ -0,0 +1,84 @@
+from typing import Any, Optional
+
+import pytest
+
+from app.exceptions import ConfigError
+from app.http_client.http_message import HTTPResponse
+from app.http_client.retry import RetryBudget, RetryPolicy
+
+
+def make_policy(**kwargs: Any) -> RetryPolicy:
+    return RetryPolicy(rng=lambda: 1.0, **kwargs)
+
+
+class TestRetryBudget:
+    def test_withdraw_until_empty(self) -> None:
+        budget = RetryBudget(ratio=0.5, min_retries=2)
+
+        assert budget.withdraw()
+        assert budget.withdraw()
+        assert not budget.withdraw()
+
+    def test_deposits_earn_retries(self) -> None:
+        budget = RetryBudget(ratio=0.5, min_retries=0)
+        budget.deposit()
+        assert not budget.withdraw()
+        budget.deposit()
+        assert budget.withdraw()
+
+    def test_balance_is_capped(self) -> None:
+        budget = RetryBudget(ratio=1, min_retries=0, max_balance=3)
+        for _ in range(10):
+            budget.deposit()
+        assert budget.balance == 3
+
+
+class TestRetryPolicy:
+    def test_exponential_backoff_with_cap(self) -> None:
+        policy = make_policy(backoff_base=1, backoff_max=5)
+        assert [policy.backoff(attempt) for attempt in range(1, 6)] == [1, 2, 4, 5, 5]
+
+    def test_full_jitter(self) -> None:
+        policy = RetryPolicy(backoff_base=1, rng=lambda: 0.25)
+        assert policy.backoff(3) == 1.0
+
+    def test_network_error_is_retried_until_max_attempts(self) -> None:
+        policy = make_policy(max_attempts=3, backoff_base=1)
+
+        assert policy.retry_delay(1) == 1
+        assert policy.retry_delay(2) == 2
+        assert policy.retry_delay(3) is None
+
+    @pytest.mark.parametrize("status_code, retried", [(200, False), (400, False), (429, True), (503, True)])
+    def test_retryable_statuses(self, status_code: int, retried: bool) -> None:
+        response = HTTPResponse(status_code, "Status")
+        assert (make_policy().retry_delay(1, response) is not None) is retried
+
+    def test_retry_after_extends_delay(self) -> None:
+        response = HTTPResponse(429, "Too Many Requests", headers={"Retry-After": "7"})
+        assert make_policy(backoff_base=1).retry_delay(1, response) == 7
+
+    def test_retry_after_beyond_cap_gives_up(self) -> None:
+        response = HTTPResponse(503, "Service Unavailable", headers={"Retry-After": "120"})
+        assert make_policy(backoff_max=30).retry_delay(1, response) is None
+
+    def test_exhausted_budget_stops_retries(self) -> None:
+        policy = make_policy(budget=RetryBudget(ratio=0, min_retries=1))
+        assert policy.retry_delay(1) is not None
+        assert policy.retry_delay(1) is None
+
+    def test_from_config(self) -> None:
+        policy = RetryPolicy.from_config({"max_attempts": 5, "backoff_base": 0.1, "retry_statuses": [500]})
+        assert policy is not None
+        assert policy.max_attempts == 5
+        assert policy.backoff_base == 0.1
+        assert policy.retry_statuses == frozenset({500})
+
+    @pytest.mark.parametrize("options", [None, {}])
+    def test_from_config_disabled(self, options: Optional[dict[str, Any]]) -> None:
+        assert RetryPolicy.from_config(options) is None
+
+    @pytest.mark.parametrize("options", [{"max_attempts": 0}, {"backoff_base": "slow"}, {"retry_statuses": ["x"]}])
+    def test_from_config_invalid(self, options: dict[str, Any]) -> None:
+        with pytest.raises(ConfigError):
+            RetryPolicy.from_config(options)
@@ -1,7 +1,10 @@
+import re
+from dataclasses import FrozenInstanceError
+
 import pytest
 
 from app.exceptions import MessageError, PhoneNumberError, SerializationError, ValidationError
-from app.http_client.schemas import HTTPBody, SMSMessage
+from app.http_client.schemas import FrozenSMSMessage, HTTPBody, SMSMessage, field_types
 
 
 class TestSMSMessage:
@@ -10,6 +13,37 @@ class TestSMSMessage:
         assert msg.to_dict() == {"sender": "+12345678901", "recipient": "+19876543210", "message": "Hello!"}
         assert isinstance(msg.to_json(), str)
 
+    def test_slotted(self) -> None:
+        msg = SMSMessage(sender="+12345678901", recipient="+19876543210", message="Hello!")
+        assert not hasattr(msg, "__dict__")
+        msg.to_dict()["message"] = "Changed"
+        assert msg.message == "Hello!"
+
+    def test_frozen_message(self) -> None:
+        msg = FrozenSMSMessage(sender="+12345678901", recipient="+19876543210", message="Hello!")
+        assert msg.to_json() == SMSMessage("+12345678901", "+19876543210", "Hello!").to_json()
+        assert len({msg, FrozenSMSMessage("+12345678901", "+19876543210", "Hello!")}) == 1
+        with pytest.raises(FrozenInstanceError):
+            msg.message = "Changed"  # type: ignore[misc]
+        with pytest.raises(PhoneNumberError):
+            FrozenSMSMessage(sender="123", recipient="+19876543210", message="Hello!")
+
+    def test_idempotency_key_is_per_message(self) -> None:
+        first = SMSMessage(sender="+12345678901", recipient="+19876543210", message="Hello!")
+        same = SMSMessage(sender="+12345678901", recipient="+19876543210", message="Hello!")
+
+        # The same reminder sent twice is two sends, so identical messages get different keys.
+        assert first.idempotency_key() == first.idempotency_key()
+        assert first.idempotency_key() != same.idempotency_key()
+        assert len(first.idempotency_key()) == 32
+        assert first == same
+
+    def test_idempotency_key_can_be_restored(self) -> None:
+        message = FrozenSMSMessage(sender="+12345678901", recipient="+19876543210", message="Hello!")
+        message.set_idempotency_key("a" * 32)
+
+        assert message.idempotency_key() == "a" * 32
+
     @pytest.mark.parametrize(
         "sender, recipient, message, expected_exception",
         [
@@ -29,6 +63,48 @@ class TestSMSMessage:
             SMSMessage(sender=sender, recipient=recipient, message=message)  # type: ignore
 
 
+class TestValidateBatch:
+    def test_reports_every_bad_row(self) -> None:
+        rows = [
+            ("+12345678901", "+19876543210", "Hello"),
+            ("123", "+19876543210", "Hello"),
+            ("+12345678901", "not_a_number", "Hello"),
+            ("+12345678901", "+19876543210", "   "),
+            (12345, "+19876543210", "Hello"),
+            ("+12345678901", "+19876543210", "Bye"),
+        ]
+        senders, recipients, messages = (list(column) for column in zip(*rows))
+
+        report = SMSMessage.validate_batch(senders, recipients, messages)
+
+        assert (report.total, report.valid, report.ok) == (6, 2, False)
+        assert report.invalid_rows == {1, 2, 3, 4}
+        assert report.errors[0] == (1, "Invalid sender phone number: 123")
+        assert report.errors[2] == (3, "Message cannot be empty")
+        assert "Field 'sender' must be of type" in report.errors[3][1]
+
+    def test_matches_single_message_validation(self) -> None:
+        rows = [("+12345678901", "++999", "Test"), ("+12345678901", "+19876543210", "")]
+        report = SMSMessage.validate_batch(*(list(column) for column in zip(*rows)))
+
+        for (index, error), row in zip(report.errors, rows):
+            with pytest.raises((PhoneNumberError, MessageError), match=re.escape(error)):
+                SMSMessage(*row)
+
+    def test_valid_batch(self) -> None:
+        report = SMSMessage.validate_batch(["+12345678901"] * 3, ["+19876543210"] * 3, ["Hi"] * 3)
+        assert report.ok
+        assert report.valid == 3
+
+    def test_columns_must_have_same_length(self) -> None:
+        with pytest.raises(ValueError):
+            SMSMessage.validate_batch(["+12345678901"], [], ["Hi"])
+
+    def test_type_hints_are_cached(self) -> None:
+        assert field_types(SMSMessage) is field_types(SMSMessage)
+        assert set(field_types(SMSMessage)) == {"sender", "recipient", "message"}
+
+
 class TestHTTPBody:
     def test_to_dict(self, http_body: HTTPBody) -> None:
         http_body.sender = "+12345678901"  # type: ignore
@@ -44,6 +120,9 @@ class TestHTTPBody:
         assert isinstance(json_str, str)
         assert '"sender": "+12345678901"' in json_str
 
+    def test_empty_to_json(self, http_body: HTTPBody) -> None:
+        assert http_body.to_json() == "{}"
+
     def test_invalid_to_json(self, http_body: HTTPBody) -> None:
         http_body.sender = object()  # type: ignore
         with pytest.raises(SerializationError):
@@ -0,0 +1,135 @@
+import re
+from typing import Generator
+
+import pytest
+
+from app.batch.columnar import SMSBatch
+from app.exceptions import ConfigError, MessageError, PhoneNumberError
+from app.http_client import segments
+from app.http_client.schemas import FrozenSMSMessage, SMSMessage
+from app.http_client.segments import (
+    GSM7,
+    UCS2,
+    SegmentPolicy,
+    count_segments,
+    fit,
+    segment_counts,
+    transliterate,
+)
+
+
+@pytest.fixture
+def policy() -> Generator[None, None, None]:
+    yield
+    segments.set_policy(None)
+
+
+class TestCountSegments:
+    @pytest.mark.parametrize(
+        "text, encoding, units, count",
+        [
+            ("", GSM7, 0, 0),
+            ("a" * 160, GSM7, 160, 1),
+            ("a" * 161, GSM7, 161, 2),
+            ("a" * 306, GSM7, 306, 2),
+            ("a" * 307, GSM7, 307, 3),
+            ("€" * 80, GSM7, 160, 1),
+            ("€" * 81, GSM7, 162, 2),
+            ("Ваш код: 1234", UCS2, 13, 1),
+            ("я" * 70, UCS2, 70, 1),
+            ("я" * 71, UCS2, 71, 2),
+            ("🙂" * 35, UCS2, 70, 1),
+        ],
+    )
+    def test_encoding_and_count(self, text: str, encoding: str, units: int, count: int) -> None:
+        assert count_segments(text) == segments.SegmentInfo(encoding, units, count)
+
+    def test_escape_pairs_are_not_split(self) -> None:
+        # 152 septets leave one free in the first part, too few for "{".
+        assert count_segments("a" * 152 + "{" + "a" * 152).segments == 3
+        assert count_segments("a" * 66 + "🙂" + "я" * 67).segments == 3
+
+    def test_segment_counts(self) -> None:
+        assert segment_counts(["Hi", "я" * 71, "Hi"]) == [1, 2, 1]
+
+
+class TestTransliterate:
+    def test_cyrillic_and_punctuation(self) -> None:
+        assert transliterate("Ваш код — «Щука» № 5…") == 'Vash kod - "Shchuka" No 5...'
+
+    def test_accents_outside_gsm_are_dropped(self) -> None:
+        assert transliterate("ça été") == "ca été"
+
+    def test_gsm_text_is_unchanged(self) -> None:
+        text = "Hello {name}!"
+        assert transliterate(text) is text
+
+
+class TestFit:
+    def test_trims_to_budget(self) -> None:
+        text = "Привет " * 40
+
+        trimmed = fit(text, 2)
+
+        assert count_segments(trimmed).segments == 2
+        assert text.startswith(trimmed)
+        assert count_segments(text[: len(trimmed) + 1]).segments == 3
+
+    def test_short_text_is_unchanged(self) -> None:
+        assert fit("Hi", 1) == "Hi"
+
+
+class TestSegmentPolicy:
+    def test_from_config(self) -> None:
+        assert SegmentPolicy.from_config({"max_segments": 2, "trim": True}) == SegmentPolicy(2, trim=True)
+        assert SegmentPolicy.from_config(None) is None
+
+    @pytest.mark.parametrize("options", [{"max_segments": 0}, {"max_segments": "many"}, {"trim": True}])
+    def test_from_config_invalid(self, options: dict[str, object]) -> None:
+        with pytest.raises(ConfigError):
+            SegmentPolicy.from_config(options)
+
+    def test_message_over_budget_is_rejected(self, policy: None) -> None:
+        segments.set_policy(SegmentPolicy(max_segments=1))
+
+        with pytest.raises(MessageError, match="2 segments"):
+            SMSMessage("+12345678901", "+19876543210", "я" * 71)
+
+    def test_batch_validation_applies_budget(self, policy: None) -> None:
+        segments.set_policy(SegmentPolicy(max_segments=1, transliterate=True))
+        rows = [
+            ("+12345678901", "+19876543210", "a" * 200),
+            ("+12345678901", "+19876543210", "Привет"),
+            ("+12345678901", "bad", "a" * 200),
+            ("+12345678901", "+19876543210", "я" * 100),
+            ("+12345678901", "+19876543210", "a" * 200),
+        ]
+
+        report = SMSMessage.validate_batch(*(list(column) for column in zip(*rows)))
+
+        assert [index for index, _ in report.errors] == [0, 2, 3, 4]
+        for index, error in report.errors:
+            with pytest.raises((MessageError, PhoneNumberError), match=re.escape(error)):
+                SMSMessage(*rows[index])
+        assert SMSMessage(*rows[1]).message == "Privet"
+
+    def test_columnar_batch_skips_rows_over_budget(self, policy: None) -> None:
+        segments.set_policy(SegmentPolicy(max_segments=1))
+
+        batch, report = SMSBatch.from_columns(["+12345678901"] * 2, ["+19876543210"] * 2, ["a" * 200, "Hi"])
+
+        assert report.invalid_rows == {0}
+        assert [message.message for message in batch] == ["Hi"]
+
+    def test_batch_validation_with_trim_rejects_nothing(self, policy: None) -> None:
+        segments.set_policy(SegmentPolicy(max_segments=1, trim=True))
+
+        assert SMSMessage.validate_batch(["+12345678901"], ["+19876543210"], ["a" * 500]).ok
+
+    def test_message_is_adjusted(self, policy: None) -> None:
+        segments.set_policy(SegmentPolicy(max_segments=1, transliterate=True, trim=True))
+
+        message = FrozenSMSMessage("+12345678901", "+19876543210", "Привет, " + "я" * 200)
+
+        assert message.message.startswith("Privet, yaya")
+        assert message.segment_info() == segments.SegmentInfo(GSM7, 160, 1)
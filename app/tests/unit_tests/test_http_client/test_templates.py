@@ -0,0 +1,76 @@
+import json
+from typing import Any
+
+import pytest
+
+from app.exceptions import MessageError, PhoneNumberError, TemplateError
+from app.http_client.schemas import SMSMessage
+from app.http_client.templates import MessageTemplate
+
+
+class TestCompile:
+    def test_placeholders(self) -> None:
+        template = MessageTemplate("{name}, {code} is your code, {name}")
+
+        assert template.placeholders == ("name", "code")
+
+    @pytest.mark.parametrize("text", ["Hi {name", "Hi {}", "Hi {0}", "Hi {user.name}", "{code:>6}", "{name!r}", "  "])
+    def test_invalid_templates(self, text: str) -> None:
+        with pytest.raises(TemplateError):
+            MessageTemplate(text)
+
+    def test_check_names(self) -> None:
+        template = MessageTemplate("Hi {name}, code {code}")
+        template.check(["recipient", "name", "code"])
+
+        with pytest.raises(TemplateError, match="code"):
+            template.check(["recipient", "name"])
+
+
+class TestRender:
+    @pytest.mark.parametrize(
+        "text, variables",
+        [
+            ("Hi {name}, your code is {code}", {"name": "Anna", "code": 1234}),
+            ('Код "{code}" — 100% {{literal}}\n', {"code": 'a"b\\c'}),
+            ("{greeting}", {"greeting": "Привет\t🙂"}),
+        ],
+    )
+    def test_body_matches_sms_message(self, text: str, variables: dict[str, Any]) -> None:
+        message = MessageTemplate(text, sender="+12345678901").render("+19876543210", variables)
+        expected = SMSMessage("+12345678901", "+19876543210", text.format(**variables))
+
+        assert message.to_dict() == expected.to_dict()
+        assert message.to_json() == expected.to_json()
+        assert json.loads(message.to_json())["message"] == expected.message
+
+    def test_sender_per_row(self) -> None:
+        template = MessageTemplate("Hi {name}", sender="+12345678901")
+
+        message = template.render("+19876543210", {"name": "Anna"}, sender="+10000000000")
+
+        assert json.loads(message.to_json())["sender"] == "+10000000000"
+
+    def test_missing_variables(self) -> None:
+        template = MessageTemplate("Hi {name}, code {code}", sender="+12345678901")
+
+        with pytest.raises(TemplateError, match="code"):
+            template.render("+19876543210", {"name": "Anna", "code": None})
+
+    def test_rendered_message_is_validated(self) -> None:
+        template = MessageTemplate("{name}", sender="+12345678901")
+
+        with pytest.raises(PhoneNumberError):
+            template.render("oops", {"name": "Anna"})
+        with pytest.raises(MessageError):
+            template.render("+19876543210", {"name": " "})
+
+    def test_render_rows_is_lazy(self) -> None:
+        template = MessageTemplate("Hi {name}", sender="+12345678901")
+        rows = iter([{"recipient": "+19876543210", "name": "Anna"}, {"recipient": "oops", "name": "Boris"}])
+
+        messages = template.render_rows(rows)
+
+        assert next(messages).message == "Hi Anna"
+        with pytest.raises(PhoneNumberError):
+            next(messages)
@@ -0,0 +1,92 @@
+import asyncio
+import json
+import ssl
+from pathlib import Path
+from typing import Any, Generator
+from unittest import mock
+
+import pytest
+
+from app.exceptions import ConfigError, NetworkError
+from app.http_client.async_request import AsyncRequest
+from app.http_client.connection_pool import ConnectionPool
+from app.http_client.http_message import HTTPRequest
+from app.http_client.request import Request
+from app.http_client.response_reader import ResponseReader
+from app.http_client.schemas import SMSMessage
+from app.http_client.tls import TLSConfig, create_ssl_context
+from app.tests.conftest import StandInGateway
+
+
+@pytest.fixture
+def trusted(tls_certificate: tuple[str, str]) -> Generator[TLSConfig, None, None]:
+    config = TLSConfig(cafile=tls_certificate[0])
+    with mock.patch.object(Request, "tls_config", config):
+        yield config
+
+
+def round_trip(pool: ConnectionPool, gateway: StandInGateway, context: ssl.SSLContext) -> bool:
+    conn = pool.acquire("localhost", gateway.server_address[1], context)
+    request = HTTPRequest("POST", "localhost", "/send_sms", body="{}")
+    conn.sock.sendall(request.to_bytes())
+    ResponseReader(conn.sock).read_message()
+    resumed: bool = conn.sock.session_reused  # type: ignore[attr-defined]
+    pool.release(conn)
+    return resumed
+
+
+class TestTLSConfig:
+    def test_defaults(self) -> None:
+        assert TLSConfig.from_config(None) == TLSConfig()
+
+    def test_from_config(self) -> None:
+        config = TLSConfig.from_config({"cafile": "ca.pem", "certfile": "client.pem", "keyfile": "client.key"})
+        assert config == TLSConfig(cafile="ca.pem", certfile="client.pem", keyfile="client.key")
+
+    @pytest.mark.parametrize("options", [{"ca": "ca.pem"}, {"keyfile": "client.key"}])
+    def test_invalid_config(self, options: dict[str, Any]) -> None:
+        with pytest.raises(ConfigError):
+            TLSConfig.from_config(options)
+
+
+class TestCreateSSLContext:
+    def test_context_is_cached(self) -> None:
+        assert create_ssl_context(TLSConfig()) is create_ssl_context(TLSConfig())
+
+    def test_verify_disabled(self) -> None:
+        context = create_ssl_context(TLSConfig(verify=False))
+        assert context.verify_mode == ssl.CERT_NONE
+        assert not context.check_hostname
+
+    def test_missing_ca_bundle(self, tmp_path: Path) -> None:
+        with pytest.raises(ConfigError, match="Failed to load TLS certificates"):
+            create_ssl_context(TLSConfig(cafile=str(tmp_path / "missing.pem")))
+
+
+class TestHTTPSRequests:
+    def test_post_over_tls(self, tls_gateway: StandInGateway, trusted: TLSConfig) -> None:
+        message = SMSMessage("+12345678901", "+19876543210", "Hello")
+
+        first = Request.post(tls_gateway.url, body=message)
+        second = Request.post(tls_gateway.url, body=message)
+
+        assert first.status_code == second.status_code == 200
+        assert json.loads(first.body)["echo"]["recipient"] == "+19876543210"
+        assert tls_gateway.connections == 1
+
+    def test_untrusted_certificate(self, tls_gateway: StandInGateway) -> None:
+        with pytest.raises(NetworkError):
+            Request.post(tls_gateway.url, body="Test message")
+
+    def test_session_resumption_across_connections(self, tls_gateway: StandInGateway, trusted: TLSConfig) -> None:
+        pool = ConnectionPool()
+        context = create_ssl_context(trusted)
+
+        assert not round_trip(pool, tls_gateway, context)
+        pool.clear()
+        assert round_trip(pool, tls_gateway, context)
+        pool.clear()
+
+    def test_async_post_over_tls(self, tls_gateway: StandInGateway, trusted: TLSConfig) -> None:
+        response = asyncio.run(AsyncRequest.post(tls_gateway.url, body="{}"))
+        assert response.status_code == 200
@@ -0,0 +1,23 @@
+from app.http_client.tracing import SendTrace, current_trace, trace_send
+
+
+class TestTraceSend:
+    def test_trace_is_active_inside_block(self) -> None:
+        assert current_trace() is None
+
+        with trace_send() as trace:
+            assert current_trace() is trace
+
+        assert current_trace() is None
+        assert trace.total > 0
+
+    def test_nested_traces_restore_outer(self) -> None:
+        with trace_send() as outer:
+            with trace_send():
+                pass
+            assert current_trace() is outer
+
+    def test_retries(self) -> None:
+        assert SendTrace().retries == 0
+        assert SendTrace(attempts=1).retries == 0
+        assert SendTrace(attempts=3).retries == 2
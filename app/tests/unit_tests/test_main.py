@@ -0,0 +1,60 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[3]
+DEFERRED_MODULES = (
+    "rich",
+    "toml",
+    "ssl",
+    "concurrent.futures",
+    "csv",
+    "email.utils",
+    "logging",
+    "app.http_client.request",
+)
+
+
+def run_python(*args: str, cwd: Path = ROOT) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=cwd,
+        env={**os.environ, "PYTHONPATH": str(ROOT)},
+        capture_output=True,
+        text=True,
+        timeout=30,
+    )
+
+
+class TestStartup:
+    def test_import_defers_heavy_modules(self) -> None:
+        result = run_python("-c", f"import sys, app.main; print([m for m in {DEFERRED_MODULES!r} if m in sys.modules])")
+
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == "[]"
+
+    def test_help_works_without_config(self, tmp_path: Path) -> None:
+        result = run_python("-m", "app.main", "--help", cwd=tmp_path)
+
+        assert result.returncode == 0, result.stderr
+        assert "--plain" in result.stdout
+        assert not (tmp_path / "sms-log.log").exists()
+
+    @pytest.mark.parametrize("module", ["app.utils.logging", "app.http_client.request"])
+    def test_import_has_no_logging_side_effects(self, module: str, tmp_path: Path) -> None:
+        result = run_python("-c", f"import {module}", cwd=tmp_path)
+
+        assert result.returncode == 0, result.stderr
+        assert list(tmp_path.iterdir()) == []
+
+    def test_thin_client_defers_heavy_modules(self) -> None:
+        script = (
+            f"import sys, app.main, app.daemon.client; print([m for m in {DEFERRED_MODULES!r} if m in sys.modules])"
+        )
+        result = run_python("-c", script)
+
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == "[]"
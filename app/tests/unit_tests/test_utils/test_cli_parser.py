@@ -72,3 +72,83 @@ class TestParseArguments:
         with patch.object(sys, "argv", test_args):
             with pytest.raises(SystemExit):
                 parse_arguments()
+
+    def test_batch_mode_without_single_message_args(self) -> None:
+        with patch.object(sys, "argv", ["script.py", "--batch", "messages.csv", "--concurrency", "4"]):
+            args = parse_arguments()
+
+        assert args.batch == "messages.csv"
+        assert args.output == "sms-results.jsonl"
+        assert args.concurrency == 4
+        assert args.pipeline == 1
+
+    def test_invalid_concurrency(self) -> None:
+        with patch.object(sys, "argv", ["script.py", "--batch", "messages.csv", "--concurrency", "0"]):
+            with pytest.raises(SystemExit):
+                parse_arguments()
+
+    def test_plain_flag(self) -> None:
+        with patch.object(sys, "argv", ["script.py", "--batch", "messages.csv", "--plain"]):
+            assert parse_arguments().plain is True
+
+    def test_pipeline_depth(self) -> None:
+        with patch.object(sys, "argv", ["script.py", "--batch", "messages.csv", "--pipeline", "16"]):
+            assert parse_arguments().pipeline == 16
+
+        with patch.object(sys, "argv", ["script.py", "--batch", "messages.csv", "--pipeline", "0"]):
+            with pytest.raises(SystemExit):
+                parse_arguments()
+
+    def test_workers(self) -> None:
+        with patch.object(sys, "argv", ["script.py", "--batch", "messages.csv", "--workers", "4"]):
+            assert parse_arguments().workers == 4
+
+        for extra in (["--workers", "0"], ["--workers", "2", "--queue", "queue.db"]):
+            with patch.object(sys, "argv", ["script.py", "--batch", "messages.csv", *extra]):
+                with pytest.raises(SystemExit):
+                    parse_arguments()
+
+    def test_template_requires_batch(self) -> None:
+        argv = ["script.py", "--sender", "+12345678901", "--recipient", "+19876543210", "--message", "Hi"]
+        with patch.object(sys, "argv", [*argv, "--template", "Hi {name}"]):
+            with pytest.raises(SystemExit):
+                parse_arguments()
+
+        with patch.object(sys, "argv", ["script.py", "--batch", "messages.csv", "--template", "Hi {name}"]):
+            assert parse_arguments().template == "Hi {name}"
+
+    def test_suppression_options(self) -> None:
+        argv = ["script.py", "--batch", "messages.csv", "--suppress", "optout.idx", "--dedupe"]
+        with patch.object(sys, "argv", argv):
+            args = parse_arguments()
+        assert (args.suppress, args.dedupe) == ("optout.idx", True)
+
+        with patch.object(sys, "argv", ["script.py", "build-suppression", "optout.txt", "optout.idx"]):
+            args = parse_arguments()
+        assert (args.command, args.source, args.index) == ("build-suppression", "optout.txt", "optout.idx")
+
+    def test_serve_without_single_message_args(self) -> None:
+        with patch.object(sys, "argv", ["script.py", "serve", "--socket", "/tmp/sms.sock"]):
+            args = parse_arguments()
+
+        assert args.command == "serve"
+        assert args.socket == "/tmp/sms.sock"
+
+    @pytest.mark.parametrize(
+        "test_args", [["script.py", "--socket", "/x.sock", "serve"], ["script.py", "serve", "--socket", "/x.sock"]]
+    )
+    def test_serve_socket_in_either_position(self, test_args: list[str]) -> None:
+        with patch.object(sys, "argv", test_args):
+            args = parse_arguments()
+
+        assert args.socket == "/x.sock"
+
+    def test_client_socket_and_direct(self) -> None:
+        test_args = ["script.py", "--sender", "+123", "--recipient", "+456", "--message", "test", "--socket", "/x.sock"]
+
+        with patch.object(sys, "argv", test_args):
+            args = parse_arguments()
+
+        assert args.command is None
+        assert args.socket == "/x.sock"
+        assert args.direct is False
@@ -1,6 +1,11 @@
+from typing import Generator
 from unittest.mock import MagicMock
 
-from app.utils.console import print_json_response
+import pytest
+
+from app.batch.results import BatchSummary
+from app.utils import metrics
+from app.utils.console import print_batch_summary, print_json_response, print_metrics_summary
 
 
 class TestPrintResponse:
@@ -41,3 +46,88 @@ class TestPrintResponse:
         mock_console.log.assert_called_once_with("Error: Failed to decode response body as JSON.")
         mock_table = mock_console.print.call_args[0][0]
         assert "{invalid: json}" == next(mock_table.columns[1].cells)
+
+    def test_plain_output(
+        self, mock_console: MagicMock, mock_response: MagicMock, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        print_json_response("Test Title", mock_response(body={"key": "value"}), plain=True)
+
+        mock_console.print.assert_not_called()
+        assert capsys.readouterr().out == '200\n{\n  "key": "value"\n}\n'
+
+    def test_plain_invalid_json(
+        self, mock_console: MagicMock, mock_response: MagicMock, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        print_json_response("Test Title", mock_response(body="oops", is_json=False), plain=True)
+
+        captured = capsys.readouterr()
+        mock_console.log.assert_not_called()
+        assert captured.out == "200\noops\n"
+        assert "Failed to decode" in captured.err
+
+
+class TestPrintBatchSummary:
+    def test_summary_table(self, mock_console: MagicMock) -> None:
+        summary = BatchSummary(
+            total=6, sent=3, failed=1, invalid=1, skipped=1, segments=4, status_codes={500: 1, 200: 3}
+        )
+        print_batch_summary("Batch", summary)
+
+        mock_table = mock_console.print.call_args[0][0]
+        assert mock_table.title == "Batch"
+        assert [column.header for column in mock_table.columns] == [
+            "Total",
+            "Sent",
+            "Failed",
+            "Invalid",
+            "Skipped",
+            "Segments",
+            "Status Codes",
+        ]
+        assert next(mock_table.columns[1].cells) == "3"
+        assert next(mock_table.columns[5].cells) == "4"
+        assert next(mock_table.columns[6].cells) == "200: 3, 500: 1"
+
+    def test_plain_summary(self, mock_console: MagicMock, capsys: pytest.CaptureFixture[str]) -> None:
+        summary = BatchSummary(
+            total=6, sent=3, failed=1, invalid=1, skipped=1, segments=4, status_codes={500: 1, 200: 3}
+        )
+        print_batch_summary("Batch", summary, plain=True)
+
+        mock_console.print.assert_not_called()
+        assert (
+            capsys.readouterr().out
+            == "total=6 sent=3 failed=1 invalid=1 skipped=1 segments=4\nstatus_codes=200:3,500:1\n"
+        )
+
+
+@pytest.fixture
+def recorded_metrics() -> Generator[None, None, None]:
+    metrics.registry.reset()
+    metrics.REQUESTS.inc("200", amount=3)
+    metrics.REQUESTS.inc("500")
+    metrics.REQUEST_LATENCY.observe(0.004)
+    metrics.BYTES_SENT.inc(amount=1200)
+    yield
+    metrics.registry.reset()
+
+
+class TestPrintMetricsSummary:
+    def test_metrics_table(self, mock_console: MagicMock, recorded_metrics: None) -> None:
+        print_metrics_summary("Metrics")
+
+        mock_table = mock_console.print.call_args[0][0]
+        assert mock_table.title == "Metrics"
+        assert [column.header for column in mock_table.columns] == ["Metric", "Value"]
+        rows = dict(zip(mock_table.columns[0].cells, mock_table.columns[1].cells))
+        assert rows["requests"] == "200:3,500:1"
+        assert rows["bytes_sent"] == "1200"
+        assert rows["latency_ms"].endswith("max:4.00")
+
+    def test_plain_metrics(
+        self, mock_console: MagicMock, recorded_metrics: None, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        print_metrics_summary("Metrics", plain=True)
+
+        mock_console.print.assert_not_called()
+        assert capsys.readouterr().out.startswith("requests=200:3,500:1 latency_ms=p50:")
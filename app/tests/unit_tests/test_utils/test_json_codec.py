@@ -0,0 +1,80 @@
+from typing import Generator
+from unittest.mock import patch
+
+import pytest
+
+from app.exceptions import ConfigError
+from app.http_client.schemas import SMSMessage
+from app.utils import json_codec
+from app.utils.json_codec import JSONCodec, OrjsonCodec
+
+try:
+    import orjson  # noqa: F401
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+requires_orjson = pytest.mark.skipif(not HAS_ORJSON, reason="orjson is not installed")
+CODECS = [pytest.param(JSONCodec, id="json"), pytest.param(OrjsonCodec, id="orjson", marks=requires_orjson)]
+
+
+@pytest.fixture(autouse=True)
+def restore_codec() -> Generator[None, None, None]:
+    codec = json_codec.get_codec()
+    yield
+    json_codec.set_codec(codec)
+
+
+class TestJSONCodec:
+    @pytest.mark.parametrize("codec_class", CODECS)
+    def test_round_trip(self, codec_class: type[JSONCodec]) -> None:
+        codec = codec_class()
+        data = {"message": "Привет", "count": 3, "nested": [1, None, True]}
+        assert codec.loads(codec.dumps(data)) == data
+        assert "Привет" in codec.dumps(data)
+        assert codec.loads(codec.pretty(data)) == data
+        assert '\n  "count": 3' in codec.pretty(data)
+
+    @pytest.mark.parametrize("codec_class", CODECS)
+    def test_errors_are_builtin_types(self, codec_class: type[JSONCodec]) -> None:
+        codec = codec_class()
+        with pytest.raises(TypeError):
+            codec.dumps({"value": object()})
+        with pytest.raises(ValueError):
+            codec.loads("{invalid: json}")
+
+    @pytest.mark.parametrize(
+        "options, expected",
+        [
+            (None, JSONCodec),
+            ({"backend": "json"}, JSONCodec),
+            pytest.param({"backend": "orjson"}, OrjsonCodec, marks=requires_orjson),
+        ],
+    )
+    def test_from_config(self, options: dict[str, str], expected: type) -> None:
+        assert type(JSONCodec.from_config(options)) is expected
+
+    def test_from_config_unknown_backend(self) -> None:
+        with pytest.raises(ConfigError, match="Unknown json backend"):
+            JSONCodec.from_config({"backend": "yaml"})
+
+    def test_auto_falls_back_without_orjson(self) -> None:
+        with patch.dict("sys.modules", {"orjson": None}):
+            assert type(JSONCodec.from_config({"backend": "auto"})) is JSONCodec
+            with pytest.raises(ConfigError, match="requires the orjson package"):
+                JSONCodec.from_config({"backend": "orjson"})
+
+    @requires_orjson
+    def test_module_functions_use_selected_codec(self) -> None:
+        json_codec.set_codec(OrjsonCodec())
+        assert json_codec.dumps({"a": 1}) == '{"a":1}'
+        json_codec.set_codec(JSONCodec())
+        assert json_codec.dumps({"a": 1}) == '{"a": 1}'
+
+
+class TestSMSMessageEncoder:
+    @pytest.mark.parametrize("message", ["Hello!", "Привет", 'Quote " and \\ backslash', "Line\nbreak\t\u0001"])
+    def test_matches_generic_encoding(self, message: str) -> None:
+        sms = SMSMessage("+12345678901", "+19876543210", message)
+        assert sms.to_json() == JSONCodec().dumps(sms.to_dict())
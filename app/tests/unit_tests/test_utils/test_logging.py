@@ -0,0 +1,128 @@
+import logging
+import threading
+from pathlib import Path
+from typing import Generator
+
+import pytest
+
+from app.exceptions import ConfigError
+from app.utils import logging as sms_logging
+from app.utils.logging import (
+    DeferredQueueHandler,
+    LogConfig,
+    logger,
+    logger_stopped,
+    reopen_logger,
+    setup_logger,
+    shutdown_logger,
+)
+
+
+@pytest.fixture
+def log_file(tmp_path: Path) -> Generator[Path, None, None]:
+    path = tmp_path / "sms.log"
+    yield path
+    shutdown_logger()
+
+
+class FormattedOn:
+    def __init__(self) -> None:
+        self.thread: str = ""
+
+    def __str__(self) -> str:
+        self.thread = threading.current_thread().name
+        return "value"
+
+
+class TestLogConfig:
+    def test_defaults(self) -> None:
+        assert LogConfig.from_config(None) == LogConfig()
+
+    def test_options(self) -> None:
+        config = LogConfig.from_config({"file": "x.log", "level": "warning", "max_bytes": 1024, "backup_count": 2})
+
+        assert config == LogConfig("x.log", "WARNING", 1024, 2)
+
+    @pytest.mark.parametrize("options", [{"level": "LOUD"}, {"max_bytes": -1}, {"backup_count": -1}])
+    def test_invalid_options(self, options: dict[str, object]) -> None:
+        with pytest.raises(ConfigError):
+            LogConfig.from_config(options)
+
+
+class TestSetupLogger:
+    def test_records_are_written_through_queue(self, log_file: Path) -> None:
+        setup_logger(LogConfig(file=str(log_file)))
+        logger.info("Request: %s", "POST /send_sms HTTP/1.1")
+        shutdown_logger()
+
+        assert "INFO - Request: POST /send_sms HTTP/1.1" in log_file.read_text()
+
+    def test_formatting_happens_on_listener_thread(self, log_file: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        # pytest's own capture handler on the root logger would format the record on this thread.
+        monkeypatch.setattr(logger, "propagate", False)
+        setup_logger(LogConfig(file=str(log_file)))
+        argument = FormattedOn()
+        logger.info("Lazy %s", argument)
+        shutdown_logger()
+
+        assert argument.thread not in ("", threading.current_thread().name)
+        assert "Lazy value" in log_file.read_text()
+
+    def test_level_filters_records(self, log_file: Path) -> None:
+        setup_logger(LogConfig(file=str(log_file), level="WARNING"))
+        argument = FormattedOn()
+        logger.debug("Body: %s", argument)
+        logger.warning("Throttled")
+        shutdown_logger()
+
+        assert argument.thread == ""
+        assert log_file.read_text().strip().endswith("WARNING - Throttled")
+
+    def test_file_rotates_by_size(self, log_file: Path) -> None:
+        setup_logger(LogConfig(file=str(log_file), max_bytes=200, backup_count=2))
+        for index in range(20):
+            logger.info("Record number %d with some padding", index)
+        shutdown_logger()
+
+        assert sorted(path.name for path in log_file.parent.iterdir()) == ["sms.log", "sms.log.1", "sms.log.2"]
+
+    def test_setup_is_idempotent(self, log_file: Path) -> None:
+        setup_logger(LogConfig(file=str(log_file)))
+        setup_logger(LogConfig(file=str(log_file)))
+
+        assert sum(isinstance(handler, DeferredQueueHandler) for handler in logger.handlers) == 1
+
+    def test_nothing_is_written_before_first_record(self, log_file: Path) -> None:
+        setup_logger(LogConfig(file=str(log_file)))
+
+        assert not log_file.exists()
+        assert logger.getEffectiveLevel() == logging.DEBUG
+
+    def test_reopen_keeps_settings(self, log_file: Path) -> None:
+        setup_logger(LogConfig(file=str(log_file), level="INFO"))
+        other = log_file.with_name("worker.log")
+
+        reopen_logger(str(other))
+        logger.info("hello")
+        shutdown_logger()
+
+        assert "hello" in other.read_text()
+        assert not log_file.exists()
+
+    def test_stopped_for_a_fork_and_restarted(self, log_file: Path) -> None:
+        setup_logger(LogConfig(file=str(log_file), level="INFO"))
+
+        with logger_stopped():
+            assert sms_logging._listener is None
+            assert not any(isinstance(handler, DeferredQueueHandler) for handler in logger.handlers)
+        logger.info("after")
+        shutdown_logger()
+
+        assert "after" in log_file.read_text()
+
+    def test_stopped_without_setup_stays_off(self) -> None:
+        shutdown_logger()
+        with logger_stopped():
+            pass
+
+        assert sms_logging._listener is None
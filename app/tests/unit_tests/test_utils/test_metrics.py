@@ -0,0 +1,152 @@
+import asyncio
+import random
+from pathlib import Path
+from typing import Generator
+from unittest import mock
+
+import pytest
+
+from app.exceptions import NetworkError
+from app.http_client.async_request import AsyncRequest
+from app.http_client.connection_pool import ConnectionPool
+from app.http_client.pipeline import Pipeline
+from app.http_client.request import Request
+from app.http_client.retry import RetryPolicy
+from app.http_client.schemas import SMSMessage
+from app.tests.conftest import StandInGateway
+from app.utils import metrics
+from app.utils.metrics import Counter, Histogram, MetricsRegistry, bucket_index, bucket_upper_bound
+
+
+@pytest.fixture
+def clean_registry() -> Generator[MetricsRegistry, None, None]:
+    metrics.registry.reset()
+    yield metrics.registry
+    metrics.registry.reset()
+
+
+class TestBuckets:
+    @pytest.mark.parametrize("value", [0, 1, 127, 128, 255, 256, 1000, 12_345, 10**6, 3_600 * 10**6])
+    def test_value_falls_in_its_bucket(self, value: int) -> None:
+        index = bucket_index(value)
+
+        assert bucket_upper_bound(index - 1) < value <= bucket_upper_bound(index) if index else value == 0
+
+    def test_relative_error_is_bounded(self) -> None:
+        for value in random.Random(1).sample(range(128, 10**9), 1000):
+            assert bucket_upper_bound(bucket_index(value)) - value <= value / 64
+
+
+class TestHistogram:
+    def test_percentiles(self) -> None:
+        histogram = Histogram("latency", "test")
+        for millis in range(1, 1001):
+            histogram.observe(millis / 1000)
+
+        assert histogram.count == 1000
+        assert histogram.percentile(0.5) == pytest.approx(0.5, rel=0.02)
+        assert histogram.percentile(0.99) == pytest.approx(0.99, rel=0.02)
+        assert histogram.percentile(1.0) == histogram.max == 1.0
+
+    def test_empty(self) -> None:
+        assert Histogram("latency", "test").percentile(0.5) == 0.0
+
+
+class TestRegistry:
+    def test_counter_labels(self) -> None:
+        counter = Counter("requests", "test", ["status"])
+        counter.inc("200")
+        counter.inc("200", amount=2)
+
+        assert counter.value("200") == 3
+        assert counter.value("500") == 0
+
+    def test_registering_twice_returns_same_metric(self) -> None:
+        registry = MetricsRegistry()
+
+        assert registry.counter("requests", "test") is registry.counter("requests", "test")
+
+    def test_merge_exported_state(self) -> None:
+        worker, parent = MetricsRegistry(), MetricsRegistry()
+        for registry in (worker, parent):
+            registry.counter("requests", "test", ["status"]).inc("200")
+            registry.histogram("latency", "test").observe(0.5)
+        worker.histogram("latency", "test").observe(2.0)
+
+        parent.merge_state(worker.export_state())
+
+        assert parent.counter("requests", "test", ["status"]).value("200") == 2
+        latency = parent.histogram("latency", "test")
+        assert (latency.count, latency.sum, latency.max) == (3, 3.0, 2.0)
+        assert latency.percentile(0.5) == pytest.approx(0.5, rel=0.02)
+
+    def test_render_prometheus_text(self) -> None:
+        registry = MetricsRegistry()
+        registry.counter("sms_requests_total", "Requests.", ["status"]).inc("200", amount=3)
+        registry.gauge("sms_active", "Active.").inc()
+        registry.histogram("sms_latency_seconds", "Latency.").observe(0.25)
+
+        text = registry.render()
+
+        assert '# TYPE sms_requests_total counter\nsms_requests_total{status="200"} 3\n' in text
+        assert "# TYPE sms_active gauge\nsms_active 1\n" in text
+        assert 'sms_latency_seconds{quantile="0.5"} 0.25' in text
+        assert "sms_latency_seconds_count 1\n" in text
+
+    def test_label_values_are_escaped(self) -> None:
+        registry = MetricsRegistry()
+        registry.counter("errors_total", "Errors.", ["reason"]).inc('say "hi"\n')
+
+        assert 'errors_total{reason="say \\"hi\\"\\n"} 1' in registry.render()
+
+    def test_write_textfile(self, tmp_path: Path) -> None:
+        registry = MetricsRegistry()
+        registry.counter("sms_requests_total", "Requests.").inc()
+        path = tmp_path / "sms.prom"
+
+        registry.write_textfile(str(path))
+
+        assert path.read_text() == registry.render()
+        assert list(tmp_path.iterdir()) == [path]
+
+
+class TestInstrumentation:
+    def test_request_is_recorded(self, clean_registry: MetricsRegistry, gateway: StandInGateway) -> None:
+        message = SMSMessage("+12345678901", "+19876543210", "Hello")
+        pool = ConnectionPool()
+        Request.post(gateway.url, body=message, pool=pool)
+        Request.post(gateway.url, body=message, pool=pool)
+
+        assert metrics.REQUESTS.value("200") == 2
+        assert metrics.REQUEST_LATENCY.count == 2
+        assert metrics.BYTES_SENT.value() > 2 * len(message.to_json())
+        assert metrics.BYTES_RECEIVED.value() > 0
+        assert (metrics.CONNECTIONS_OPENED.value(), metrics.CONNECTIONS_REUSED.value()) == (1, 1)
+        assert metrics.CONNECTIONS_ACTIVE.value() == 0
+
+    def test_async_requests_are_recorded(self, clean_registry: MetricsRegistry, gateway: StandInGateway) -> None:
+        messages = [SMSMessage("+12345678901", f"+1987654{index:04d}", "Hello") for index in range(5)]
+        asyncio.run(AsyncRequest.send_many(gateway.url, messages, concurrency=1))
+
+        assert metrics.REQUESTS.value("200") == 5
+        assert metrics.REQUEST_LATENCY.count == 5
+        assert metrics.BYTES_SENT.value() > sum(len(message.to_json()) for message in messages)
+        assert metrics.BYTES_RECEIVED.value() > 0
+        assert (metrics.CONNECTIONS_OPENED.value(), metrics.CONNECTIONS_REUSED.value()) == (1, 4)
+        assert metrics.CONNECTIONS_ACTIVE.value() == 0
+
+    def test_async_retries_are_recorded(self, clean_registry: MetricsRegistry) -> None:
+        with mock.patch.object(Request, "retry_policy", RetryPolicy(max_attempts=3, rng=lambda: 0.0)):
+            with pytest.raises(NetworkError):
+                asyncio.run(AsyncRequest.post("http://127.0.0.1:1/send_sms", body="Test"))
+
+        assert metrics.REQUESTS.value("error") == 3
+        assert metrics.RETRIES.value() == 2
+
+    def test_pipelined_requests_are_recorded(self, clean_registry: MetricsRegistry, gateway: StandInGateway) -> None:
+        messages = [SMSMessage("+12345678901", f"+1987654{index:04d}", "Hello") for index in range(5)]
+        Pipeline(gateway.url, depth=5, pool=ConnectionPool()).post(messages)
+
+        assert metrics.REQUESTS.value("200") == 5
+        assert metrics.REQUEST_LATENCY.count == 5
+        assert metrics.REQUEST_LATENCY.max > 0
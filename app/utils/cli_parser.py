@@ -1,10 +1,75 @@
 import argparse
 
+from app.daemon.paths import default_socket_path
+
 
 def parse_arguments() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="CLI for sending SMS")
-    parser.add_argument("--sender", required=True, help="Sender phone number")
-    parser.add_argument("--recipient", required=True, help="Recipient phone number")
-    parser.add_argument("--message", required=True, help="SMS message text")
+    parser.add_argument("--sender", help="Sender phone number")
+    parser.add_argument("--recipient", help="Recipient phone number")
+    parser.add_argument("--message", help="SMS message text")
+    parser.add_argument("--batch", metavar="FILE", help="Send every message from a CSV or JSONL file")
+    parser.add_argument(
+        "--output", default="sms-results.jsonl", metavar="FILE", help="JSONL file for batch send results"
+    )
+    parser.add_argument("--concurrency", type=int, default=8, help="Maximum number of batch sends in flight")
+    parser.add_argument("--plain", action="store_true", help="Print plain text instead of rich tables")
+    parser.add_argument(
+        "--pipeline", type=int, default=1, metavar="DEPTH", help="Pipeline up to DEPTH batch requests per connection"
+    )
+    parser.add_argument(
+        "--queue", metavar="FILE", help="Track batch progress in a SQLite queue so an interrupted batch can resume"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1, metavar="N", help="Split a batch by recipient across N sender processes"
+    )
+    parser.add_argument(
+        "--template",
+        metavar="TEXT",
+        help="Build each batch message from TEXT, filling {name} placeholders from the row's fields",
+    )
+    parser.add_argument(
+        "--suppress", metavar="INDEX", help="Skip recipients found in a suppression index built by `build-suppression`"
+    )
+    parser.add_argument("--dedupe", action="store_true", help="Send a batch only once to each recipient number")
+    parser.add_argument("--metrics", metavar="FILE", help="Write Prometheus text-format metrics to FILE when done")
+    parser.add_argument(
+        "--socket", default=default_socket_path(), metavar="PATH", help="Unix socket of a running `serve` daemon"
+    )
+    parser.add_argument("--direct", action="store_true", help="Send directly even if a daemon is listening")
+
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND")
+    serve = commands.add_parser("serve", help="Keep config and gateway connections warm and accept local submissions")
+    # SUPPRESS keeps the subparser from overwriting a --socket given before `serve` with its own default.
+    serve.add_argument(
+        "--socket", default=argparse.SUPPRESS, metavar="PATH", help="Unix socket to accept submissions on"
+    )
+    serve.add_argument(
+        "--metrics-port", type=int, metavar="PORT", help="Serve Prometheus metrics on http://127.0.0.1:PORT/metrics"
+    )
+
+    build = commands.add_parser(
+        "build-suppression", help="Build a suppression index from a file of opted-out numbers, one per line"
+    )
+    build.add_argument("source", metavar="NUMBERS", help="Text file with one phone number per line")
+    build.add_argument("index", metavar="INDEX", help="Index file to write")
+
+    args = parser.parse_args()
+    if args.command is None and args.batch is None:
+        missing = [f"--{name}" for name in ("sender", "recipient", "message") if getattr(args, name) is None]
+        if missing:
+            parser.error(f"the following arguments are required: {', '.join(missing)}")
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if args.pipeline < 1:
+        parser.error("--pipeline must be at least 1")
+    if args.template is not None and args.batch is None:
+        parser.error("--template requires --batch")
+    if (args.suppress is not None or args.dedupe) and args.batch is None:
+        parser.error("--suppress and --dedupe require --batch")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.workers > 1 and args.queue is not None:
+        parser.error("--workers cannot be combined with --queue")
 
-    return parser.parse_args()
+    return args
@@ -1,25 +1,112 @@
-import json
-
-from rich.console import Console
-from rich.table import Table
+import sys
+from typing import TYPE_CHECKING, Optional
 
+from app.batch.results import BatchSummary
 from app.http_client.http_message import HTTPResponse
+from app.utils import json_codec, metrics
+
+if TYPE_CHECKING:
+    from rich.console import Console
+
+_console: Optional["Console"] = None
+
+
+def get_console() -> "Console":
+    # rich is the slowest import of the CLI, so it is only loaded once something is printed with it.
+    global _console
+    if _console is None:
+        from rich.console import Console
+
+        _console = Console()
+    return _console
 
-console = Console()
 
+def print_json_response(title: str, response: HTTPResponse, *, plain: bool = False) -> None:
+    try:
+        formatted_body = json_codec.pretty(json_codec.loads(response.body))
+    except ValueError:
+        formatted_body = response.body
+        if plain:
+            print("Error: Failed to decode response body as JSON.", file=sys.stderr)
+        else:
+            get_console().log("Error: Failed to decode response body as JSON.")
+
+    if plain:
+        print(response.status_code)
+        print(formatted_body)
+        return
+
+    from rich.table import Table
 
-def print_json_response(title: str, response: HTTPResponse) -> None:
     table = Table(title=title, show_header=True, header_style="cyan")
     status_style = "green" if response.status_code < 400 else "red"
     table.add_column("Status Code", style=status_style)
     table.add_column("Response Body", style="yellow")
+    table.add_row(str(response.status_code), formatted_body)
 
-    try:
-        formatted_body = json.dumps(json.loads(response.body), indent=2)
-    except json.JSONDecodeError:
-        formatted_body = response.body
-        console.log("Error: Failed to decode response body as JSON.")
+    get_console().print(table)
 
-    table.add_row(str(response.status_code), formatted_body)
 
-    console.print(table)
+def print_batch_summary(title: str, summary: BatchSummary, *, plain: bool = False) -> None:
+    codes = sorted(summary.status_codes.items())
+    if plain:
+        print(
+            f"total={summary.total} sent={summary.sent} failed={summary.failed} invalid={summary.invalid}"
+            f" skipped={summary.skipped} segments={summary.segments}"
+        )
+        if codes:
+            print("status_codes=" + ",".join(f"{code}:{count}" for code, count in codes))
+        return
+
+    from rich.table import Table
+
+    table = Table(title=title, show_header=True, header_style="cyan")
+    table.add_column("Total")
+    table.add_column("Sent", style="green")
+    table.add_column("Failed", style="red")
+    table.add_column("Invalid", style="yellow")
+    table.add_column("Skipped")
+    table.add_column("Segments")
+    table.add_column("Status Codes")
+    status_codes = ", ".join(f"{code}: {count}" for code, count in codes)
+    table.add_row(
+        str(summary.total),
+        str(summary.sent),
+        str(summary.failed),
+        str(summary.invalid),
+        str(summary.skipped),
+        str(summary.segments),
+        status_codes,
+    )
+
+    get_console().print(table)
+
+
+def print_metrics_summary(title: str, *, plain: bool = False) -> None:
+    statuses = sorted(metrics.REQUESTS.values().items())
+    requests = ",".join(f"{labels[0]}:{int(count)}" for labels, count in statuses)
+    latency = metrics.REQUEST_LATENCY
+    quantiles = [("p50", latency.percentile(0.5)), ("p90", latency.percentile(0.9)), ("p99", latency.percentile(0.99))]
+    quantiles.append(("max", latency.max))
+    rows = [
+        ("requests", requests or "0"),
+        ("latency_ms", ",".join(f"{name}:{value * 1000:.2f}" for name, value in quantiles)),
+        ("retries", str(int(metrics.RETRIES.value()))),
+        ("bytes_sent", str(int(metrics.BYTES_SENT.value()))),
+        ("bytes_received", str(int(metrics.BYTES_RECEIVED.value()))),
+        ("connections_opened", str(int(metrics.CONNECTIONS_OPENED.value()))),
+        ("connections_reused", str(int(metrics.CONNECTIONS_REUSED.value()))),
+    ]
+    if plain:
+        print(" ".join(f"{name}={value}" for name, value in rows))
+        return
+
+    from rich.table import Table
+
+    table = Table(title=title, show_header=True, header_style="cyan")
+    table.add_column("Metric")
+    table.add_column("Value", style="green")
+    for name, value in rows:
+        table.add_row(name, value)
+
+    get_console().print(table)
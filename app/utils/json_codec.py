@@ -0,0 +1,77 @@
+import json
+from typing import Any, Optional, Union
+
+from app.exceptions import ConfigError
+
+
+class JSONCodec:
+    name = "json"
+
+    def dumps(self, obj: Any) -> str:
+        return json.dumps(obj, ensure_ascii=False)
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return json.loads(data)
+
+    def pretty(self, obj: Any) -> str:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+
+    @classmethod
+    def from_config(cls, options: Optional[dict[str, Any]]) -> "JSONCodec":
+        backend = (options or {}).get("backend", "json")
+        if backend == "auto":
+            try:
+                return OrjsonCodec()
+            except ConfigError:
+                return JSONCodec()
+        codec = CODECS.get(backend)
+        if codec is None:
+            raise ConfigError(f"Unknown json backend '{backend}', expected one of: auto, {', '.join(CODECS)}")
+        return codec()
+
+
+class OrjsonCodec(JSONCodec):
+    name = "orjson"
+
+    def __init__(self) -> None:
+        try:
+            import orjson
+        except ImportError:
+            raise ConfigError("The 'orjson' json backend requires the orjson package to be installed")
+        self._orjson = orjson
+
+    def dumps(self, obj: Any) -> str:
+        return self._orjson.dumps(obj).decode()
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return self._orjson.loads(data)
+
+    def pretty(self, obj: Any) -> str:
+        return self._orjson.dumps(obj, option=self._orjson.OPT_INDENT_2).decode()
+
+
+CODECS: dict[str, type[JSONCodec]] = {"json": JSONCodec, "orjson": OrjsonCodec}
+
+_codec = JSONCodec()
+
+
+def get_codec() -> JSONCodec:
+    return _codec
+
+
+def set_codec(codec: JSONCodec) -> None:
+    global _codec
+    _codec = codec
+
+
+# Both backends raise TypeError subclasses for unserializable values and ValueError subclasses for bad input.
+def dumps(obj: Any) -> str:
+    return _codec.dumps(obj)
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    return _codec.loads(data)
+
+
+def pretty(obj: Any) -> str:
+    return _codec.pretty(obj)
@@ -1,13 +1,103 @@
+import atexit
 import logging
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from queue import SimpleQueue
+from typing import Any, Iterator, Optional
 
+from app.exceptions import ConfigError
 
-def setup_logger(log_file: str = "sms-log.log") -> logging.Logger:
-    logging.basicConfig(
-        filename=log_file,
-        level=logging.DEBUG,
-        format="%(asctime)s - %(levelname)s - %(message)s",
-    )
-    return logging.getLogger()
+LOG_FILE = "sms-log.log"
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
 
+logger = logging.getLogger("sms_client")
 
-logger = setup_logger()
+_listener: Optional[QueueListener] = None
+
+
+@dataclass
+class LogConfig:
+    file: str = LOG_FILE
+    level: str = "DEBUG"
+    max_bytes: int = 10 * 2**20
+    backup_count: int = 5
+
+    @classmethod
+    def from_config(cls, options: Optional[dict[str, Any]]) -> "LogConfig":
+        options = options or {}
+        config = cls(
+            file=options.get("file", LOG_FILE),
+            level=str(options.get("level", "DEBUG")).upper(),
+            max_bytes=options.get("max_bytes", cls.max_bytes),
+            backup_count=options.get("backup_count", cls.backup_count),
+        )
+        if not isinstance(logging.getLevelName(config.level), int):
+            raise ConfigError(f"Unknown logging level '{config.level}'")
+        if config.max_bytes < 0 or config.backup_count < 0:
+            raise ConfigError("logging max_bytes and backup_count must not be negative")
+        return config
+
+
+_config: Optional[LogConfig] = None
+
+
+class DeferredQueueHandler(QueueHandler):
+    # The stock handler formats the record before queueing it; leaving it as-is moves the %-formatting,
+    # like the file write, onto the listener thread.
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def setup_logger(config: Optional[LogConfig] = None) -> logging.Logger:
+    # Called from the entry point rather than on import; the file is only opened by the first record written.
+    global _listener, _config
+    if _listener is None:
+        config = _config = config or LogConfig()
+        handler = RotatingFileHandler(
+            config.file, maxBytes=config.max_bytes, backupCount=config.backup_count, delay=True, encoding="utf-8"
+        )
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        records: SimpleQueue[logging.LogRecord] = SimpleQueue()
+        _listener = QueueListener(records, handler)
+        _listener.start()
+        atexit.register(shutdown_logger)
+        logger.addHandler(DeferredQueueHandler(records))
+        logger.setLevel(config.level)
+    return logger
+
+
+def shutdown_logger() -> None:
+    # Drains the queue and closes the file; later records no longer reach the file until setup_logger runs again.
+    global _listener
+    if _listener is None:
+        return
+    listener, _listener = _listener, None
+    for handler in list(logger.handlers):
+        if isinstance(handler, DeferredQueueHandler):
+            logger.removeHandler(handler)
+    logger.setLevel(logging.NOTSET)
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+
+
+def reopen_logger(file: str) -> None:
+    # For a forked worker: the parent's listener thread does not exist in the child, and processes must not
+    # share one rotating file, so the worker gets its own listener and file.
+    config = _config
+    shutdown_logger()
+    if config is not None:
+        setup_logger(replace(config, file=file))
+
+
+@contextmanager
+def logger_stopped() -> Iterator[None]:
+    # For forking: a child forked while the listener thread holds the queue or file lock would inherit it locked.
+    config = _config if _listener is not None else None
+    shutdown_logger()
+    try:
+        yield
+    finally:
+        if config is not None:
+            setup_logger(config)
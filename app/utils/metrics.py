@@ -0,0 +1,223 @@
+import math
+import os
+import threading
+from typing import Any, Optional, Sequence, Union
+
+Labels = tuple[str, ...]
+Sample = tuple[str, Labels, float]
+HistogramState = tuple[dict[int, int], int, float, float]
+
+# Log-linear buckets in microseconds: exact below 128us, then 64 buckets per power of two (under 1.6% error).
+SUB_BUCKET_BITS = 7
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+HALF_SUB_BUCKETS = SUB_BUCKETS // 2
+
+
+def bucket_index(value: int) -> int:
+    if value < SUB_BUCKETS:
+        return value
+    shift = value.bit_length() - SUB_BUCKET_BITS
+    return SUB_BUCKETS + (shift - 1) * HALF_SUB_BUCKETS + (value >> shift) - HALF_SUB_BUCKETS
+
+
+def bucket_upper_bound(index: int) -> int:
+    if index < SUB_BUCKETS:
+        return index
+    shift, offset = divmod(index - SUB_BUCKETS, HALF_SUB_BUCKETS)
+    return ((offset + HALF_SUB_BUCKETS + 1) << (shift + 1)) - 1
+
+
+def format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._values: dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        with self._lock:
+            return self._values.get(labels, 0)
+
+    def values(self) -> dict[Labels, float]:
+        with self._lock:
+            return dict(self._values)
+
+    def samples(self) -> list[Sample]:
+        return [(self.name, labels, value) for labels, value in sorted(self.values().items())]
+
+    def state(self) -> dict[Labels, float]:
+        return self.values()
+
+    def merge(self, state: dict[Labels, float]) -> None:
+        with self._lock:
+            for labels, value in state.items():
+                self._values[labels] = self._values.get(labels, 0) + value
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels: str, value: float) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram:
+    kind = "summary"
+    QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self._counts: dict[int, int] = {}
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        index = bucket_index(max(int(seconds * 1e6), 0))
+        with self._lock:
+            self._counts[index] = self._counts.get(index, 0) + 1
+            self.count += 1
+            self.sum += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def percentile(self, quantile: float) -> float:
+        with self._lock:
+            counts, total = sorted(self._counts.items()), self.count
+        if not total:
+            return 0.0
+        rank = max(math.ceil(quantile * total), 1)
+        seen = 0
+        for index, count in counts:
+            seen += count
+            if seen >= rank:
+                return min(bucket_upper_bound(index) / 1e6, self.max)
+        return self.max
+
+    def samples(self) -> list[Sample]:
+        samples: list[Sample] = [(self.name, (format_value(q),), self.percentile(q)) for q in self.QUANTILES]
+        with self._lock:
+            samples += [(f"{self.name}_sum", (), self.sum), (f"{self.name}_count", (), float(self.count))]
+        return samples
+
+    def state(self) -> HistogramState:
+        with self._lock:
+            return dict(self._counts), self.count, self.sum, self.max
+
+    def merge(self, state: HistogramState) -> None:
+        counts, count, total, maximum = state
+        with self._lock:
+            for index, bucket_count in counts.items():
+                self._counts[index] = self._counts.get(index, 0) + bucket_count
+            self.count += count
+            self.sum += total
+            self.max = max(self.max, maximum)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+            self.count, self.sum, self.max = 0, 0.0, 0.0
+
+
+Metric = Union[Counter, Histogram]
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: Metric) -> Metric:
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        metric = self._register(Counter(name, help, labels))
+        assert isinstance(metric, Counter)
+        return metric
+
+    def gauge(self, name: str, help: str, labels: Sequence[str] = ()) -> Gauge:
+        metric = self._register(Gauge(name, help, labels))
+        assert isinstance(metric, Gauge)
+        return metric
+
+    def histogram(self, name: str, help: str) -> Histogram:
+        metric = self._register(Histogram(name, help))
+        assert isinstance(metric, Histogram)
+        return metric
+
+    def get(self, name: str) -> Optional[Metric]:
+        return self._metrics.get(name)
+
+    def reset(self) -> None:
+        for metric in list(self._metrics.values()):
+            metric.reset()
+
+    def export_state(self) -> dict[str, Any]:
+        # A picklable snapshot, so worker processes can hand their numbers to the parent.
+        return {name: metric.state() for name, metric in list(self._metrics.items())}
+
+    def merge_state(self, state: dict[str, Any]) -> None:
+        for name, metric_state in state.items():
+            metric = self._metrics.get(name)
+            if metric is not None:
+                metric.merge(metric_state)
+
+    def render(self) -> str:
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            label_names = ("quantile",) if isinstance(metric, Histogram) else metric.label_names
+            for name, labels, value in metric.samples():
+                if labels:
+                    pairs = ",".join(f'{key}="{escape_label(label)}"' for key, label in zip(label_names, labels))
+                    name = f"{name}{{{pairs}}}"
+                lines.append(f"{name} {format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: str) -> None:
+        # Written aside and renamed, so a collector never reads a half-written file.
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            file.write(self.render())
+        os.replace(temporary, path)
+
+
+def escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+registry = MetricsRegistry()
+
+REQUESTS = registry.counter("sms_requests_total", "HTTP requests sent to the gateway by response status.", ["status"])
+REQUEST_LATENCY = registry.histogram("sms_request_duration_seconds", "Time from sending a request to its response.")
+RETRIES = registry.counter("sms_retries_total", "Requests retried after a failure or retryable status.")
+BYTES_SENT = registry.counter("sms_bytes_sent_total", "Request bytes written to gateway connections.")
+BYTES_RECEIVED = registry.counter("sms_bytes_received_total", "Response bytes read from gateway connections.")
+CONNECTIONS_ACTIVE = registry.gauge("sms_pool_connections_active", "Pooled connections currently checked out.")
+CONNECTIONS_OPENED = registry.counter("sms_pool_connections_opened_total", "New gateway connections opened.")
+CONNECTIONS_REUSED = registry.counter("sms_pool_connections_reused_total", "Idle keep-alive connections reused.")
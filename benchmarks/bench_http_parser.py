@@ -0,0 +1,80 @@
+import argparse
+import timeit
+
+from app.exceptions import HTTPMessageError
+from app.http_client.http_message import HTTPMessage, HTTPResponse
+
+
+def legacy_parse_message(binary_data: bytes) -> tuple[list[str], dict[str, str], str]:
+    # The parser HTTPMessage used before the bytes-level rewrite, kept here as the baseline.
+    try:
+        data = binary_data.decode()
+    except UnicodeDecodeError:
+        raise HTTPMessageError("Failed to decode binary data.")
+
+    lines = data.split("\r\n")
+    if not lines or not lines[0]:
+        raise HTTPMessageError("Invalid message format: No start line found.")
+
+    start_line, *lines = lines
+    headers, body = {}, ""
+    blank_line_idx = lines.index("") if "" in lines else len(lines)
+
+    try:
+        for line in lines[:blank_line_idx]:
+            key, value = line.split(": ", 1)
+            headers[key] = value
+    except ValueError:
+        raise HTTPMessageError("Invalid header format. Expected 'key: value'.")
+
+    if blank_line_idx + 1 < len(lines):
+        body = "\r\n".join(lines[blank_line_idx + 1 :])
+
+    parts = start_line.split(" ", 2)
+    if len(parts) != 3:
+        raise HTTPMessageError(f"Invalid start line format: {start_line}")
+
+    if body:
+        content_length = int(headers["Content-Length"])
+        if content_length != len(body):
+            raise HTTPMessageError(f"Content-Length mismatch: expected {content_length}, got {len(body)}")
+
+    return parts, headers, body
+
+
+def make_response(body_size: int) -> bytes:
+    body = (b'{"status": "success", "message_id": "0123456789"}\r\n' * (body_size // 52 + 1))[:body_size]
+    return (
+        b"HTTP/1.1 200 OK\r\n"
+        b"Server: sms-gateway\r\n"
+        b"Date: Sun, 18 Oct 2026 12:00:00 GMT\r\n"
+        b"Content-Type: application/json\r\n"
+        b"Connection: keep-alive\r\n"
+        b"X-Request-Id: 5f1d7c0e-3c2b-4a8e-9a57-1f0e2d3c4b5a\r\n"
+        b"Content-Length: %d\r\n\r\n%s" % (len(body), body)
+    )
+
+
+def bench(label: str, func: object, number: int) -> float:
+    seconds = min(timeit.repeat(func, number=number, repeat=5))  # type: ignore[arg-type]
+    per_call = seconds / number * 1e6
+    print(f"  {label:<28} {per_call:9.2f} us/call")
+    return per_call
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare the legacy and bytes-level HTTP message parsers.")
+    parser.add_argument("--number", type=int, default=20000, help="Calls per timing run")
+    args = parser.parse_args()
+
+    for body_size in (64, 1024, 16 * 1024):
+        data = make_response(body_size)
+        print(f"body {body_size} bytes:")
+        legacy = bench("legacy _parse_message", lambda: legacy_parse_message(data), args.number)
+        current = bench("bytes _parse_message", lambda: HTTPMessage._parse_message(data), args.number)
+        bench("HTTPResponse.from_bytes", lambda: HTTPResponse.from_bytes(data), args.number)
+        print(f"  speedup                      {legacy / current:9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import argparse
+import json
+import timeit
+from typing import Callable
+
+from app.exceptions import ConfigError
+from app.http_client.schemas import SMSMessage
+from app.utils.json_codec import JSONCodec, OrjsonCodec
+
+
+def bench(label: str, func: Callable[[], object], number: int, baseline: float = 0.0) -> float:
+    per_call = min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+    ratio = f"{baseline / per_call:6.2f}x" if baseline else ""
+    print(f"  {label:<34} {per_call:8.3f} us/call  {ratio}")
+    return per_call
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare JSON backends for SMS bodies and gateway responses.")
+    parser.add_argument("--number", type=int, default=100_000)
+    args = parser.parse_args()
+
+    codecs: list[JSONCodec] = [JSONCodec()]
+    try:
+        codecs.append(OrjsonCodec())
+    except ConfigError:
+        print("orjson is not installed, only the standard library backend is measured")
+
+    sms = SMSMessage("+12345678901", "+19876543210", "Ваш код подтверждения: 123456")
+    response = '{"status": "success", "message_id": "0123456789abcdef", "segments": 1, "cost": 0.05}'
+
+    print("SMSMessage body encoding:")
+    baseline = bench("json.dumps(to_dict())", lambda: json.dumps(sms.to_dict(), ensure_ascii=False), args.number)
+    for codec in codecs:
+        bench(f"{codec.name} codec dumps(to_dict())", lambda: codec.dumps(sms.to_dict()), args.number, baseline)
+    bench("SMSMessage.to_json() template", sms.to_json, args.number, baseline)
+
+    print("Gateway response decoding:")
+    baseline = bench("json.loads", lambda: json.loads(response), args.number)
+    for codec in codecs:
+        bench(f"{codec.name} codec loads", lambda: codec.loads(response), args.number, baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from app.utils.logging import LOG_FORMAT, LogConfig, logger, setup_logger, shutdown_logger
+
+BODY = '{"sender": "+12345678901", "recipient": "+19876543210", "message": "Your code is 123456"}'
+
+
+def per_send(count: int) -> float:
+    # The four records Request logs for one successful send.
+    started = time.perf_counter()
+    for _ in range(count):
+        logger.info("Request: %s", "POST /send_sms HTTP/1.1")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Request Body: %s", BODY)
+        logger.info("Response: %s", "HTTP/1.1 200 OK")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Response Body: %s", BODY)
+    return (time.perf_counter() - started) / count * 1e6
+
+
+def legacy_per_send(path: str, count: int) -> float:
+    handler = logging.FileHandler(path, encoding="utf-8")
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    logger.addHandler(handler)
+    logger.setLevel(logging.DEBUG)
+    started = time.perf_counter()
+    for _ in range(count):
+        logger.info(f"Request: {'POST /send_sms HTTP/1.1'}")
+        logger.debug(f"Request Body: {BODY}")
+        logger.info(f"Response: {'HTTP/1.1 200 OK'}")
+        logger.debug(f"Response Body: {BODY}")
+    elapsed = (time.perf_counter() - started) / count * 1e6
+    logger.removeHandler(handler)
+    handler.close()
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Logging cost added to each send on the calling thread.")
+    parser.add_argument("--sends", type=int, default=20_000)
+    args = parser.parse_args()
+    logger.propagate = False
+
+    with tempfile.TemporaryDirectory() as directory:
+        baseline = legacy_per_send(os.path.join(directory, "legacy.log"), args.sends)
+        print(f"  {'synchronous FileHandler':<28} {baseline:7.2f} us/send")
+        for level in ("DEBUG", "INFO"):
+            setup_logger(LogConfig(file=os.path.join(directory, f"{level}.log"), level=level))
+            cost = per_send(args.sends)
+            shutdown_logger()
+            print(f"  {f'queue handler, {level}':<28} {cost:7.2f} us/send  {baseline / cost:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import argparse
+import gc
+import random
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator
+
+from app.batch.columnar import SMSBatch
+from app.http_client.schemas import FrozenSMSMessage, SMSMessage
+
+
+@dataclass
+class DictMessage:
+    # The pre-slots SMSMessage layout: a dataclass with a per-instance __dict__.
+    sender: str
+    recipient: str
+    message: str
+
+
+def make_rows(count: int, senders: int) -> list[tuple[str, str, str]]:
+    rng = random.Random(42)
+    sender_pool = [f"+1555{index:07d}" for index in range(senders)]
+    texts = ["Your code is %06d", "Reminder: appointment at %d:00", "Order #%d has shipped"]
+    return [
+        (rng.choice(sender_pool), f"+1{rng.randrange(10**10):010d}", rng.choice(texts) % rng.randrange(10**6))
+        for _ in range(count)
+    ]
+
+
+def parsed(rows: list[tuple[str, str, str]]) -> Iterator[tuple[str, str, str]]:
+    # Fresh phone strings per row, as after reading a file; message texts are shared so they are not counted.
+    for sender, recipient, message in rows:
+        yield sender.encode().decode(), recipient.encode().decode(), message
+
+
+def measure(label: str, build: Callable[[], Any], count: int, baseline: float = 0.0) -> float:
+    gc.collect()
+    tracemalloc.start()
+    container = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    per_message = size / count
+    ratio = f"{baseline / per_message:6.1f}x smaller" if baseline else ""
+    print(f"  {label:<26} {size / 2**20:8.1f} MiB  {per_message:7.1f} B/message  {ratio}")
+    del container
+    return per_message
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Memory held by different in-memory message representations.")
+    parser.add_argument("--messages", type=int, default=200_000)
+    parser.add_argument("--senders", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = make_rows(args.messages, args.senders)
+    print(f"{args.messages:,} messages from {args.senders} senders (message text excluded):")
+    baseline = measure("dataclass with __dict__", lambda: [DictMessage(*row) for row in parsed(rows)], args.messages)
+    measure("SMSMessage (slots)", lambda: [SMSMessage(*row) for row in parsed(rows)], args.messages, baseline)
+    measure(
+        "FrozenSMSMessage (slots)", lambda: [FrozenSMSMessage(*row) for row in parsed(rows)], args.messages, baseline
+    )
+    measure("SMSBatch (columnar)", lambda: SMSBatch(parsed(rows)), args.messages, baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import argparse
+import logging
+import time
+
+from app.http_client.connection_pool import ConnectionPool
+from app.http_client.pipeline import Pipeline
+from app.http_client.request import Request
+from app.http_client.schemas import SMSMessage
+from benchmarks.gateway import FakeGateway
+
+
+def make_messages(count: int) -> list[SMSMessage]:
+    return [SMSMessage("+12345678901", f"+1987{index:07d}", "Benchmark message") for index in range(count)]
+
+
+def report(label: str, count: int, seconds: float) -> float:
+    rate = count / seconds
+    print(f"  {label:<24} {rate:10.0f} req/s")
+    return rate
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare serial and pipelined POSTs over one connection.")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.002, help="Gateway response delay in seconds")
+    parser.add_argument("--depths", type=int, nargs="+", default=[4, 16, 64])
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    messages = make_messages(args.requests)
+    with FakeGateway(latency=args.latency) as gateway:
+        print(f"{args.requests} requests, {args.latency * 1000:.1f} ms gateway latency:")
+        pool = ConnectionPool()
+        started = time.perf_counter()
+        for message in messages:
+            Request.post(gateway.url, body=message, pool=pool)
+        serial = report("serial keep-alive", args.requests, time.perf_counter() - started)
+
+        for depth in args.depths:
+            pool = ConnectionPool()
+            started = time.perf_counter()
+            Pipeline(gateway.url, depth=depth, pool=pool).post(messages)
+            rate = report(f"pipeline depth {depth}", args.requests, time.perf_counter() - started)
+            print(f"  {'':<24} {rate / serial:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
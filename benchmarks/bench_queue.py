@@ -0,0 +1,45 @@
+import argparse
+import os
+import tempfile
+import time
+
+from app.batch.queue import OutboundQueue
+from app.batch.reader import BatchItem
+from app.batch.results import BatchResult
+from app.http_client.schemas import SMSMessage
+
+
+def make_items(count: int) -> list[BatchItem]:
+    return [
+        BatchItem(line, message=SMSMessage("+12345678901", f"+1{line:010d}", f"Your code is {line:06d}"))
+        for line in range(1, count + 1)
+    ]
+
+
+def drain_rate(items: list[BatchItem], sync_every: int) -> float:
+    with tempfile.TemporaryDirectory() as directory:
+        with OutboundQueue(os.path.join(directory, "queue.db"), sync_every=sync_every) as queue:
+            queue.enqueue(items)
+            started = time.perf_counter()
+            for item in queue.drain():
+                queue.record(BatchResult(item.line, item.recipient, status_code=200, body="{}"))
+            queue.flush()
+            return len(items) / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Queue drain throughput for different fsync batch sizes.")
+    parser.add_argument("--messages", type=int, default=5_000)
+    args = parser.parse_args()
+
+    items = make_items(args.messages)
+    baseline = 0.0
+    print(f"Drain and ack {args.messages:,} messages (claim + ack, one fsync per commit):")
+    for sync_every in (1, 16, 256, 4096):
+        rate = drain_rate(items, sync_every)
+        baseline = baseline or rate
+        print(f"  sync_every={sync_every:<5} {rate:12,.0f} msg/s  {rate / baseline:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import argparse
+import timeit
+from typing import Callable
+
+from app.http_client.segments import measure, segment_counts, transliterate
+
+TEXTS = [
+    "Your code is 123456. Do not share it with anyone.",
+    "Ваш код подтверждения: 123456. Никому его не сообщайте.",
+    "Order {1045} shipped, track at https://example.com/t/ABC~123 " * 3,
+    "Скидка 20% только сегодня 🙂 " * 4,
+]
+
+
+def bench(label: str, func: Callable[[], object], number: int) -> None:
+    per_call = min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+    print(f"  {label:<44} {per_call:8.3f} us/call")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cost of counting SMS segments per message and per column.")
+    parser.add_argument("--number", type=int, default=100_000)
+    args = parser.parse_args()
+
+    print("Single message (uncached):")
+    for text in TEXTS:
+        bench(f"{text[:28]!r} ({len(text)} chars)", lambda: measure(text), args.number)
+    print("Column of 10k messages, 100 distinct texts:")
+    column = [f"{TEXTS[index % 4]} #{index % 100}" for index in range(10_000)]
+    bench("segment_counts", lambda: segment_counts(column), max(args.number // 1000, 1))
+    print("Transliteration:")
+    bench("transliterate(Cyrillic)", lambda: transliterate(TEXTS[1]), args.number)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+HEAVY_MODULES = ("rich", "toml", "ssl", "asyncio", "concurrent.futures", "email.utils", "logging")
+
+COMMANDS = {
+    "python -c pass": [sys.executable, "-c", "pass"],
+    "import app.main": [sys.executable, "-c", "import app.main"],
+    "app.main --help": [sys.executable, "-m", "app.main", "--help"],
+}
+
+
+def median_runtime(command: list[str], runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def imported_heavy_modules() -> list[str]:
+    script = f"import sys, app.main; print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    output = subprocess.run([sys.executable, "-c", script], check=True, capture_output=True, text=True).stdout
+    return output.split()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure CLI start-up time.")
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    baseline = median_runtime(COMMANDS["python -c pass"], args.runs)
+    for label, command in COMMANDS.items():
+        runtime = median_runtime(command, args.runs)
+        print(f"  {label:<20} {runtime * 1000:7.1f} ms  (+{(runtime - baseline) * 1000:5.1f} ms over bare python)")
+    print(f"  heavy modules imported by app.main: {', '.join(imported_heavy_modules()) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
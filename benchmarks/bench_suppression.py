@@ -0,0 +1,59 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from typing import Container, Sequence, Union
+
+from app.batch.suppression import SuppressionIndex
+
+
+def numbers(count: int, seed: int) -> list[str]:
+    generator = random.Random(seed)
+    return [f"+7{generator.randrange(9_000_000_000, 10_000_000_000)}" for _ in range(count)]
+
+
+def per_lookup(index: Container[object], probes: Sequence[Union[str, int]]) -> float:
+    started = time.perf_counter()
+    for phone in probes:
+        phone in index  # noqa: B015
+    return (time.perf_counter() - started) / len(probes) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build time, lookup cost and memory of the suppression index.")
+    parser.add_argument("--numbers", type=int, default=2_000_000)
+    parser.add_argument("--lookups", type=int, default=200_000)
+    args = parser.parse_args()
+
+    opted_out = numbers(args.numbers, seed=1)
+    probes = opted_out[: args.lookups // 2] + numbers(args.lookups // 2, seed=2)
+    random.Random(3).shuffle(probes)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "optout.idx")
+        started = time.perf_counter()
+        count, _ = SuppressionIndex.build(opted_out, path)
+        print(f"  build {count:,} numbers            {time.perf_counter() - started:8.2f} s")
+        print(f"  index file                        {os.path.getsize(path) / 2**20:8.1f} MiB (mapped, not loaded)")
+
+        tracemalloc.start()
+        index = SuppressionIndex(path)
+        heap = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(f"  index heap after open             {heap / 2**10:8.1f} KiB")
+        print(f"  lookup, mmap index                {per_lookup(index, probes):8.2f} us")
+        index.close()
+
+    tracemalloc.start()
+    # The in-memory alternative: a set of normalized numbers.
+    exact = {int(phone[1:]) for phone in opted_out}
+    heap = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"  set of ints heap                  {heap / 2**20:8.1f} MiB")
+    print(f"  lookup, set (pre-normalized)      {per_lookup(exact, [int(phone[1:]) for phone in probes]):8.2f} us")
+
+
+if __name__ == "__main__":
+    main()
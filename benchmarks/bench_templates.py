@@ -0,0 +1,40 @@
+import argparse
+import timeit
+from typing import Callable
+
+from app.http_client.schemas import SMSMessage
+from app.http_client.templates import MessageTemplate
+
+TEXT = "Здравствуйте, {name}! Ваш заказ №{order} будет доставлен {date}. Код получения: {code}."
+RECIPIENT = "+19876543210"
+ROW: dict[str, object] = {"recipient": "+19876543210", "name": "Анна", "order": 104512, "date": "12.11", "code": "4821"}
+
+
+def bench(label: str, func: Callable[[], object], number: int, baseline: float = 0.0) -> float:
+    per_call = min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+    ratio = f"{baseline / per_call:6.2f}x" if baseline else ""
+    print(f"  {label:<34} {per_call:8.3f} us/call  {ratio}")
+    return per_call
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Render a templated message and encode its request body.")
+    parser.add_argument("--number", type=int, default=100_000)
+    args = parser.parse_args()
+
+    template = MessageTemplate(TEXT, sender="+12345678901")
+
+    def formatted() -> str:
+        return SMSMessage("+12345678901", RECIPIENT, TEXT.format(**ROW)).to_json()
+
+    def rendered() -> str:
+        return template.render(RECIPIENT, ROW).to_json()
+
+    assert formatted() == rendered()
+    print("Render and encode one message:")
+    baseline = bench("str.format + SMSMessage.to_json()", formatted, args.number)
+    bench("MessageTemplate.render().to_json()", rendered, args.number, baseline)
+
+
+if __name__ == "__main__":
+    main()
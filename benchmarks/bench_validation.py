@@ -0,0 +1,72 @@
+import argparse
+import random
+import re
+import time
+from typing import Any, Callable, get_type_hints
+
+from app.exceptions import SMSClientError
+from app.http_client.schemas import SMSMessage
+
+
+def legacy_validate(sender: Any, recipient: Any, message: Any) -> None:
+    # What SMSMessage.validate did per instance before type hints were cached and the pattern precompiled.
+    for field, expected_type in get_type_hints(SMSMessage).items():
+        if not isinstance({"sender": sender, "recipient": recipient, "message": message}[field], expected_type):
+            raise SMSClientError(f"Field '{field}' has the wrong type")
+    if not re.match(SMSMessage.PHONE_PATTERN, sender):
+        raise SMSClientError(f"Invalid sender phone number: {sender}")
+    if not re.match(SMSMessage.PHONE_PATTERN, recipient):
+        raise SMSClientError(f"Invalid recipient phone number: {recipient}")
+    if not message.strip():
+        raise SMSClientError("Message cannot be empty")
+
+
+def make_columns(rows: int, invalid_ratio: float) -> tuple[list[str], list[str], list[str]]:
+    rng = random.Random(42)
+    senders = ["+12345678901"] * rows
+    recipients = [f"+1{rng.randrange(10**10):010d}" for _ in range(rows)]
+    messages = ["Your verification code is 123456"] * rows
+    for index in rng.sample(range(rows), int(rows * invalid_ratio)):
+        recipients[index] = "not-a-number"
+    return senders, recipients, messages
+
+
+def timed(label: str, func: Callable[[], int], rows: int) -> float:
+    started = time.perf_counter()
+    errors = func()
+    seconds = time.perf_counter() - started
+    print(f"  {label:<28} {seconds:7.3f} s  {rows / seconds:12,.0f} rows/s  ({errors} errors)")
+    return seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare per-message and columnar SMSMessage validation.")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--invalid-ratio", type=float, default=0.01)
+    args = parser.parse_args()
+
+    senders, recipients, messages = make_columns(args.rows, args.invalid_ratio)
+    rows = list(zip(senders, recipients, messages))
+
+    def per_row(validate: Callable[..., Any]) -> int:
+        errors = 0
+        for row in rows:
+            try:
+                validate(*row)
+            except SMSClientError:
+                errors += 1
+        return errors
+
+    print(f"{args.rows:,} rows:")
+    legacy = timed("legacy per-message validate", lambda: per_row(legacy_validate), args.rows)
+    timed("SMSMessage(...) per row", lambda: per_row(SMSMessage), args.rows)
+    batch = timed(
+        "SMSMessage.validate_batch",
+        lambda: len(SMSMessage.validate_batch(senders, recipients, messages).errors),
+        args.rows,
+    )
+    print(f"  speedup over legacy          {legacy / batch:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
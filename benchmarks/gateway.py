@@ -0,0 +1,171 @@
+import argparse
+import asyncio
+import json
+import random
+import threading
+from types import TracebackType
+from typing import Optional
+
+HEADER_TERMINATOR = b"\r\n\r\n"
+
+
+class FakeGateway:
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        *,
+        latency: float = 0.0,
+        throttle_rate: float = 0.0,
+        close_rate: float = 0.0,
+        chunk_size: int = 0,
+        seed: Optional[int] = None,
+    ):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.throttle_rate = throttle_rate
+        self.close_rate = close_rate
+        self.chunk_size = chunk_size
+        self.requests = 0
+        self.connections = 0
+        self.throttled = 0
+        self.closed = 0
+        self._random = random.Random(seed)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.Server] = None
+        self._thread: Optional[threading.Thread] = None
+        self._started = threading.Event()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/send_sms"
+
+    def respond(self, body: bytes) -> tuple[bytes, bool]:
+        self.requests += 1
+        headers = [b"Content-Type: application/json"]
+        if self.throttle_rate and self._random.random() < self.throttle_rate:
+            self.throttled += 1
+            status = b"429 Too Many Requests"
+            headers.append(b"Retry-After: 0")
+            payload = b'{"status": "throttled"}'
+        else:
+            try:
+                echo = json.loads(body or b"null")
+            except ValueError:
+                echo = None
+            status = b"200 OK"
+            payload = json.dumps({"status": "success", "message_id": self.requests, "echo": echo}).encode()
+
+        close = bool(self.close_rate) and self._random.random() < self.close_rate
+        if close:
+            self.closed += 1
+            headers.append(b"Connection: close")
+        if self.chunk_size:
+            headers.append(b"Transfer-Encoding: chunked")
+            chunks = [payload[i : i + self.chunk_size] for i in range(0, len(payload), self.chunk_size)]
+            payload = b"".join(b"%x\r\n%s\r\n" % (len(chunk), chunk) for chunk in chunks) + b"0\r\n\r\n"
+        else:
+            headers.append(b"Content-Length: %d" % len(payload))
+        return b"HTTP/1.1 %s\r\n%s\r\n\r\n%s" % (status, b"\r\n".join(headers), payload), close
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        loop = asyncio.get_running_loop()
+        buffer = bytearray()
+        close = False
+
+        def send(data: bytes, close: bool) -> None:
+            writer.write(data)
+            if close:
+                writer.close()
+
+        try:
+            while not close and (data := await reader.read(65536)):
+                buffer += data
+                responses = []
+                while not close and (head_end := buffer.find(HEADER_TERMINATOR)) != -1:
+                    length = 0
+                    for line in bytes(buffer[:head_end]).split(b"\r\n")[1:]:
+                        name, _, value = line.partition(b":")
+                        if name.strip().lower() == b"content-length":
+                            length = int(value)
+                    end = head_end + len(HEADER_TERMINATOR) + length
+                    if len(buffer) < end:
+                        break
+                    response, close = self.respond(bytes(buffer[head_end + len(HEADER_TERMINATOR) : end]))
+                    responses.append(response)
+                    del buffer[:end]
+                if responses:
+                    # The delay models the network, so it does not hold back reading the next requests.
+                    loop.call_later(self.latency, send, b"".join(responses), close)
+        except ConnectionError:
+            pass
+        finally:
+            if not close:
+                writer.close()
+
+    async def serve(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._server = await asyncio.start_server(self.handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._started.set()
+        async with self._server:
+            try:
+                await self._server.serve_forever()
+            except asyncio.CancelledError:
+                pass
+
+    def start(self) -> "FakeGateway":
+        self._thread = threading.Thread(target=asyncio.run, args=(self.serve(),), daemon=True)
+        self._thread.start()
+        self._started.wait()
+        return self
+
+    def stop(self) -> None:
+        if self._loop is not None and self._server is not None:
+            self._loop.call_soon_threadsafe(self._server.close)
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+
+    def __enter__(self) -> "FakeGateway":
+        return self.start()
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a local stand-in SMS gateway.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--close-rate", type=float, default=0.0, help="Fraction of responses that close the connection")
+    parser.add_argument("--chunk-size", type=int, default=0, help="Send bodies chunked in pieces of this many bytes")
+    parser.add_argument("--seed", type=int, help="Seed for the throttle and close decisions")
+    args = parser.parse_args()
+
+    gateway = FakeGateway(
+        args.host,
+        args.port,
+        latency=args.latency,
+        throttle_rate=args.throttle_rate,
+        close_rate=args.close_rate,
+        chunk_size=args.chunk_size,
+        seed=args.seed,
+    )
+    print(f"Serving on {gateway.url}")
+    try:
+        asyncio.run(gateway.serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
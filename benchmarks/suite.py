@@ -0,0 +1,201 @@
+import argparse
+import json
+import logging
+import math
+import platform
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Optional
+
+from app.exceptions import SMSClientError
+from app.http_client.connection_pool import ConnectionPool
+from app.http_client.http_message import HTTPResponse
+from app.http_client.request import Request
+from app.http_client.retry import RetryBudget, RetryPolicy
+from app.http_client.schemas import SMSMessage
+from app.utils import json_codec
+from benchmarks.gateway import FakeGateway
+
+RAW_RESPONSE = (
+    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: 70\r\n\r\n"
+    b'{"status": "success", "message_id": "0123456789abcdef", "segments": 1}'
+)
+
+
+@dataclass
+class BenchResult:
+    name: str
+    ops: int
+    seconds: float
+    p50_us: float
+    p99_us: float
+    errors: int = 0
+
+    @property
+    def rate(self) -> float:
+        return self.ops / self.seconds if self.seconds else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "rate": round(self.rate, 1)}
+
+
+@dataclass
+class SendScenario:
+    name: str
+    requests: int
+    gateway: dict[str, Any] = field(default_factory=dict)
+    retry: bool = False
+
+
+SEND_SCENARIOS = [
+    SendScenario("send.keepalive", 2000),
+    SendScenario("send.latency_2ms", 300, {"latency": 0.002}),
+    SendScenario("send.chunked", 2000, {"chunk_size": 16}),
+    SendScenario("send.random_close", 2000, {"close_rate": 0.1}),
+    SendScenario("send.throttled_retry", 2000, {"throttle_rate": 0.1}, retry=True),
+]
+
+
+def percentile(sorted_values: list[float], quantile: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(max(math.ceil(quantile * len(sorted_values)) - 1, 0), len(sorted_values) - 1)]
+
+
+def summarize(name: str, latencies: list[float], seconds: float, errors: int = 0) -> BenchResult:
+    latencies.sort()
+    return BenchResult(
+        name,
+        len(latencies),
+        seconds,
+        round(percentile(latencies, 0.5) * 1e6, 2),
+        round(percentile(latencies, 0.99) * 1e6, 2),
+        errors,
+    )
+
+
+def run_send(scenario: SendScenario, scale: float) -> BenchResult:
+    count = max(int(scenario.requests * scale), 1)
+    messages = [SMSMessage("+12345678901", f"+1987{index:07d}", "Benchmark message") for index in range(count)]
+    previous_policy = Request.retry_policy
+    if scenario.retry:
+        Request.retry_policy = RetryPolicy(max_attempts=5, backoff_base=0, backoff_max=0, budget=RetryBudget(1.0))
+    latencies, errors = [], 0
+    try:
+        with FakeGateway(seed=1, **scenario.gateway) as gateway:
+            pool = ConnectionPool()
+            started = time.perf_counter()
+            for message in messages:
+                sent = time.perf_counter()
+                try:
+                    Request.post(gateway.url, body=message, pool=pool)
+                except SMSClientError:
+                    errors += 1
+                latencies.append(time.perf_counter() - sent)
+            elapsed = time.perf_counter() - started
+            pool.clear()
+    finally:
+        Request.retry_policy = previous_policy
+    return summarize(scenario.name, latencies, elapsed, errors)
+
+
+def run_micro(name: str, func: Callable[[], object], number: int, scale: float, samples: int = 50) -> BenchResult:
+    # Each sample times a run of calls; percentiles are over per-call averages of the samples.
+    per_sample = max(int(number * scale) // samples, 1)
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(samples):
+        sample_started = time.perf_counter()
+        for _ in range(per_sample):
+            func()
+        latencies.append((time.perf_counter() - sample_started) / per_sample)
+    elapsed = time.perf_counter() - started
+    result = summarize(name, latencies, elapsed)
+    result.ops = per_sample * samples
+    return result
+
+
+def micro_benchmarks() -> list[tuple[str, Callable[[], object], int]]:
+    sms = SMSMessage("+12345678901", "+19876543210", "Ваш код подтверждения: 123456")
+    response_body = RAW_RESPONSE.partition(b"\r\n\r\n")[2]
+    return [
+        ("parse.response", lambda: HTTPResponse.from_bytes(RAW_RESPONSE), 200_000),
+        ("serialize.sms_to_json", sms.to_json, 200_000),
+        ("serialize.codec_dumps", lambda: json_codec.dumps(sms.to_dict()), 200_000),
+        ("deserialize.codec_loads", lambda: json_codec.loads(response_body), 200_000),
+        ("validate.sms_message", lambda: SMSMessage("+12345678901", "+19876543210", "Hi"), 200_000),
+    ]
+
+
+def compare(results: list[BenchResult], baseline_path: str, tolerance: float) -> list[str]:
+    with open(baseline_path, encoding="utf-8") as file:
+        baseline = {entry["name"]: entry for entry in json.load(file)["results"]}
+    regressions = []
+    for result in results:
+        previous = baseline.get(result.name)
+        if previous is None or not previous["rate"]:
+            continue
+        change = result.rate / previous["rate"] - 1
+        print(f"  {result.name:<26} {change * 100:+7.1f}% vs baseline")
+        if change < -tolerance:
+            regressions.append(result.name)
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Throughput and latency suite for the SMS send path.")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every iteration count by this factor")
+    parser.add_argument("--only", metavar="PREFIX", help="Run only benchmarks whose name starts with PREFIX")
+    parser.add_argument("--json", metavar="FILE", help="Write the results as JSON for later comparison")
+    parser.add_argument("--baseline", metavar="FILE", help="Compare against a JSON file written by --json")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed rate drop before failing")
+    args = parser.parse_args()
+    # Retries against the throttling scenario would otherwise print a warning each.
+    logging.getLogger("sms_client").setLevel(logging.ERROR)
+
+    results: list[BenchResult] = []
+    print(f"{'benchmark':<26} {'ops':>8} {'ops/s':>12} {'p50 us':>10} {'p99 us':>10} {'errors':>7}")
+    for scenario in SEND_SCENARIOS:
+        if selected(scenario.name, args.only):
+            results.append(run_send(scenario, args.scale))
+            print_result(results[-1])
+    for name, func, number in micro_benchmarks():
+        if selected(name, args.only):
+            results.append(run_micro(name, func, number, args.scale))
+            print_result(results[-1])
+
+    if args.json:
+        write_results(args.json, results)
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.tolerance)
+        if regressions:
+            print(f"Regressed by more than {args.tolerance:.0%}: {', '.join(regressions)}", file=sys.stderr)
+            sys.exit(1)
+
+
+def selected(name: str, prefix: Optional[str]) -> bool:
+    return prefix is None or name.startswith(prefix)
+
+
+def print_result(result: BenchResult) -> None:
+    print(
+        f"{result.name:<26} {result.ops:>8} {result.rate:>12.1f} {result.p50_us:>10.2f} {result.p99_us:>10.2f}"
+        f" {result.errors:>7}"
+    )
+
+
+def write_results(path: str, results: list[BenchResult]) -> None:
+    environment = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+    }
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({"environment": environment, "results": [result.to_dict() for result in results]}, file, indent=2)
+        file.write("\n")
+
+
+if __name__ == "__main__":
+    main()